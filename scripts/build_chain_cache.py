@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.dates import business_days
+from src.features.chain_cache import materialize_chain
+from src.shared.parallel import run_in_processes
+
+def build_cache(underlying, start, end, force=False):
+    count = 0
+    for as_of in business_days(start, end):
+        if materialize_chain(as_of, underlying, force=force) is not None:
+            count += 1
+    print(f"{underlying}: {count} chains cached for {start} -> {end}")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize raw option chains into the memory-mapped chain cache.")
+    parser.add_argument("--start", type=str, required=True, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, default=None, help="Last date (YYYY-MM-DD), defaults to --start")
+    parser.add_argument("--underlyings", type=str, default="SPX", help="Comma-separated, e.g. SPX,NDX,GOLD")
+    parser.add_argument("--force", action="store_true", help="Rebuild entries that are already cached")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per underlying)")
+
+    args = parser.parse_args()
+
+    try:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date()
+        end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else start
+        underlyings = [u.strip().upper() for u in args.underlyings.split(",") if u.strip()]
+        run_in_processes(build_cache, underlyings, start, end, force=args.force, max_workers=args.workers)
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+    except Exception as e:
+        print(f"Error building chain cache: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -6,17 +6,21 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.features.spx_features import compute_spx_features
+from src.features.spx_features import compute_index_features
+from src.shared.parallel import run_in_processes
 
 def main():
-    parser = argparse.ArgumentParser(description="Compute SPX features from raw_options.")
+    parser = argparse.ArgumentParser(description="Compute index options features from raw_options.")
     parser.add_argument("--date", type=str, required=True, help="Date to compute features for (YYYY-MM-DD)")
+    parser.add_argument("--underlyings", type=str, default="SPX", help="Comma-separated, e.g. SPX,NDX,RUT,ES")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per underlying)")
     
     args = parser.parse_args()
     
     try:
         as_of = datetime.strptime(args.date, "%Y-%m-%d").date()
-        compute_spx_features(as_of)
+        underlyings = [u.strip().upper() for u in args.underlyings.split(",") if u.strip()]
+        run_in_processes(compute_index_features, underlyings, as_of, max_workers=args.workers)
     except ValueError:
         print("Invalid date format. Please use YYYY-MM-DD.")
     except Exception as e:
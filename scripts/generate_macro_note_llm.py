@@ -1,74 +1,40 @@
 import argparse
+import asyncio
 import os
 import sys
 from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.llm.macro_state import build_macro_state
+from src.llm.client import get_llm_client, LLM_PROVIDER
+from src.llm.macro_note import generate_notes, LLM_CONCURRENCY, REPORTS_DIR
+from src.shared.dates import business_days
 
-def call_llm_mock(system_prompt, user_prompt):
-    """
-    Mock LLM call for portfolio demo without API key.
-    """
-    return f"""
-# Macro Note: The Reflexive Edge
+async def run(dates, provider, concurrency, output_dir):
+    client = get_llm_client(provider)
+    try:
+        return await generate_notes(dates, client, concurrency, output_dir)
+    finally:
+        await client.close()
 
-**Date:** {datetime.now().strftime('%Y-%m-%d')}
-
-## 1. Structural Flow
-The DealerFlow engine flags SPX as **FRAGILE** (Score 48). Dealers are in negative gamma territory, meaning they are forced to sell into weakness and buy into strength. This mechanical hedging flow amplifies volatility but hasn't yet reached "Explosive" extremes. Meanwhile, cross-border flows show signs of stress, with the Dollar strengthening alongside falling equity markets.
-
-## 2. Reflexivity
-A classic reflexive loop is forming in Japan. Rising JGB yields are failing to attract capital because the Yen is simultaneously weakening. This suggests the carry trade unwind is not over; instead, capital is fleeing Japan despite higher nominal rates, which forces the BOJ into a corner.
-
-## 3. The Truth
-Consensus believes the "Soft Landing" is locked in. The truth is that structural liquidity conditions are deteriorating. The equity market is supporting the economy, not the other way around. If SPX breaks key dealer levels, the feedback loop reverses.
-
-## 4. Signals to Watch
-*   **USDJPY**: If it breaks 152 despite rising JGB yields, the reflexive loop accelerates.
-*   **SPX Net Gamma**: Currently negative. Watch for a flip back to positive to signal stability.
-
-## 5. How DealerFlow Tracks This
-Our composite instability index captures the interaction between Option Gamma, FX Carry, and Rates Spreads. Today, 3 out of 5 pillars are flashing warning signs.
-
-## 6. Stance
-**Cautious / Hedged.** Structurally, the environment favors volatility-aware positioning rather than passive long-only risk. Net Gamma suggests jagged price action ahead.
-"""
-
-def generate_macro_note(as_of):
+def generate_macro_note(as_of, provider=LLM_PROVIDER, output_dir=REPORTS_DIR):
     print(f"Generating Macro Note for {as_of}...")
-    
-    ms = build_macro_state(as_of)
-    
-    # Summary for Prompt
-    summary = f"""
-    Date: {ms.as_of}
-    SPX: {ms.spx_instability} ({ms.spx_regime})
-    AUD/USD: {ms.audusd_instability} ({ms.audusd_regime})
-    USD/JPY: {ms.jpy_instability} (FRAGILE)
-    Reflexivity Loop: {ms.reflexive_loop_active}
-    Rates Spread: {ms.spread_usjp_10y:.2f}%
-    DXY 20d: {ms.dxy_ret_20d:.2f}%
-    FX Equity Stress: {ms.fx_equity_stress}
-    """
-    
-    prompt_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'macro_note.txt')
-    with open(prompt_path, 'r') as f:
-        system_prompt = f.read()
-        
-    # In a real app, you'd call OpenAI here
-    # note = call_openai(system_prompt, summary)
-    note = call_llm_mock(system_prompt, summary)
-    
-    output_path = os.path.join(os.path.dirname(__file__), '..', 'reports', f'macro_note_{ms.as_of}.md')
-    with open(output_path, 'w', encoding="utf-8") as f:
-        f.write(note)
-        
-    print(f"Macro Note saved to {output_path}")
+    paths = asyncio.run(run([as_of], provider, 1, output_dir))
+    print(f"Macro Note saved to {paths[as_of]}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--date", type=str, default="2024-01-05")
+    parser.add_argument("--start", type=str, help="Batch mode: first date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, help="Batch mode: last date (YYYY-MM-DD)")
+    parser.add_argument("--provider", choices=["mock", "http"], default=LLM_PROVIDER, help="LLM client (http = LLM_BASE_URL)")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY, help="Max LLM calls in flight")
+    parser.add_argument("--output-dir", type=str, default=REPORTS_DIR)
     args = parser.parse_args()
-    generate_macro_note(datetime.strptime(args.date, "%Y-%m-%d").date())
+
+    if args.start and args.end:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date()
+        end = datetime.strptime(args.end, "%Y-%m-%d").date()
+        asyncio.run(run(business_days(start, end), args.provider, args.concurrency, args.output_dir))
+    else:
+        generate_macro_note(datetime.strptime(args.date, "%Y-%m-%d").date(), args.provider, args.output_dir)
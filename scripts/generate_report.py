@@ -6,19 +6,31 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.reporting.report_generator import generate_report, save_report
+from src.reporting.report_generator import generate_report, generate_reports, save_report
 
 def main():
     parser = argparse.ArgumentParser(description="Generate DealerFlow Report.")
-    parser.add_argument("--date", type=str, required=True, help="Date of report (YYYY-MM-DD)")
+    parser.add_argument("--date", type=str, help="Date of report (YYYY-MM-DD)")
+    parser.add_argument("--start", type=str, help="Batch mode: first date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, help="Batch mode: last date (YYYY-MM-DD)")
+    parser.add_argument("--frequency", choices=["daily", "weekly"], default="daily", help="Batch mode: every scored date or the last one per week")
+    parser.add_argument("--workers", type=int, default=None, help="Batch mode: parallel file writers")
+    parser.add_argument("--output-dir", type=str, default=".", help="Directory for report files")
     
     args = parser.parse_args()
+    if not args.date and not (args.start and args.end):
+        parser.error("either --date or both --start and --end are required")
     
     try:
-        as_of = datetime.strptime(args.date, "%Y-%m-%d").date()
-        report = generate_report(as_of)
-        if report:
-            save_report(report, as_of)
+        if args.date:
+            as_of = datetime.strptime(args.date, "%Y-%m-%d").date()
+            report = generate_report(as_of)
+            if report:
+                save_report(report, as_of, args.output_dir)
+        else:
+            start = datetime.strptime(args.start, "%Y-%m-%d").date()
+            end = datetime.strptime(args.end, "%Y-%m-%d").date()
+            generate_reports(start, end, args.frequency, args.output_dir, args.workers)
     except ValueError:
         print("Invalid date format. Please use YYYY-MM-DD.")
     except Exception as e:
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.data_connectors.aemo import AEMOClient
 from src.db import get_connection
+from src.shared.landing import write_landing, landing_enabled
 
 REGIONS = ['NSW1', 'VIC1', 'QLD1', 'SA1', 'TAS1']
 
@@ -25,10 +26,16 @@ def ingest_power_prices(year, month):
             print(f"No data for {region}.")
             continue
             
-        # 2. Aggregate Daily
+        # 2. Aggregate Daily (also normalises columns / adds DATETIME)
         df_daily = client.aggregate_daily(df_raw)
         print(f"Aggregated {len(df_daily)} daily records.")
         
+        # Keep the raw intervals in the landing zone (one file per region and day)
+        if landing_enabled():
+            intervals = df_raw.drop(columns=['DATE']).rename(columns=str.lower)
+            intervals['as_of'] = df_raw['DATE']
+            write_landing(intervals, 'aemo', region, sort_by=('datetime',))
+        
         # 3. Prepare Rows
         rows = []
         for _, row in df_daily.iterrows():
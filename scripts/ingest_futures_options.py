@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.markets import FUTURES_OPTIONS
+from src.ingestion.ingest_futures_options import ingest_futures_options
+from src.shared.parallel import run_in_processes
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest CME futures options (Black-76) and compute GEX features.")
+    parser.add_argument("--date", type=str, required=True, help="YYYY-MM-DD")
+    parser.add_argument("--underlyings", type=str, default=",".join(FUTURES_OPTIONS), help="Comma-separated list (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per underlying)")
+    
+    args = parser.parse_args()
+    
+    try:
+        as_of = datetime.strptime(args.date, "%Y-%m-%d").date()
+        underlyings = [u.strip().upper() for u in args.underlyings.split(",") if u.strip()]
+        
+        # One process per market: adding a market adds no wall-clock time
+        results = run_in_processes(ingest_futures_options, underlyings, as_of, max_workers=args.workers)
+        for underlying, result in results.items():
+            status = f"{result} contracts" if isinstance(result, int) else f"FAILED ({result})"
+            print(f"{underlying}: {status}")
+    except ValueError:
+        print("Invalid date format.")
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
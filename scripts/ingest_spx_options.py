@@ -6,49 +6,31 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data_connectors.spx_options import SPXOptionsConnector
-from src.db import write_dataframe
+from src.ingestion.ingest_index_options import ingest_index_options, parse_spots
+from src.shared.parallel import run_in_processes
 
 def ingest_spx_options(target_date, spot_price):
-    connector = SPXOptionsConnector()
-    
-    # 1. Fetch Chain
-    df = connector.get_option_chain(target_date, underlying="SPX")
-    
-    if df.empty:
-        print("No options data found.")
-        return
-
-    print(f"Fetched {len(df)} contracts.")
-    
-    # 2. Calculate Greeks
-    # We need the spot price to compute IV/Delta/Gamma
-    df = connector.calculate_greeks(df, spot_price)
-
-    # 2b. Check for Open Interest (Synthetic Fill)
-    # Databento OHLCV-1d usually lacks OI. If max OI is 0, generate synthetic.
-    if df['open_interest'].max() == 0:
-        print("WARNING: No Open Interest found in feed. Using synthetic generator.")
-        df = connector.generate_synthetic_oi(df, spot_price)
-    
-    # 3. Write to DB
-    # Drop intermediate columns (T)
-    if 'T' in df.columns:
-        df = df.drop(columns=['T'])
-        
-    print(f"Ingesting {len(df)} rows to raw_options...")
-    write_dataframe(df, 'raw_options', if_exists='append', index=False)
+    return ingest_index_options("SPX", target_date, spot_price)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--date", type=str, required=True, help="YYYY-MM-DD")
-    parser.add_argument("--spot", type=float, default=6000.0, help="SPX Spot Price for Greeks")
+    parser.add_argument("--underlyings", type=str, default="SPX", help="Comma-separated, e.g. SPX,NDX,RUT,ES")
+    parser.add_argument("--spot", type=str, default=None, help="Spot for Greeks: one price, or SPX=6000,NDX=21000")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per underlying)")
     
     args = parser.parse_args()
     
     try:
         as_of = datetime.strptime(args.date, "%Y-%m-%d").date()
-        ingest_spx_options(as_of, args.spot)
+        underlyings = [u.strip().upper() for u in args.underlyings.split(",") if u.strip()]
+        spots = parse_spots(args.spot, underlyings)
+        
+        # One process per underlying, each streaming and writing its own chain
+        results = run_in_processes(ingest_index_options, underlyings, as_of, spots=spots, max_workers=args.workers)
+        for underlying, result in results.items():
+            status = f"{result} contracts" if isinstance(result, int) else f"FAILED ({result})"
+            print(f"{underlying}: {status}")
     except ValueError:
         print("Invalid date format.")
     except Exception as e:
@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.shared.db import init_db
+from src.shared.migrations import apply_migrations
 
 def main():
     print("Starting database initialization...")
@@ -12,6 +13,7 @@ def main():
         # Point to the correct location of schema.sql relative to this script
         schema_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/shared/schema.sql'))
         init_db(schema_path)
+        apply_migrations()
     except Exception as e:
         print(f"Failed to initialize database: {e}")
         print("Ensure you have a PostgreSQL database running and configured in your .env file.")
@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add the project root to the python path so we can import src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.migrations import ensure_monthly_partitions, detach_partition, attach_partition
+
+def parse_month(value):
+    return datetime.strptime(value, "%Y-%m").date()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly raw_options partitions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="Create partitions for a month range (YYYY-MM)")
+    create.add_argument("--start", type=parse_month, required=True)
+    create.add_argument("--end", type=parse_month, default=None)
+
+    detach = sub.add_parser("detach", help="Detach a month for archiving (YYYY-MM)")
+    detach.add_argument("--month", type=parse_month, required=True)
+
+    attach = sub.add_parser("attach", help="Re-attach an archived month (YYYY-MM)")
+    attach.add_argument("--month", type=parse_month, required=True)
+
+    parser.add_argument("--table", type=str, default="raw_options")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "create":
+            created = ensure_monthly_partitions(args.start, args.end or args.start, table=args.table)
+            print(f"Created {len(created)} partitions: {', '.join(created) or 'none'}")
+        elif args.command == "detach":
+            detach_partition(args.month, table=args.table)
+        elif args.command == "attach":
+            attach_partition(args.month, table=args.table)
+    except Exception as e:
+        print(f"Partition command failed: {e}")
+
+if __name__ == '__main__':
+    main()
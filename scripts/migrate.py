@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+# Add the project root to the python path so we can import src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.migrations import apply_migrations, list_migrations
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned SQL migrations from sql/migrations.")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this migration version")
+    parser.add_argument("--list", action="store_true", help="List available migrations and exit")
+
+    args = parser.parse_args()
+
+    if args.list:
+        for version, name, _ in list_migrations():
+            print(f"{version:03d}  {name}")
+        return
+
+    try:
+        applied = apply_migrations(target=args.target)
+        for version in applied:
+            print(f"Applied migration {version:03d}")
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        print("Ensure you have run scripts/init_db.py against a running PostgreSQL database.")
+
+if __name__ == '__main__':
+    main()
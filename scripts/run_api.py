@@ -0,0 +1,22 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from src.api.server import create_app, API_CACHE_SIZE, API_POLL_INTERVAL, API_INVALIDATION
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the DealerFlow read-only API.")
+    parser.add_argument("--host", type=str, default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8080")))
+    parser.add_argument("--cache-size", type=int, default=API_CACHE_SIZE, help="Max cached responses")
+    parser.add_argument("--invalidation", choices=["notify", "poll"], default=API_INVALIDATION, help="Cache eviction: change notifications or polled write counters")
+    parser.add_argument("--poll-interval", type=float, default=API_POLL_INTERVAL, help="Seconds between write-counter checks")
+    args = parser.parse_args()
+
+    web.run_app(create_app(args.cache_size, args.poll_interval, args.invalidation), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline.dag import format_summary
+from src.pipeline.backfill import BACKFILL_SHARD_DAYS, run_backfill
+from src.pipeline.stages import default_pipeline
+from src.shared.dates import business_days
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the pipeline over a date range in a process pool, resuming from checkpoints.")
+    parser.add_argument("--start", type=str, required=True, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, required=True, help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--stages", type=str, default=None, help="Comma-separated stage names or groups; default: all")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--shard-days", type=int, default=BACKFILL_SHARD_DAYS, help="Consecutive dates per worker task")
+    parser.add_argument("--force", action="store_true", help="Run stages even if their inputs are unchanged")
+    parser.add_argument("--restart", action="store_true", help="Discard this backfill's checkpoints and start over")
+    parser.add_argument("--id", type=str, default=None, help="Backfill id (default: hash of stages and range)")
+    args = parser.parse_args()
+
+    pipeline = default_pipeline()
+    if args.stages:
+        pipeline = pipeline.select(s.strip() for s in args.stages.split(",") if s.strip())
+
+    try:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date()
+        end = datetime.strptime(args.end, "%Y-%m-%d").date()
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return
+
+    dates = business_days(start, end)
+    if not dates:
+        print("No business days in range.")
+        return
+
+    t0 = time.perf_counter()
+    summary = run_backfill(pipeline, dates, workers=args.workers, force=args.force,
+                           restart=args.restart, shard_days=args.shard_days, run_id=args.id)
+    print()
+    print(format_summary(summary['results'], time.perf_counter() - t0))
+
+if __name__ == "__main__":
+    main()
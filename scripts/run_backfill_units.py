@@ -0,0 +1,84 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add the project root to the python path so we can import src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.dates import business_days
+from src.pipeline.executors import BACKFILL_EXECUTOR, get_executor
+from src.pipeline.work_units import DATE_STAGES, create_backfill, finish_backfill, format_status, backfill_status, work
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def add_plan_arguments(parser):
+    parser.add_argument("--start", type=parse_date, required=True)
+    parser.add_argument("--end", type=parse_date, required=True)
+    parser.add_argument("--shards", type=int, default=8, help="Contiguous date blocks, one per worker / job index")
+    parser.add_argument("--assets", type=str, default=None, help="Comma-separated assets (default: index underlyings, GOLD, AUDUSD)")
+    parser.add_argument("--stages", type=str, default=",".join(DATE_STAGES),
+                        help="Cross-asset stages run per date once its assets are done ('' for none)")
+    parser.add_argument("--restart", action="store_true", help="Discard this backfill's units and plan again")
+    parser.add_argument("--id", type=str, default=None, help="Backfill id (default: hash of assets, stages and range)")
+
+def plan(args) -> str:
+    dates = business_days(args.start, args.end)
+    if not dates:
+        raise ValueError("No business days in range")
+    assets = [a.strip() for a in args.assets.split(",") if a.strip()] if args.assets else None
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    return create_backfill(dates, args.shards, assets, stages, restart=args.restart, backfill_id=args.id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded date x asset backfills: plan work units, run workers locally or as an indexed Kubernetes Job.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_plan_arguments(sub.add_parser("plan", help="Create the work units and print the backfill id"))
+
+    run = sub.add_parser("run", help="Plan, start the shard workers and wait for them")
+    add_plan_arguments(run)
+    run.add_argument("--executor", choices=["local", "k8s"], default=BACKFILL_EXECUTOR)
+    run.add_argument("--parallelism", type=int, default=None, help="Workers at a time (default: local CPUs / all shards on k8s)")
+    run.add_argument("--dry-run", action="store_true", help="k8s: print the Job manifest instead of applying it")
+
+    worker = sub.add_parser("work", help="Claim and run units (what each job pod runs)")
+    worker.add_argument("--id", type=str, required=True)
+    worker.add_argument("--shard", type=int, default=int(os.getenv("JOB_COMPLETION_INDEX", "0")),
+                        help="Shard worked first (default: JOB_COMPLETION_INDEX)")
+
+    status = sub.add_parser("status", help="Units per status and dates/minute")
+    status.add_argument("--id", type=str, required=True)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "plan":
+            print(plan(args))
+        elif args.command == "work":
+            work(args.id, args.shard)
+        elif args.command == "status":
+            print(format_status(backfill_status(args.id)))
+        elif args.command == "run":
+            backfill_id = plan(args)
+            if args.executor == "k8s":
+                executor = get_executor("k8s", dry_run=args.dry_run)
+                parallelism = args.parallelism or args.shards
+            else:
+                executor = get_executor("local")
+                parallelism = args.parallelism or os.cpu_count() or 1
+            executor.start(backfill_id, args.shards, parallelism)
+            if args.dry_run:
+                return
+            ok = executor.wait()
+            print(format_status(finish_backfill(backfill_id)))
+            if not ok:
+                print("Some shard workers did not finish cleanly; rerun to resume")
+                sys.exit(1)
+    except Exception as e:
+        print(f"Backfill command failed: {e}")
+        # Non-zero so a failed pod counts against the Job's backoffLimit
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import os
+import sys
+import argparse
+import tempfile
+import contextlib
+from datetime import date, datetime, timedelta
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.benchmark import (
+    REGRESSION_THRESHOLD, time_case, summarize, save_results, load_results, latest_results,
+    compare_results, format_results, format_comparison,
+)
+from src.shared.synthetic import (
+    DEFAULT_SEED, synthetic_option_chain, iter_option_chains,
+    synthetic_futures_history, synthetic_cot_history, synthetic_fx_history,
+)
+from src.shared.dates import business_days
+from src.features.option_chain import OptionChain
+from src.features.strike_ladder import build_strike_ladder
+from src.features.gamma_term_structure import build_gamma_term_structure
+from src.features.hedge_flow import hedge_flow_matrix, summarize_hedge_flow
+from src.features.black_scholes import bs_implied_vol, black76_price, RISK_FREE_RATE
+
+# Far outside any real history, so --db runs never touch production rows
+BENCH_DATE = date(1999, 1, 4)
+BENCH_HISTORY_DAYS = 90
+
+# Rows the --db cases write, keyed by table -> date column
+BENCH_TABLES = {
+    'raw_options': 'as_of', 'raw_futures': 'as_of', 'raw_cot': 'as_of', 'raw_fx': 'as_of',
+    'features_equity': 'as_of', 'features_hedge_flow': 'as_of', 'features_gamma_term': 'as_of',
+    'features_commodity': 'as_of', 'features_fx': 'as_of', 'asset_scores': 'as_of',
+}
+
+
+def quiet(fn, *args, **kwargs):
+    """
+    Runs fn with stdout discarded (the feature / scoring functions log every step).
+    """
+    def run():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return fn(*args, **kwargs)
+    return run
+
+
+def compute_cases(as_of: date, spot: float, seed: int, days: int) -> list:
+    """
+    (name, fn, items, unit, setup) for the in-memory kernels on one full-size chain.
+    `items` may be a callable, read after the case has run.
+    """
+    df = synthetic_option_chain(as_of, spot, seed=seed)
+    chain = OptionChain.from_frame(df, as_of, 'SPX')
+    n = len(chain)
+    T = chain.T
+    price = black_scholes_prices(chain)
+    history_end = business_days(as_of, as_of + timedelta(days=days * 2))[days - 1]
+
+    history_rows = {}
+
+    def chain_history():
+        # Generate and featurise `days` sessions back to back
+        history_rows['n'] = 0
+        for day in iter_option_chains(as_of, history_end, seed=seed, s0=spot):
+            c = OptionChain.from_frame(day, day['as_of'].iloc[0], 'SPX')
+            build_strike_ladder(c.strike, c.calls, c.gamma, c.open_interest, c.delta, c.spot)
+            history_rows['n'] += len(c)
+
+    return [
+        ('generate_chain', lambda: synthetic_option_chain(as_of, spot, seed=seed), n, 'contracts', None),
+        ('chain_from_frame', lambda: OptionChain.from_frame(df, as_of, 'SPX'), n, 'contracts', None),
+        ('implied_vol', lambda: bs_implied_vol(price, chain.spot, chain.strike, T, chain.calls), n, 'contracts', None),
+        ('greeks', lambda: OptionChain.from_frame(df, as_of, 'SPX').compute_greeks(price), n, 'contracts', None),
+        ('strike_ladder', lambda: build_strike_ladder(
+            chain.strike, chain.calls, chain.gamma, chain.open_interest, chain.delta, chain.spot
+        ), n, 'contracts', None),
+        ('gamma_term_structure', lambda: build_gamma_term_structure(
+            as_of, chain.strike, chain.expiry_dates(), chain.implied_volatility, chain.calls,
+            chain.open_interest, chain.gamma, chain.spot
+        ), n, 'contracts', None),
+        ('hedge_flow', lambda: summarize_hedge_flow(*hedge_flow_args(chain, T)), n, 'contracts', None),
+        (f'chain_history_{days}d', chain_history, lambda: history_rows['n'], 'contracts', None),
+    ]
+
+
+def black_scholes_prices(chain: OptionChain):
+    # Black-Scholes on spot == Black-76 on the forward
+    return black76_price(chain.spot * np.exp(RISK_FREE_RATE * chain.T), chain.strike, chain.T, chain.implied_volatility, chain.calls)
+
+
+def hedge_flow_args(chain: OptionChain, T):
+    matrix = hedge_flow_matrix(chain.strike, T, chain.implied_volatility, chain.calls, chain.open_interest, chain.spot)
+    return matrix.spot_shocks, matrix.base_flows()
+
+
+def clear_bench_rows(start: date, end: date):
+    from src.shared.db import execute_query
+    for table, column in BENCH_TABLES.items():
+        execute_query(f"DELETE FROM {table} WHERE {column} BETWEEN %s AND %s", (start, end))
+
+
+def seed_bench_history(as_of: date, seed: int):
+    """
+    Futures / COT / FX history for the feature windows ending on as_of.
+    """
+    from src.db import write_dataframe
+    days = business_days(as_of - timedelta(days=BENCH_HISTORY_DAYS), as_of)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        write_dataframe(synthetic_futures_history(days, seed=seed), 'raw_futures')
+        write_dataframe(synthetic_cot_history(days, seed=seed), 'raw_cot')
+        write_dataframe(synthetic_fx_history(days, seed=seed), 'raw_fx')
+
+
+def db_cases(as_of: date, spot: float, seed: int, workdir: str) -> list:
+    """
+    Cases that read and write Postgres, all on as_of (see BENCH_DATE).
+    """
+    from src.shared.db import execute_query
+    from src.ingestion.ingest_spx_csv import ingest_spx_from_csv
+    from src.features.spx_features import compute_spx_features
+    from src.features.fx_features import compute_fx_features
+    from src.features.commodity_features import compute_commodity_features
+    from src.scoring.scoring_engine import compute_asset_scores
+    from src.reporting.report_generator import load_report_data, render_report
+
+    df = synthetic_option_chain(as_of, spot, seed=seed)
+    csv_path = os.path.join(workdir, 'chain.csv')
+    df.drop(columns=['as_of', 'underlying']).to_csv(csv_path, index=False)
+
+    def clear_options():
+        execute_query("DELETE FROM raw_options WHERE as_of = %s", (as_of,))
+
+    report_data = {}
+
+    def load_report():
+        report_data['data'] = load_report_data(as_of, as_of)[0]
+
+    n = len(df)
+    return [
+        ('csv_ingest', quiet(ingest_spx_from_csv, csv_path, as_of), n, 'rows', clear_options),
+        ('spx_features', quiet(compute_spx_features, as_of), n, 'contracts', None),
+        ('fx_features', quiet(compute_fx_features, as_of, 'AUDUSD'), None, None, None),
+        ('commodity_features', quiet(compute_commodity_features, as_of, 'GOLD'), None, None, None),
+        ('scoring', quiet(compute_asset_scores, as_of), None, None, None),
+        ('report_load', load_report, None, None, None),
+        ('report_render', lambda: render_report(report_data['data']), None, None, None),
+    ]
+
+
+def run_cases(cases: list, repeat: int, only: set = None) -> list:
+    results = []
+    for name, fn, items, unit, setup in cases:
+        if only and name not in only:
+            continue
+        timings = time_case(fn, repeat=repeat, setup=setup)
+        if callable(items):
+            items = items()
+        result = summarize(name, timings, items, unit or 'rows')
+        results.append(result)
+        print(format_results([result]).splitlines()[1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Greeks, GEX, features, scoring, ingestion and reports on synthetic data.")
+    parser.add_argument("--db", action="store_true", help=f"Also run the Postgres cases (writes and then deletes rows for {BENCH_DATE})")
+    parser.add_argument("--date", type=str, default=None, help="Chain date for the compute cases (YYYY-MM-DD, default: 2024-06-03)")
+    parser.add_argument("--spot", type=float, default=5000.0, help="SPX spot for the synthetic chain")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Generator seed")
+    parser.add_argument("--days", type=int, default=20, help="Sessions in the chain_history case")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--cases", type=str, default=None, help="Comma-separated case names to run")
+    parser.add_argument("--baseline", type=str, default=None, help="Results JSON to compare against (default: the previous run)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Median slowdown counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when any case regressed")
+    parser.add_argument("--no-save", action="store_true", help="Do not write a results file")
+    args = parser.parse_args()
+
+    try:
+        as_of = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else date(2024, 6, 3)
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        sys.exit(2)
+    only = {c.strip() for c in args.cases.split(',')} if args.cases else None
+
+    print(format_results([]))
+    results = run_cases(compute_cases(as_of, args.spot, args.seed, args.days), args.repeat, only)
+
+    if args.db:
+        history_start = BENCH_DATE - timedelta(days=BENCH_HISTORY_DAYS)
+        clear_bench_rows(history_start, BENCH_DATE)
+        try:
+            seed_bench_history(BENCH_DATE, args.seed)
+            with tempfile.TemporaryDirectory() as workdir:
+                results += run_cases(db_cases(BENCH_DATE, args.spot, args.seed, workdir), args.repeat, only)
+        finally:
+            clear_bench_rows(history_start, BENCH_DATE)
+
+    config = {'date': as_of, 'spot': args.spot, 'seed': args.seed, 'days': args.days, 'repeat': args.repeat, 'db': args.db}
+    baseline_path = args.baseline or latest_results()
+    if not args.no_save:
+        print(f"\nSaved results to {save_results(results, config)}")
+
+    if baseline_path:
+        rows = compare_results(results, load_results(baseline_path)['results'], args.threshold)
+        print(f"\nCompared with {baseline_path}:")
+        print(format_comparison(rows))
+        if args.fail_on_regression and any(r['regressed'] for r in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from src.llm.stub_server import create_stub_app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub for macro note runs (LLM_PROVIDER=http).")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    args = parser.parse_args()
+    web.run_app(create_stub_app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
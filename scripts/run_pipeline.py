@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline.dag import format_summary
+from src.pipeline.stages import default_pipeline
+from src.shared.dates import business_days
+from src.shared.metrics import METRICS_PORT, start_metrics_server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ingest -> features -> scores -> reports for a date or range.")
+    parser.add_argument("--date", type=str, help="Single date (YYYY-MM-DD)")
+    parser.add_argument("--start", type=str, help="First date of a range (business days)")
+    parser.add_argument("--end", type=str, help="Last date of a range")
+    parser.add_argument("--stages", type=str, default=None, help="Comma-separated stage names or groups (ingest, features, scores, reports); default: all")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent stage executions")
+    parser.add_argument("--force", action="store_true", help="Run stages even if their inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="Print the stage graph and exit")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT, help="Serve Prometheus /metrics on this port while running (0 = off)")
+    args = parser.parse_args()
+
+    pipeline = default_pipeline()
+    if args.stages:
+        pipeline = pipeline.select(s.strip() for s in args.stages.split(",") if s.strip())
+
+    if args.list:
+        for name in pipeline.order:
+            stage = pipeline.stages[name]
+            deps = ", ".join(stage.deps) or "-"
+            print(f"{name:<26}{stage.group:<10}{'per date' if stage.per_date else 'once':<10}after: {deps}")
+        return
+
+    if not args.date and not (args.start and args.end):
+        parser.error("either --date or both --start and --end are required")
+
+    try:
+        if args.date:
+            dates = [datetime.strptime(args.date, "%Y-%m-%d").date()]
+        else:
+            start = datetime.strptime(args.start, "%Y-%m-%d").date()
+            end = datetime.strptime(args.end, "%Y-%m-%d").date()
+            dates = business_days(start, end)
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return
+
+    start_metrics_server(args.metrics_port)
+    t0 = time.perf_counter()
+    results = pipeline.run(dates, workers=args.workers, force=args.force)
+    print()
+    print(format_summary(results, time.perf_counter() - t0))
+
+if __name__ == "__main__":
+    main()
@@ -1,112 +1,165 @@
 import sys
 import os
-import random
+import time
 import argparse
-from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.shared.db import execute_query
-
-def generate_random_walk(start_price, days, volatility=0.01):
-    prices = [start_price]
-    for _ in range(days):
-        change = prices[-1] * random.gauss(0, volatility)
-        prices.append(prices[-1] + change)
-    return prices
-
-def seed_data(days_history=30):
-    print(f"Seeding {days_history} days of history...")
-    
-    end_date = date.today()
-    start_date = end_date - timedelta(days=days_history)
-    
-    # Price paths
-    spx_prices = generate_random_walk(4500, days_history)
-    gold_prices = generate_random_walk(2000, days_history, 0.008)
-    aud_prices = generate_random_walk(0.65, days_history, 0.005)
-    
-    curr_date = start_date
-    for i in range(days_history + 1):
-        print(f"Seeding {curr_date}...")
-        
-        # --- SPX OPTIONS ---
-        # Generate ~20 options per day (mix of strikes)
-        base_price = spx_prices[i]
-        expiry = curr_date + timedelta(days=7) # Constant 7-day expiry for simplicity
-        
-        for _ in range(20):
-            strike = int(base_price + (random.randint(-5, 5) * 10))
-            option_type = 'call' if random.random() > 0.5 else 'put'
-            symbol = f"SPXW{expiry.strftime('%y%m%d')}{'C' if option_type == 'call' else 'P'}{int(strike*1000):08d}"
-            
-            # Mock Greeks
-            iv = random.uniform(0.1, 0.3)
-            delta = random.uniform(0, 1) if option_type == 'call' else random.uniform(-1, 0)
-            gamma = random.uniform(0, 0.05)
-            oi = random.randint(100, 5000)
-            
-            query_opt = """
-            INSERT INTO raw_options 
-            (as_of, underlying, option_symbol, type, strike, expiry, underlying_price, bid, ask, last, open_interest, implied_volatility, delta, gamma)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            execute_query(query_opt, (
-                curr_date, 'SPX', symbol, option_type, strike, expiry, base_price,
-                10.0, 11.0, 10.5, oi, iv, delta, gamma
-            ))
-
-        # --- GOLD FUTURES ---
-        # Front month and back month (to calc term structure)
-        front_price = gold_prices[i]
-        back_price = front_price * (1 + random.uniform(-0.005, 0.005)) # Slight random contango/backwardation
-        
-        query_fut = """
-        INSERT INTO raw_futures
-        (as_of, underlying, contract_symbol, expiry, settle_price, open_interest, volume)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        # Front
-        execute_query(query_fut, (curr_date, 'GOLD', 'GCZ5', curr_date + timedelta(days=30), front_price, 150000, 20000))
-        # Back
-        execute_query(query_fut, (curr_date, 'GOLD', 'GCG6', curr_date + timedelta(days=60), back_price, 50000, 5000))
-        
-        # --- COT DATA (Weekly) ---
-        # Only insert if it's a Friday (approx) or just duplicate for daily simplicity in mock
-        # Let's mock a trend in positioning
-        trend_factor = i / days_history
-        hedger_long = 100000 + (trend_factor * 10000)
-        hedger_short = 150000 - (trend_factor * 5000)
-        spec_long = 200000 + (trend_factor * 20000)
-        spec_short = 50000
-        
-        query_cot = """
-        INSERT INTO raw_cot
-        (as_of, market, hedger_long, hedger_short, spec_long, spec_short, small_long, small_short)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        execute_query(query_cot, (curr_date, 'GOLD', hedger_long, hedger_short, spec_long, spec_short, 10000, 10000))
-        
-        # --- AUDUSD FX ---
-        aud_spot = aud_prices[i]
-        query_fx = """
-        INSERT INTO raw_fx
-        (as_of, pair, spot_price, short_rate_base, short_rate_quote, implied_vol_1m)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        execute_query(query_fx, (curr_date, 'AUDUSD', aud_spot, 4.35, 5.50, 9.5))
-
-        curr_date += timedelta(days=1)
-
-    print("Seeding complete.")
+from src.shared.db import get_db_connection, copy_frame
+from src.shared.migrations import ensure_monthly_partitions, month_start
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+from src.shared.synthetic import (
+    DEFAULT_SEED, price_path, synthetic_option_chain,
+    synthetic_futures_history, synthetic_cot_history, synthetic_fx_history,
+)
+from src.shared.dates import business_days
+
+# Chain density for the seeded history. The defaults keep every expiry type
+# (dailies .. 1y monthlies) on a coarser strike grid so years load quickly;
+# --strike-step 5 --horizon-years 5 gives full-size SPX chains.
+SEED_STRIKE_STEP = 50.0
+SEED_HORIZON_YEARS = 1.0
+
+RAW_TABLES = ('raw_options', 'raw_futures', 'raw_cot', 'raw_fx')
+
+
+def month_chunks(days: list, spots: np.ndarray) -> list:
+    """
+    Splits (day, spot) pairs by calendar month, one COPY per month.
+    """
+    chunks = {}
+    for d, spot in zip(days, spots):
+        chunks.setdefault(month_start(d), []).append((d, float(spot)))
+    return list(chunks.values())
+
+
+def land_frame(df: pd.DataFrame, source: str, key_column: str, sort_by=()):
+    """
+    Writes one landing file per key and day, as the ingestion scripts do.
+    """
+    for key, part in df.groupby(key_column, sort=True):
+        write_landing(part, source, key, sort_by=sort_by)
+
+
+def seed_options_chunk(chunk: list, seed: int, strike_step: float, horizon_years: float) -> int:
+    """
+    Generates and loads one month of SPX chains (Postgres over a single
+    connection and / or the landing zone, per RAW_STORE).
+    """
+    df = pd.concat(
+        [synthetic_option_chain(d, spot, seed=seed, strike_step=strike_step, horizon_years=horizon_years) for d, spot in chunk],
+        ignore_index=True,
+    )
+    if landing_enabled():
+        land_frame(df, 'options', 'underlying', sort_by=('expiry', 'strike'))
+    if postgres_enabled():
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SET synchronous_commit = off")
+            copy_frame(df, 'raw_options', conn)
+            conn.commit()
+    return len(df)
+
+
+def clear_range(start: date, end: date):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            for table in RAW_TABLES:
+                cur.execute(f"DELETE FROM {table} WHERE as_of BETWEEN %s AND %s", (start, end))
+        conn.commit()
+
+
+def seed_data(start: date, end: date, seed: int = DEFAULT_SEED, strike_step: float = SEED_STRIKE_STEP,
+              horizon_years: float = SEED_HORIZON_YEARS, workers: int = 1, replace: bool = True) -> dict:
+    """
+    Seeds SPX chains, GOLD futures, COT and AUDUSD for every business day in
+    [start, end]. Returns rows loaded per table.
+
+    Chains, futures and COT go where RAW_STORE points (landing days are
+    always replaced); AUDUSD goes to raw_fx, as ingest_fx_prices does.
+    """
+    days = business_days(start, end)
+    if not days:
+        print("No business days in range.")
+        return {}
+    print(f"Seeding {len(days)} business days ({start} -> {end})...")
+
+    if postgres_enabled():
+        if replace:
+            clear_range(start, end)
+        ensure_monthly_partitions(start, end)
+
+    futures = synthetic_futures_history(days, seed=seed)
+    cot = synthetic_cot_history(days, seed=seed)
+    if landing_enabled():
+        land_frame(futures, 'futures', 'underlying', sort_by=('expiry',))
+        land_frame(cot, 'cot', 'market')
+    if postgres_enabled():
+        copy_frame(futures, 'raw_futures')
+        copy_frame(cot, 'raw_cot')
+    counts = {
+        'raw_futures': len(futures),
+        'raw_cot': len(cot),
+        'raw_fx': copy_frame(synthetic_fx_history(days, seed=seed), 'raw_fx'),
+    }
+
+    spots = price_path(len(days), 4500.0, 0.16, np.random.default_rng([seed, 0]))
+    chunks = month_chunks(days, spots)
+    args = (seed, strike_step, horizon_years)
+    counts['raw_options'] = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk, count in zip(chunks, pool.map(seed_options_chunk, chunks, *[[a] * len(chunks) for a in args])):
+                counts['raw_options'] += count
+                print(f"  {chunk[0][0]:%Y-%m}: {count} options")
+    else:
+        for chunk in chunks:
+            count = seed_options_chunk(chunk, *args)
+            counts['raw_options'] += count
+            print(f"  {chunk[0][0]:%Y-%m}: {count} options")
+
+    return counts
+
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--days", type=int, default=30, help="Days of history to seed")
+    parser = argparse.ArgumentParser(description="Seed synthetic SPX / GOLD / COT / AUDUSD history with bulk COPY loads.")
+    parser.add_argument("--days", type=int, default=30, help="Calendar days of history ending today (ignored with --start)")
+    parser.add_argument("--years", type=float, default=None, help="Years of history ending today")
+    parser.add_argument("--start", type=str, default=None, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, default=None, help="Last date (YYYY-MM-DD, default: today)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Generator seed")
+    parser.add_argument("--strike-step", type=float, default=SEED_STRIKE_STEP, help="Strike grid spacing (5 for full-size chains)")
+    parser.add_argument("--horizon-years", type=float, default=SEED_HORIZON_YEARS, help="Longest expiry in years (5 for full-size chains)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes generating and loading chains")
+    parser.add_argument("--append", action="store_true", help="Keep existing rows in the range instead of replacing them")
     args = parser.parse_args()
-    
+
+    try:
+        end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else date.today()
+        if args.start:
+            start = datetime.strptime(args.start, "%Y-%m-%d").date()
+        elif args.years:
+            start = end - timedelta(days=int(args.years * 365))
+        else:
+            start = end - timedelta(days=args.days)
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        sys.exit(1)
+
     try:
-        seed_data(args.days)
+        t0 = time.perf_counter()
+        counts = seed_data(start, end, args.seed, args.strike_step, args.horizon_years, args.workers, not args.append)
+        elapsed = time.perf_counter() - t0
+        total = sum(counts.values())
+        print(f"Seeding complete: {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+        for table, count in counts.items():
+            print(f"  {table}: {count:,}")
     except Exception as e:
         print(f"Error seeding data: {e}")
+        sys.exit(1)
@@ -0,0 +1,56 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.notify import ChangeSubscriber, debounce, REPORT_TABLES
+from src.reporting.report_generator import generate_report, save_report
+from src.gpu_worker.worker import enqueue_gpu_job
+from src.shared.metrics import METRICS_PORT, start_metrics_server
+
+def main():
+    parser = argparse.ArgumentParser(description="React to score / feature changes (LISTEN dealerflow_changes).")
+    parser.add_argument("--output-dir", type=str, default="reports", help="Where regenerated reports are written")
+    parser.add_argument("--quiet-period", type=float, default=2.0, help="Seconds without new events before acting on a batch")
+    parser.add_argument("--no-reports", action="store_true", help="Do not regenerate reports")
+    parser.add_argument("--no-gpu-jobs", action="store_true", help="Do not enqueue GPU regime jobs")
+    parser.add_argument("--verbose", action="store_true", help="Print every change event")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT, help="Serve Prometheus /metrics on this port (0 = off)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    subscriber = ChangeSubscriber()
+
+    if args.verbose:
+        subscriber.subscribe(lambda e: print(f"{e.op} {e.table} {e.as_of} {e.key or ''}"))
+
+    def regenerate_reports(events):
+        for as_of in sorted({e.as_of for e in events if e.as_of}):
+            report = generate_report(as_of)
+            if report:
+                save_report(report, as_of, args.output_dir)
+
+    def enqueue_regime_jobs(events):
+        for as_of in sorted({e.as_of for e in events if e.as_of}):
+            enqueue_gpu_job('regime_clustering', as_of)
+
+    if not args.no_reports:
+        os.makedirs(args.output_dir, exist_ok=True)
+        subscriber.subscribe(debounce(regenerate_reports, args.quiet_period), REPORT_TABLES)
+    if not args.no_gpu_jobs:
+        subscriber.subscribe(debounce(enqueue_regime_jobs, args.quiet_period), ['asset_scores'])
+
+    start_metrics_server(args.metrics_port)
+    print("Listening for changes (Ctrl+C to stop)...")
+    subscriber.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        subscriber.stop()
+
+if __name__ == "__main__":
+    main()
@@ -73,3 +73,17 @@ CREATE TABLE IF NOT EXISTS features_equity_concentration (
     concentration_risk  TEXT,          -- 'LOW', 'ELEVATED', 'EXTREME'
     created_at          TIMESTAMPTZ DEFAULT now()
 );
+
+-- 7. Change notifications (if migration 002 has been applied; it attaches
+-- these itself when the tables already exist)
+DO $$
+BEGIN
+    IF to_regproc('attach_change_notify') IS NOT NULL THEN
+        PERFORM attach_change_notify('features_fx_jpy');
+        PERFORM attach_change_notify('features_rates_spreads');
+        PERFORM attach_change_notify('features_reflexivity_jp');
+        PERFORM attach_change_notify('features_crossborder_fx_equity');
+        PERFORM attach_change_notify('features_crossborder_equity_fxhedge');
+        PERFORM attach_change_notify('features_equity_concentration');
+    END IF;
+END $$;
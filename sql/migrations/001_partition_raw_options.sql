@@ -0,0 +1,65 @@
+-- 001: Range-partition raw_options by month on as_of.
+--
+-- * Hot numeric columns become float8 (DOUBLE PRECISION) instead of NUMERIC.
+-- * id becomes BIGSERIAL; the primary key must include the partition key.
+-- * A DEFAULT partition catches rows for months that have no partition yet
+--   (src/shared/migrations.ensure_monthly_partitions moves them out).
+-- * idx_raw_options_as_of_underlying becomes a covering index for the
+--   columns compute_spx_features / compute_futures_options_features read,
+--   so per-day feature reads are index-only scans on a single partition.
+
+ALTER TABLE raw_options RENAME TO raw_options_heap;
+ALTER INDEX IF EXISTS idx_raw_options_as_of_underlying RENAME TO idx_raw_options_heap_as_of_underlying;
+ALTER SEQUENCE IF EXISTS raw_options_id_seq RENAME TO raw_options_heap_id_seq;
+
+CREATE TABLE raw_options (
+    id BIGSERIAL,
+    as_of DATE NOT NULL,
+    underlying VARCHAR(20) NOT NULL, -- e.g., 'SPX'
+    option_symbol VARCHAR(50) NOT NULL,
+    type VARCHAR(4) NOT NULL, -- 'call' or 'put'
+    strike DOUBLE PRECISION NOT NULL,
+    expiry DATE NOT NULL,
+    underlying_price DOUBLE PRECISION,
+    bid DOUBLE PRECISION,
+    ask DOUBLE PRECISION,
+    last DOUBLE PRECISION,
+    open_interest DOUBLE PRECISION,
+    implied_volatility DOUBLE PRECISION,
+    delta DOUBLE PRECISION,
+    gamma DOUBLE PRECISION,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (as_of, id)
+) PARTITION BY RANGE (as_of);
+
+CREATE TABLE raw_options_default PARTITION OF raw_options DEFAULT;
+
+-- One partition per month already present in the heap table
+DO $$
+DECLARE
+    m DATE;
+BEGIN
+    FOR m IN SELECT DISTINCT date_trunc('month', as_of)::date FROM raw_options_heap LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF raw_options FOR VALUES FROM (%L) TO (%L)',
+            'raw_options_' || to_char(m, 'YYYY_MM'), m, (m + INTERVAL '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO raw_options (
+    as_of, underlying, option_symbol, type, strike, expiry, underlying_price,
+    bid, ask, last, open_interest, implied_volatility, delta, gamma, created_at
+)
+SELECT
+    as_of, underlying, option_symbol, type, strike, expiry, underlying_price,
+    bid, ask, last, open_interest, implied_volatility, delta, gamma, created_at
+FROM raw_options_heap;
+
+DROP TABLE raw_options_heap;
+
+-- Covering index for the feature projections (created on every partition)
+CREATE INDEX idx_raw_options_as_of_underlying ON raw_options (as_of, underlying)
+    INCLUDE (type, strike, expiry, open_interest, gamma, delta, underlying_price, implied_volatility);
+
+ANALYZE raw_options;
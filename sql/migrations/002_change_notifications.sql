@@ -0,0 +1,53 @@
+-- 002: NOTIFY on score / feature writes.
+--
+-- Every INSERT / UPDATE / DELETE on asset_scores and the features_* tables
+-- sends a JSON payload on the 'dealerflow_changes' channel:
+--   {"table": "asset_scores", "op": "INSERT", "as_of": "2024-01-05", "key": "SPX"}
+-- key is the row's symbol / underlying / pair (null for date-keyed tables).
+-- Identical payloads within one transaction are delivered once, at commit.
+-- src/shared/notify.ChangeSubscriber LISTENs and fans events out to callbacks.
+
+CREATE OR REPLACE FUNCTION notify_dealerflow_change() RETURNS trigger AS $$
+DECLARE
+    rec JSONB := CASE WHEN TG_OP = 'DELETE' THEN to_jsonb(OLD) ELSE to_jsonb(NEW) END;
+BEGIN
+    PERFORM pg_notify('dealerflow_changes', json_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'as_of', rec ->> 'as_of',
+        'key', CASE WHEN TG_NARGS > 0 THEN rec ->> TG_ARGV[0] END
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Attaches the trigger to `tbl` (no-op if the table does not exist yet, e.g.
+-- the macro tables before scripts/init_macro_db.py has run).
+CREATE OR REPLACE FUNCTION attach_change_notify(tbl TEXT, key_column TEXT DEFAULT NULL) RETURNS VOID AS $$
+BEGIN
+    IF to_regclass(tbl) IS NULL THEN
+        RETURN;
+    END IF;
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', tbl || '_notify', tbl);
+    EXECUTE format(
+        'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON %I FOR EACH ROW EXECUTE FUNCTION notify_dealerflow_change(%s)',
+        tbl || '_notify', tbl, coalesce(quote_literal(key_column), '')
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT attach_change_notify('asset_scores', 'symbol');
+SELECT attach_change_notify('features_equity', 'underlying');
+SELECT attach_change_notify('features_gamma_term', 'underlying');
+SELECT attach_change_notify('features_hedge_flow', 'underlying');
+SELECT attach_change_notify('features_futures_options', 'underlying');
+SELECT attach_change_notify('features_commodity', 'underlying');
+SELECT attach_change_notify('features_fx', 'pair');
+SELECT attach_change_notify('features_credit');
+SELECT attach_change_notify('features_rates');
+SELECT attach_change_notify('features_fx_jpy');
+SELECT attach_change_notify('features_rates_spreads');
+SELECT attach_change_notify('features_reflexivity_jp');
+SELECT attach_change_notify('features_crossborder_fx_equity');
+SELECT attach_change_notify('features_crossborder_equity_fxhedge');
+SELECT attach_change_notify('features_equity_concentration');
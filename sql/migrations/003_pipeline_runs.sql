@@ -0,0 +1,16 @@
+-- 003: Last run of each pipeline stage per date (src/pipeline/dag.py).
+--
+-- fingerprint hashes the stage's input rows when it last succeeded; a stage
+-- whose current fingerprint matches is skipped. as_of = '0001-01-01' marks
+-- stages that run once per pipeline run rather than per date.
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    stage VARCHAR(64) NOT NULL,
+    as_of DATE NOT NULL,
+    fingerprint VARCHAR(32),
+    status VARCHAR(10) NOT NULL, -- 'success', 'failed'
+    duration_s DOUBLE PRECISION,
+    error TEXT,
+    finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (stage, as_of)
+);
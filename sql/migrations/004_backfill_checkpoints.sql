@@ -0,0 +1,31 @@
+-- 004: Checkpoints for multi-date backfills (src/pipeline/backfill.py).
+--
+-- backfill_id hashes the stage selection and date range, so rerunning the
+-- same backfill resumes it: dates already 'done' for a phase are not run
+-- again. phase is 'once' (run-once stages, as_of = '0001-01-01'), 'dates'
+-- (sharded across worker processes) or 'sequential' (stages that read their
+-- own earlier dates, run in date order).
+
+CREATE TABLE IF NOT EXISTS backfill_runs (
+    backfill_id VARCHAR(32) PRIMARY KEY,
+    stages TEXT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    dates_total INTEGER NOT NULL,
+    status VARCHAR(10) NOT NULL, -- 'running', 'done', 'failed'
+    dates_per_minute DOUBLE PRECISION,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    backfill_id VARCHAR(32) NOT NULL REFERENCES backfill_runs (backfill_id) ON DELETE CASCADE,
+    phase VARCHAR(10) NOT NULL,
+    as_of DATE NOT NULL,
+    status VARCHAR(10) NOT NULL, -- 'done', 'failed'
+    worker INTEGER, -- pid of the process that ran the date
+    duration_s DOUBLE PRECISION,
+    error TEXT,
+    finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (backfill_id, phase, as_of)
+);
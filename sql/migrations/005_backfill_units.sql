@@ -0,0 +1,24 @@
+-- 005: Date x asset work units for sharded backfills (src/pipeline/work_units.py).
+--
+-- Workers (local processes or the pods of an indexed Kubernetes Job) claim
+-- units with FOR UPDATE SKIP LOCKED, preferring their own shard. asset '*'
+-- is the date's cross-asset stages (backfill_runs.stages), claimable once
+-- every asset unit of that date is done. A claim older than the claim
+-- timeout is taken over, so a lost pod does not strand its units.
+
+CREATE TABLE IF NOT EXISTS backfill_units (
+    backfill_id VARCHAR(32) NOT NULL REFERENCES backfill_runs (backfill_id) ON DELETE CASCADE,
+    as_of DATE NOT NULL,
+    asset VARCHAR(32) NOT NULL,
+    shard INTEGER NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending', -- 'pending', 'claimed', 'done', 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by VARCHAR(128),
+    claimed_at TIMESTAMP,
+    duration_s DOUBLE PRECISION,
+    error TEXT,
+    finished_at TIMESTAMP,
+    PRIMARY KEY (backfill_id, as_of, asset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_backfill_units_claim ON backfill_units (backfill_id, status, shard, as_of);
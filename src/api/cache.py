@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, Optional
+
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 512
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    content_type: str
+    etag: str
+    tables: frozenset
+    # (start, end) as_of range the payload covers; None = not date-scoped
+    dates: Optional[tuple] = None
+    gzipped: Optional[bytes] = field(default=None, repr=False)
+
+    def gzip_body(self) -> Optional[bytes]:
+        """
+        Compressed body, built on first use and kept with the entry.
+        None when the body is too small to be worth compressing.
+        """
+        if len(self.body) < GZIP_MIN_BYTES:
+            return None
+        if self.gzipped is None:
+            self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self.gzipped
+
+    @property
+    def gzip_etag(self) -> str:
+        """
+        ETag of the gzipped representation, which has different bytes.
+        """
+        return self.etag[:-1] + '-gzip"'
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    True when an Accept-Encoding header allows gzip (q > 0, directly or via *).
+    """
+    qualities = {}
+    for item in (accept_encoding or '').split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def strong_etag(body: bytes) -> str:
+    """
+    Strong validator: identical bytes <=> identical ETag.
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class ResponseCache:
+    """
+    In-memory LRU of rendered API responses.
+
+    Each entry is tagged with the tables its payload was read from, so a write
+    to e.g. asset_scores drops only the score / macro / report responses.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation; see put()
+        self.generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, content_type: str, tables: Iterable[str], generation: int = None, dates: tuple = None) -> CachedResponse:
+        """
+        Stores a response. Pass the `generation` read before querying the
+        database: if an invalidation happened while the query ran, the
+        (possibly stale) response is returned but not cached.
+        """
+        entry = CachedResponse(body, content_type, strong_etag(body), frozenset(tables), dates)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, tables: Iterable[str] = None, as_of: date = None) -> int:
+        """
+        Drops entries that depend on any of `tables` (all entries when None),
+        only those whose date range covers `as_of` if given.
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            self.generation += 1
+            if tables is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            tables = set(tables)
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.tables & tables and (
+                    as_of is None or entry.dates is None or entry.dates[0] <= as_of <= entry.dates[1]
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
@@ -0,0 +1,265 @@
+import os
+import json
+import asyncio
+from dataclasses import asdict
+from datetime import date, timedelta
+from aiohttp import web
+from dotenv import load_dotenv
+from src.api.cache import ResponseCache, accepts_gzip
+from src.shared.db import execute_query
+from src.shared.notify import ChangeSubscriber, REPORT_TABLES
+from src.shared.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render as render_metrics
+from src.llm.macro_state import build_macro_state
+from src.reporting.report_generator import load_report_data, render_report
+
+load_dotenv()
+
+API_CACHE_SIZE = int(os.getenv('API_CACHE_SIZE', '1024'))
+# 'notify': evict on LISTEN events from migration 002's triggers (per table + date);
+# 'poll': evict per table when pg_stat_user_tables write counters move
+API_INVALIDATION = os.getenv('API_INVALIDATION', 'notify').lower()
+# Seconds between checks of table write counters for invalidation ('poll')
+API_POLL_INTERVAL = float(os.getenv('API_POLL_INTERVAL', '2'))
+# Longest date range a single request may ask for
+MAX_RANGE_DAYS = 366
+
+# /features/{name} -> (table, column filtered by ?symbol=)
+FEATURE_TABLES = {
+    'equity': ('features_equity', 'underlying'),
+    'gamma_term': ('features_gamma_term', 'underlying'),
+    'hedge_flow': ('features_hedge_flow', 'underlying'),
+    'futures_options': ('features_futures_options', 'underlying'),
+    'commodity': ('features_commodity', 'underlying'),
+    'fx': ('features_fx', 'pair'),
+    'credit': ('features_credit', None),
+    'rates': ('features_rates', None),
+    'fx_jpy': ('features_fx_jpy', None),
+    'rates_spreads': ('features_rates_spreads', None),
+    'reflexivity_jp': ('features_reflexivity_jp', None),
+    'crossborder_fx_equity': ('features_crossborder_fx_equity', None),
+}
+
+API = web.AppKey('api', object)
+WRITE_WATCHER = web.AppKey('write_watcher', asyncio.Task)
+
+MACRO_TABLES = ('asset_scores', 'features_rates_spreads', 'features_reflexivity_jp', 'features_crossborder_fx_equity')
+
+WATCHED_TABLES = sorted({'asset_scores', *MACRO_TABLES, *REPORT_TABLES, *(t for t, _ in FEATURE_TABLES.values())})
+
+# Cumulative per-table write counters; a change means rows were written
+WRITE_COUNTERS_QUERY = """
+SELECT relname, n_tup_ins + n_tup_upd + n_tup_del AS writes
+FROM pg_stat_user_tables
+WHERE relname = ANY(%s)
+"""
+
+
+def parse_dates(request) -> tuple:
+    """
+    ?date=YYYY-MM-DD or ?start=...&end=... -> (start, end).
+    """
+    query = request.query
+    try:
+        if 'date' in query:
+            start = end = date.fromisoformat(query['date'])
+        elif 'start' in query and 'end' in query:
+            start, end = date.fromisoformat(query['start']), date.fromisoformat(query['end'])
+        else:
+            raise web.HTTPBadRequest(text=json.dumps({'error': 'pass date or start and end'}), content_type='application/json')
+    except ValueError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': 'dates must be YYYY-MM-DD'}), content_type='application/json')
+    if end < start or end - start > timedelta(days=MAX_RANGE_DAYS):
+        raise web.HTTPBadRequest(text=json.dumps({'error': f'range must be 0-{MAX_RANGE_DAYS} days'}), content_type='application/json')
+    return start, end
+
+
+def rows_as_json(table: str, start: date, end: date, key_column: str = None, key: str = None) -> bytes:
+    """
+    Rows of `table` for the date range, serialised to a JSON array by Postgres.
+    """
+    sql = f"""
+    SELECT coalesce(json_agg(t ORDER BY t.as_of), '[]')::text AS body
+    FROM (SELECT * FROM {table} WHERE as_of BETWEEN %s AND %s {f'AND {key_column} = %s' if key else ''}) t
+    """
+    params = (start, end, key) if key else (start, end)
+    return execute_query(sql, params, fetch=True)[0]['body'].encode()
+
+
+def macro_states_json(start: date, end: date) -> bytes:
+    rows = execute_query("SELECT DISTINCT as_of FROM asset_scores WHERE as_of BETWEEN %s AND %s ORDER BY as_of", (start, end), fetch=True)
+    return json.dumps([asdict(build_macro_state(row['as_of'])) for row in rows]).encode()
+
+
+def reports_json(start: date, end: date) -> bytes:
+    return json.dumps([
+        {'as_of': item['as_of'].isoformat(), 'markdown': render_report(item)}
+        for item in load_report_data(start, end)
+    ]).encode()
+
+
+class DealerFlowAPI:
+    """
+    Read-only HTTP API over scores, features, MacroState and reports.
+
+    Responses are cached in memory (LRU) with strong ETags, so repeat
+    dashboard requests are answered without touching Postgres: a matching
+    If-None-Match gets a 304, everything else the cached (optionally gzipped)
+    body. Cached responses are dropped when their tables are written to:
+    per table and date from change notifications, or per table from polled
+    pg_stat_user_tables write counters (see API_INVALIDATION).
+    """
+
+    def __init__(self, cache_size: int = API_CACHE_SIZE, poll_interval: float = API_POLL_INTERVAL, invalidation: str = API_INVALIDATION):
+        self.cache = ResponseCache(cache_size)
+        self.poll_interval = poll_interval
+        self.invalidation = invalidation
+        self.subscriber = None
+        self._pending = {}
+        self._write_counters = None
+
+    async def respond(self, request, tables, dates, content_type, loader, *args):
+        """
+        Cached response for the request; None when the loader found nothing
+        (returned None), which is not cached.
+        """
+        key = request.path_qs
+        entry = self.cache.get(key)
+        if entry is None:
+            # One database load per key, however many requests are waiting on it
+            future = self._pending.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._load(key, tables, dates, content_type, loader, *args))
+                self._pending[key] = future
+                future.add_done_callback(lambda _: self._pending.pop(key, None))
+            entry = await asyncio.shield(future)
+            if entry is None:
+                return None
+
+        # Gzip and identity are different bytes, so each has its own strong ETag
+        body, etag = entry.body, entry.etag
+        gzipped = entry.gzip_body() if accepts_gzip(request.headers.get('Accept-Encoding')) else None
+        if gzipped is not None:
+            body, etag = gzipped, entry.gzip_etag
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (if_none_match.strip() == '*' or etag in [t.strip().removeprefix('W/') for t in if_none_match.split(',')]):
+            return web.Response(status=304, headers=headers)
+
+        if gzipped is not None:
+            headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=body, headers=headers, content_type=content_type, charset='utf-8')
+
+    async def _load(self, key, tables, dates, content_type, loader, *args):
+        generation = self.cache.generation
+        body = await asyncio.get_running_loop().run_in_executor(None, loader, *args)
+        if body is None:
+            return None
+        return self.cache.put(key, body, content_type, tables, generation, dates)
+
+    async def scores(self, request):
+        start, end = parse_dates(request)
+        symbol = request.query.get('symbol')
+        return await self.respond(request, ('asset_scores',), (start, end), 'application/json', rows_as_json, 'asset_scores', start, end, 'symbol', symbol)
+
+    async def features(self, request):
+        name = request.match_info['name']
+        if name not in FEATURE_TABLES:
+            raise web.HTTPNotFound(text=json.dumps({'error': f'unknown feature set {name}', 'available': sorted(FEATURE_TABLES)}), content_type='application/json')
+        table, key_column = FEATURE_TABLES[name]
+        start, end = parse_dates(request)
+        symbol = request.query.get('symbol') if key_column else None
+        return await self.respond(request, (table,), (start, end), 'application/json', rows_as_json, table, start, end, key_column, symbol)
+
+    async def macro_state(self, request):
+        start, end = parse_dates(request)
+        return await self.respond(request, MACRO_TABLES, (start, end), 'application/json', macro_states_json, start, end)
+
+    async def reports(self, request):
+        start, end = parse_dates(request)
+        return await self.respond(request, REPORT_TABLES, (start, end), 'application/json', reports_json, start, end)
+
+    async def report_markdown(self, request):
+        try:
+            as_of = date.fromisoformat(request.match_info['date'])
+        except ValueError:
+            raise web.HTTPBadRequest(text=json.dumps({'error': 'dates must be YYYY-MM-DD'}), content_type='application/json')
+
+        def load(as_of):
+            data = load_report_data(as_of, as_of)
+            return render_report(data[0]).encode() if data else None
+
+        response = await self.respond(request, REPORT_TABLES, (as_of, as_of), 'text/markdown', load, as_of)
+        if response is None:
+            raise web.HTTPNotFound(text=json.dumps({'error': f'no scores for {as_of}'}), content_type='application/json')
+        return response
+
+    async def health(self, request):
+        return web.json_response({
+            'status': 'ok',
+            'cache_entries': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+        })
+
+    async def metrics(self, request):
+        return web.Response(body=render_metrics().encode(), headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+    def poll_write_counters(self) -> list:
+        """
+        Returns the watched tables written to since the last poll.
+        """
+        rows = execute_query(WRITE_COUNTERS_QUERY, (WATCHED_TABLES,), fetch=True)
+        counters = {row['relname']: row['writes'] for row in rows}
+        previous, self._write_counters = self._write_counters, counters
+        if previous is None:
+            return []
+        return [table for table, writes in counters.items() if previous.get(table) != writes]
+
+    async def watch_writes(self, app):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                changed = await loop.run_in_executor(None, self.poll_write_counters)
+                if changed:
+                    removed = self.cache.invalidate(changed)
+                    print(f"Invalidated {removed} cached responses after writes to {', '.join(sorted(changed))}")
+            except Exception as e:
+                print(f"Error polling table write counters: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def on_change(self, event):
+        self.cache.invalidate([event.table], event.as_of)
+
+    async def start_watcher(self, app):
+        if self.invalidation == 'notify':
+            self.subscriber = ChangeSubscriber()
+            self.subscriber.subscribe(self.on_change, WATCHED_TABLES)
+            # Notifications sent while disconnected are lost: start clean
+            self.subscriber.on_reconnect(self.cache.invalidate)
+            self.subscriber.start()
+        else:
+            app[WRITE_WATCHER] = asyncio.ensure_future(self.watch_writes(app))
+
+    async def stop_watcher(self, app):
+        if self.subscriber is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.subscriber.stop)
+        else:
+            app[WRITE_WATCHER].cancel()
+
+
+def create_app(cache_size: int = API_CACHE_SIZE, poll_interval: float = API_POLL_INTERVAL, invalidation: str = API_INVALIDATION) -> web.Application:
+    api = DealerFlowAPI(cache_size, poll_interval, invalidation)
+    app = web.Application()
+    app[API] = api
+    app.add_routes([
+        web.get('/health', api.health),
+        web.get('/metrics', api.metrics),
+        web.get('/scores', api.scores),
+        web.get('/features/{name}', api.features),
+        web.get('/macro-state', api.macro_state),
+        web.get('/reports', api.reports),
+        web.get('/reports/{date}.md', api.report_markdown),
+    ])
+    app.on_startup.append(api.start_watcher)
+    app.on_cleanup.append(api.stop_watcher)
+    return app
@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import time
+import runpy
+import subprocess
+
+# `python -m src <command> [args]`: one entry point for the scripts/ tools.
+# Only the chosen command's module is imported, so `report` never loads
+# Databento, SciPy or the ingestion stack. Each command keeps its script's
+# own argparse options (`python -m src <command> --help`).
+COMMANDS = {
+    # Setup
+    'init-db': ('scripts.init_db', "Create the schema and apply migrations"),
+    'init-macro-db': ('scripts.init_macro_db', "Create the macro / reflexivity tables"),
+    'init-energy-db': ('scripts.init_energy_db', "Create the energy tables"),
+    'migrate': ('scripts.migrate', "Apply pending SQL migrations"),
+    'partitions': ('scripts.manage_partitions', "Create / detach / attach raw_options partitions"),
+    'seed': ('scripts.seed_mock_data', "Seed mock data for the demo"),
+    # Ingestion
+    'ingest-spx-options': ('scripts.ingest_spx_options', "Ingest index option chains (Databento)"),
+    'ingest-spx-csv': ('scripts.ingest_spx_csv', "Ingest an SPX chain from CSV"),
+    'ingest-futures-options': ('scripts.ingest_futures_options', "Ingest CME futures option chains"),
+    'ingest-futures': ('scripts.ingest_all_databento', "Ingest front / back futures (Databento)"),
+    'ingest-cot': ('scripts.ingest_cot_data', "Ingest CFTC COT reports"),
+    'ingest-fx': ('scripts.ingest_fx_prices', "Ingest FX prices (Alpha Vantage)"),
+    'ingest-gold': ('scripts.ingest_gold_prices', "Ingest gold spot (Alpha Vantage)"),
+    'ingest-oil': ('scripts.ingest_energy_oil', "Ingest oil futures (EIA)"),
+    'ingest-power': ('scripts.ingest_energy_power', "Ingest AEMO power prices"),
+    # Features, scores, outputs
+    'features-spx': ('scripts.compute_spx_features', "Compute index options features"),
+    'features-commodity': ('scripts.compute_commodity_features', "Compute commodity features"),
+    'features-fx': ('scripts.compute_fx_features', "Compute FX features"),
+    'features-macro': ('scripts.compute_macro_features', "Compute macro / reflexivity features"),
+    'chain-cache': ('scripts.build_chain_cache', "Materialize the memory-mapped chain cache"),
+    'score': ('scripts.score_assets', "Compute instability scores and regimes"),
+    'report': ('scripts.generate_report', "Render markdown reports"),
+    'dashboard': ('scripts.generate_dashboard', "Render the macro dashboard"),
+    'macro-note': ('scripts.generate_macro_note_llm', "Generate LLM macro notes"),
+    'pipeline': ('scripts.run_pipeline', "Run the ingest -> features -> scores -> reports graph"),
+    'backfill': ('scripts.run_backfill', "Backfill a date range across worker processes, resumable"),
+    'backfill-units': ('scripts.run_backfill_units', "Sharded date x asset backfill (local workers or indexed k8s Job)"),
+    'bench': ('scripts.run_benchmarks', "Benchmark the pipeline on synthetic full-size data"),
+    # Services
+    'api': ('scripts.run_api', "Serve the read-only HTTP API"),
+    'watch': ('scripts.watch_changes', "React to score / feature change notifications"),
+    'llm-stub': ('scripts.run_llm_stub', "Local OpenAI-compatible stub for macro notes"),
+}
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def usage() -> str:
+    lines = [
+        "usage: python -m src [--profile-imports | --trace[=FILE] | --query-stats[=FILE] |",
+        "                      --profile-memory[=FILE] | --memory-budget=MB] <command> [args...]",
+        "",
+        "commands:",
+    ]
+    lines += [f"  {name:<24}{help_text}" for name, (_, help_text) in COMMANDS.items()]
+    lines += [
+        "",
+        "--trace prints a per-span timing / rows / memory table when the command ends;",
+        "--trace=FILE also writes a Chrome trace (chrome://tracing, Perfetto).",
+        "--query-stats prints statement counts / timings by call site (EXPLAIN_TOP_N=5 adds",
+        "EXPLAIN ANALYZE plans for the slowest); --query-stats=FILE also saves them as JSON.",
+        "--profile-memory prints per-stage traced / RSS peaks and the top allocating call sites;",
+        "--profile-memory=FILE also saves them as JSON. --memory-budget=MB shrinks chunk sizes",
+        "to stay under MB (default: MEMORY_BUDGET_MB, else 80% of the container limit).",
+        "Run `python -m src <command> --help` for a command's options.",
+    ]
+    return "\n".join(lines)
+
+
+def parse_import_times(stderr: str) -> tuple:
+    """
+    Splits `python -X importtime` output into ([(cumulative_us, self_us, depth, module)], other lines).
+    """
+    entries, other = [], []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+        elif not line.startswith('import time:'):
+            other.append(line)
+    return entries, other
+
+
+def format_import_profile(entries: list, top: int = 15) -> str:
+    total_us = sum(cum for cum, _, depth, _ in entries if depth == 0)
+    lines = [f"Import time: {total_us / 1e6:.3f}s across {len(entries)} modules", f"{'cumulative':>12}{'self':>10}  module"]
+    for cum, self_us, depth, module in sorted(entries, reverse=True)[:top]:
+        lines.append(f"{cum / 1e3:>10.1f}ms{self_us / 1e3:>8.1f}ms  {'  ' * depth}{module}")
+    return "\n".join(lines)
+
+
+def profile_command(argv: list) -> int:
+    """
+    Re-runs the command under `python -X importtime` and prints the
+    slowest imports plus total import and wall time.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'src', *argv],
+        cwd=PROJECT_ROOT, stderr=subprocess.PIPE, text=True,
+    )
+    wall = time.perf_counter() - start
+    entries, other = parse_import_times(proc.stderr)
+    if other:
+        print("\n".join(other), file=sys.stderr)
+    print(file=sys.stderr)
+    print(format_import_profile(entries), file=sys.stderr)
+    print(f"Wall time: {wall:.3f}s", file=sys.stderr)
+    return proc.returncode
+
+
+def trace_command(argv: list, trace_path: str = None) -> int:
+    """
+    Runs the command with tracing on, then prints the span summary (and
+    writes a Chrome trace to `trace_path`).
+    """
+    from src.shared.tracing import enable_tracing, format_trace_summary, export_chrome_trace
+
+    enable_tracing()
+    start = time.perf_counter()
+    try:
+        return main(argv)
+    finally:
+        print(file=sys.stderr)
+        print(format_trace_summary(), file=sys.stderr)
+        print(f"Wall time: {time.perf_counter() - start:.3f}s", file=sys.stderr)
+        if trace_path:
+            print(f"Chrome trace written to {export_chrome_trace(trace_path)}", file=sys.stderr)
+
+
+def query_stats_command(argv: list, report_path: str = None) -> int:
+    """
+    Runs the command with statement counting on, then prints the per call
+    site report (plus EXPLAIN plans when EXPLAIN_TOP_N is set).
+    """
+    from src.shared.query_stats import enable_query_stats, explain_slowest, format_query_report, save_query_report
+
+    enable_query_stats()
+    try:
+        return main(argv)
+    finally:
+        try:
+            plans = explain_slowest()
+        except Exception as e:
+            print(f"Could not capture EXPLAIN plans: {e}", file=sys.stderr)
+            plans = []
+        print(file=sys.stderr)
+        print(format_query_report(plans=plans), file=sys.stderr)
+        if report_path:
+            print(f"Query report written to {save_query_report(report_path, plans=plans)}", file=sys.stderr)
+
+
+def memory_command(argv: list, report_path: str = None) -> int:
+    """
+    Runs the command with tracemalloc and RSS sampling on, then prints the
+    per-stage peaks and top allocating call sites.
+    """
+    from src.shared.memory import enable_memory_profiling, format_memory_report, save_memory_report
+
+    enable_memory_profiling()
+    start = time.perf_counter()
+    try:
+        return main(argv)
+    finally:
+        print(file=sys.stderr)
+        print(format_memory_report(), file=sys.stderr)
+        print(f"Wall time: {time.perf_counter() - start:.3f}s", file=sys.stderr)
+        if report_path:
+            print(f"Memory report written to {save_memory_report(report_path)}", file=sys.stderr)
+
+
+def main(argv: list = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    if argv and argv[0] == '--profile-imports':
+        return profile_command(argv[1:])
+
+    if argv and (argv[0] == '--trace' or argv[0].startswith('--trace=')):
+        return trace_command(argv[1:], argv[0].partition('=')[2] or None)
+
+    if argv and (argv[0] == '--query-stats' or argv[0].startswith('--query-stats=')):
+        return query_stats_command(argv[1:], argv[0].partition('=')[2] or None)
+
+    if argv and (argv[0] == '--profile-memory' or argv[0].startswith('--profile-memory=')):
+        return memory_command(argv[1:], argv[0].partition('=')[2] or None)
+
+    if argv and argv[0].startswith('--memory-budget='):
+        from src.shared.memory import set_memory_budget
+        set_memory_budget(float(argv[0].partition('=')[2]))
+        return main(argv[1:])
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module, _ = COMMANDS[command]
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    sys.argv = [f"python -m src {command}", *args]
+    try:
+        runpy.run_module(module, run_name='__main__', alter_sys=True)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
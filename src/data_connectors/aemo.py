@@ -2,6 +2,7 @@ import requests
 import pandas as pd
 import io
 from datetime import datetime
+from src.shared.tracing import traced, record
 
 class AEMOClient:
     """
@@ -10,6 +11,7 @@ class AEMOClient:
     """
     BASE_URL = "https://aemo.com.au/aemo/data/nem/priceanddemand"
 
+    @traced('connector')
     def fetch_price_and_demand(self, year: int, month: int, region: str) -> pd.DataFrame:
         """
         Fetches monthly CSV for a specific region.
@@ -24,6 +26,7 @@ class AEMOClient:
         try:
             resp = requests.get(url, timeout=30)
             resp.raise_for_status()
+            record(bytes_in=len(resp.content))
             
             # Parse CSV
             # AEMO CSVs usually have headers like: REGION,SETTLEMENTDATE,TOTALDEMAND,RRP,PERIODTYPE
@@ -3,6 +3,7 @@ import requests
 import pandas as pd
 from datetime import datetime, date
 from dotenv import load_dotenv
+from src.shared.tracing import traced, record
 
 load_dotenv()
 
@@ -27,6 +28,7 @@ class AlphaVantageConnector:
         
         response = requests.get(self.base_url, params=params)
         response.raise_for_status()
+        record(bytes_in=len(response.content))
         data = response.json()
         
         # Check for API errors
@@ -38,6 +40,7 @@ class AlphaVantageConnector:
             
         return data
 
+    @traced('connector')
     def get_fx_daily(self, from_symbol: str = "AUD", to_symbol: str = "USD") -> pd.DataFrame:
         """
         Fetches daily FX rates. Returns DataFrame with ['date', 'pair', 'close'].
@@ -66,6 +69,7 @@ class AlphaVantageConnector:
         df['as_of'] = pd.to_datetime(df['as_of']).dt.date
         return df
 
+    @traced('connector')
     def get_commodity_daily(self, symbol: str = "GOLD") -> pd.DataFrame:
         """
         Fetches commodity prices via GLD ETF proxy (TIME_SERIES_DAILY).
@@ -95,6 +99,7 @@ class AlphaVantageConnector:
         df['as_of'] = pd.to_datetime(df['as_of']).dt.date
         return df
 
+    @traced('connector')
     def get_treasury_yield(self, interval: str = "daily", maturity: str = "3month") -> pd.DataFrame:
         """
         Fetches treasury yields (for USD Rate).
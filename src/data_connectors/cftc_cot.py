@@ -3,6 +3,13 @@ import requests
 import io
 import zipfile
 from datetime import date
+from src.shared.tracing import traced, record
+from src.shared.memory import chunk_rows
+
+# Rows parsed at a time from a yearly report (a disaggregated year is ~20k
+# rows x ~190 columns); shrunk under a memory budget
+COT_CHUNK_ROWS = 50_000
+COT_ROW_BYTES = 12_000
 
 class CFTCConnector:
     def __init__(self):
@@ -10,30 +17,33 @@ class CFTCConnector:
         # URL Pattern: https://www.cftc.gov/files/dea/history/...
         self.base_url = "https://www.cftc.gov/files/dea/history"
         
-    def fetch_financial_cot(self, year: int = 2025) -> pd.DataFrame:
+    @traced('connector')
+    def fetch_financial_cot(self, year: int = 2025, market: str = None) -> pd.DataFrame:
         """
         Fetches Traders in Financial Futures (TFF) data.
-        Includes AUD, etc.
+        Includes AUD, etc. `market` keeps only matching rows while parsing.
         """
         url = f"{self.base_url}/fin_fut_txt_{year}.zip"
         print(f"Downloading CFTC Financial COT from {url}...")
         
-        return self._download_and_parse(url, "fin")
+        return self._download_and_parse(url, "fin", market)
 
-    def fetch_disagg_cot(self, year: int = 2025) -> pd.DataFrame:
+    @traced('connector')
+    def fetch_disagg_cot(self, year: int = 2025, market: str = None) -> pd.DataFrame:
         """
         Fetches Disaggregated Futures data (Commodities).
-        Includes Gold, Oil, etc.
+        Includes Gold, Oil, etc. `market` keeps only matching rows while parsing.
         """
         url = f"{self.base_url}/fut_disagg_txt_{year}.zip"
         print(f"Downloading CFTC Disaggregated COT from {url}...")
         
-        return self._download_and_parse(url, "disagg")
+        return self._download_and_parse(url, "disagg", market)
 
-    def _download_and_parse(self, url: str, report_type: str) -> pd.DataFrame:
+    def _download_and_parse(self, url: str, report_type: str, market: str = None) -> pd.DataFrame:
         try:
             r = requests.get(url)
             r.raise_for_status()
+            record(bytes_in=len(r.content))
             
             with zipfile.ZipFile(io.BytesIO(r.content)) as z:
                 # Usually contains a single .txt file
@@ -42,7 +52,15 @@ class CFTCConnector:
                     # Parsing logic depends on format. 
                     # CFTC files are CSV-like but sometimes messy headers.
                     # We'll use standard pandas read_csv with loose settings.
-                    df = pd.read_csv(f, low_memory=False)
+                    # Parsed in chunks, so a market filter bounds peak memory.
+                    chunks = []
+                    for chunk in pd.read_csv(f, low_memory=False, chunksize=chunk_rows(COT_CHUNK_ROWS, COT_ROW_BYTES, 'cot parse')):
+                        if market:
+                            # Market_and_Exchange_Names is the first column of every CFTC report
+                            names = chunk.iloc[:, 0].astype(str)
+                            chunk = chunk[names.str.contains(market, case=False, na=False, regex=False)]
+                        chunks.append(chunk)
+                    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
                     
             # Basic normalization
             # Columns are huge and messy. We need to map them.
@@ -3,6 +3,7 @@ import pandas as pd
 import databento as db
 from dotenv import load_dotenv
 from datetime import date
+from src.shared.tracing import traced, record
 
 load_dotenv()
 
@@ -10,6 +11,7 @@ class DatabentoFuturesConnector:
     def __init__(self):
         self.client = db.Historical(os.getenv("DATABENTO_API_KEY"))
         
+    @traced('connector')
     def get_daily_bars(self, symbol: str, start_date: str, end_date: str, dataset: str = "GLBX.MDP3") -> pd.DataFrame:
         """
         Fetches daily OHLCV bars for a futures contract.
@@ -45,6 +47,7 @@ class DatabentoFuturesConnector:
                 stype_out="instrument_id"
             )
             
+            record(bytes_in=data.nbytes)
             df = data.to_df()
             
             if df.empty:
@@ -2,6 +2,7 @@ import os
 import requests
 import pandas as pd
 from dotenv import load_dotenv
+from src.shared.tracing import traced, record
 
 load_dotenv()
 
@@ -25,6 +26,7 @@ class EIAClient:
         try:
             resp = requests.get(url, params=params, timeout=30)
             resp.raise_for_status()
+            record(bytes_in=len(resp.content))
             return resp.json()
         except requests.exceptions.HTTPError as e:
             print(f"EIA API Error: {e}")
@@ -35,6 +37,7 @@ class EIAClient:
             print(f"Error fetching EIA data: {e}")
             return {}
 
+    @traced('connector')
     def get_series(self, path: str, start_date: str = None, end_date: str = None, facets: dict = None) -> pd.DataFrame:
         """
         Generic fetch for EIA v2 API.
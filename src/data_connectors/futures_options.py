@@ -0,0 +1,31 @@
+import pandas as pd
+from datetime import date
+from src.data_connectors.spx_options import SPXOptionsConnector
+from src.shared.markets import FUTURES_OPTIONS
+
+
+class FuturesOptionsConnector(SPXOptionsConnector):
+    """
+    CME futures options (GLBX). Reuses the SPX chain ingestion path; only the
+    dataset, symbology and pricing model (Black-76) differ.
+    """
+    dataset = "GLBX.MDP3"
+
+    def get_option_chain(self, target_date: date, underlying="GOLD", parent: str = None) -> pd.DataFrame:
+        """
+        Fetches the EOD chain for a futures options market, labelled with our
+        internal underlying name (e.g. 'GOLD') in raw_options.
+        `parent` overrides the FUTURES_OPTIONS lookup (e.g. 'ES' index futures).
+        """
+        parent = parent or FUTURES_OPTIONS[underlying]['parent']
+        df = super().get_option_chain(target_date, underlying=parent, dataset=self.dataset)
+        if not df.empty:
+            df['underlying'] = underlying
+        return df
+
+    def calculate_greeks(self, df: pd.DataFrame, underlying_price: float, futures: bool = True):
+        """
+        Updates df with Delta/Gamma/IV using vectorised Black-76.
+        `underlying_price` is the (front-month) futures price.
+        """
+        return super().calculate_greeks(df, underlying_price, futures=futures)
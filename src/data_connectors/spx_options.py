@@ -3,8 +3,10 @@ import databento as db
 import pandas as pd
 import numpy as np
 from datetime import date, datetime
-from py_vollib_vectorized import vectorized_implied_volatility, vectorized_delta, vectorized_gamma
+from src.features.option_chain import OptionChain
+from src.features.black_scholes import RISK_FREE_RATE
 from dotenv import load_dotenv
+from src.shared.tracing import traced, record
 
 load_dotenv()
 
@@ -16,9 +18,11 @@ class SPXOptionsConnector:
         
         self.client = db.Historical(self.api_key)
 
-    def get_option_chain(self, target_date: date, underlying="SPX") -> pd.DataFrame:
+    @traced('connector')
+    def get_option_chain(self, target_date: date, underlying="SPX", dataset="OPRA.PILLAR") -> pd.DataFrame:
         """
-        Fetches EOD option prices for SPX from Databento (OPRA).
+        Fetches EOD option prices for an options parent from Databento.
+        Defaults to SPX on OPRA; futures options pass dataset='GLBX.MDP3'.
         Returns DataFrame matching raw_options schema.
         """
         print(f"Fetching {underlying} options for {target_date} via Databento...")
@@ -28,14 +32,12 @@ class SPXOptionsConnector:
         
         try:
             # 1. Fetch Daily Bars (OHLCV-1d)
-            # Using GLBX.MDP3 for ES Options as a proxy if SPX fails, but user asked for SPX.
-            # OPRA.PILLAR is the dataset for SPX.
-            dataset = "OPRA.PILLAR"
+            # OPRA.PILLAR is the dataset for SPX, GLBX.MDP3 for CME futures options.
             
             # Note: OPRA full feed is huge. Filtering by symbol 'SPX' parent helps.
-            # Databento symbology for parent often requires .OPT suffix for options
+            # Databento parent symbology requires the .OPT suffix for options
             query_symbol = underlying
-            if dataset == "OPRA.PILLAR" and not underlying.endswith(".OPT"):
+            if not underlying.endswith(".OPT"):
                 query_symbol = f"{underlying}.OPT"
                 
             data = self.client.timeseries.get_range(
@@ -47,6 +49,7 @@ class SPXOptionsConnector:
                 end=end_str
             )
             
+            record(bytes_in=data.nbytes)
             df = data.to_df()
             
             if df.empty:
@@ -64,6 +67,7 @@ class SPXOptionsConnector:
                 start=start_str,
                 end=end_str
             )
+            record(bytes_in=defs.nbytes)
             df_defs = defs.to_df()
             
             # Reset index to access instrument_id
@@ -106,6 +110,10 @@ class SPXOptionsConnector:
                 if cfi_valid.any():
                     types = merged['cfi'].str[1].map({'C': 'call', 'P': 'put'})
             
+            if (types is None or types.isna().all()) and 'instrument_class' in merged.columns:
+                # GLBX definitions carry the option side directly
+                types = merged['instrument_class'].astype(str).map({'C': 'call', 'P': 'put'})
+            
             if types is None or types.isna().all():
                 # Fallback to raw_symbol parsing (OSI format: Root YYMMDD T Strike)
                 # Look for C/P followed by 8 digits at end (standard OSI)
@@ -127,14 +135,6 @@ class SPXOptionsConnector:
             out_df['delta'] = 0.0
             out_df['gamma'] = 0.0
             
-            return out_df 
-            
-            # Greeks placeholders
-            out_df['underlying_price'] = 0.0
-            out_df['implied_volatility'] = 0.0
-            out_df['delta'] = 0.0
-            out_df['gamma'] = 0.0
-            
             return out_df
 
         except Exception as e:
@@ -146,44 +146,28 @@ class SPXOptionsConnector:
                 print(f"Dataset {dataset} might not be enabled on your key.")
             return pd.DataFrame()
 
-    def calculate_greeks(self, df: pd.DataFrame, underlying_price: float):
+    @traced('greeks')
+    def calculate_greeks(self, df: pd.DataFrame, underlying_price: float, futures: bool = False):
         """
-        Updates df with Delta/Gamma/IV using py_vollib_vectorized.
+        Updates df with Delta/Gamma/IV using the vectorised Black-Scholes
+        kernels on an OptionChain (Black-76 when `futures`). Contracts within
+        ~8 hours of expiry keep their placeholder Greeks.
         """
         if df.empty: return df
         
         # Set underlying price
         df['underlying_price'] = underlying_price
         
-        # Time to expiry (years)
-        df['T'] = (pd.to_datetime(df['expiry']) - pd.to_datetime(df['as_of'])).dt.days / 365.0
-        mask = df['T'] > 0.001
-        
-        # Risk free rate
-        r = 0.045
-        
-        flag = df['type'].map({'call': 'c', 'put': 'p'})
-        
-        print("Calculating Greeks via Black-Scholes...")
-        # Use only valid rows for calculation
-        subset = df[mask].copy()
-        
-        # IV
-        iv = vectorized_implied_volatility(
-            subset['last'], underlying_price, subset['strike'], subset['T'], r, flag[mask], return_as='numpy'
-        )
-        subset['implied_volatility'] = np.nan_to_num(iv)
+        as_of = pd.to_datetime(df['as_of'].iloc[0]).date()
+        chain = OptionChain.from_frame(df, as_of, df['underlying'].iloc[0], spot=underlying_price)
         
-        # Greeks
-        subset['delta'] = vectorized_delta(
-            flag[mask], underlying_price, subset['strike'], subset['T'], r, subset['implied_volatility'], return_as='numpy'
-        )
-        subset['gamma'] = vectorized_gamma(
-            flag[mask], underlying_price, subset['strike'], subset['T'], r, subset['implied_volatility'], return_as='numpy'
-        )
+        print(f"Calculating Greeks via {'Black-76' if futures else 'Black-Scholes'}...")
+        chain.compute_greeks(r=RISK_FREE_RATE, futures=futures)
         
-        # Merge back
-        df.update(subset)
+        # Write the arrays back as whole columns (no row-wise update / copies)
+        df['implied_volatility'] = chain.implied_volatility
+        df['delta'] = chain.delta
+        df['gamma'] = chain.gamma
         return df
 
     def generate_synthetic_oi(self, df: pd.DataFrame, spot_price: float) -> pd.DataFrame:
@@ -1,11 +1,23 @@
 import os
-import pandas as pd
-from sqlalchemy import create_engine, text
+from typing import TYPE_CHECKING
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import Pool
 from contextlib import contextmanager
 from dotenv import load_dotenv
+from src.shared.tracing import span
+from src.shared.metrics import DB_CONNECTIONS_IN_USE, ROWS_WRITTEN
+from src.shared.memory import chunk_rows
+from src.shared.db import connection_reuse_enabled
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 load_dotenv()
 
+# Pool utilisation across every engine (get_engine() creates one per call)
+event.listen(Pool, 'checkout', lambda *args: DB_CONNECTIONS_IN_USE.inc(layer='sqlalchemy'))
+event.listen(Pool, 'checkin', lambda *args: DB_CONNECTIONS_IN_USE.dec(layer='sqlalchemy'))
+
 def get_db_url():
     """
     Constructs DB URL from environment variables.
@@ -23,10 +35,18 @@ def get_db_url():
     
     return f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
 
+_shared_engine = None
+
 def get_engine():
     """
-    Returns a SQLAlchemy engine.
+    Returns a SQLAlchemy engine. With connection reuse on (backfill workers)
+    every call shares one engine whose pool keeps a single connection.
     """
+    global _shared_engine
+    if connection_reuse_enabled():
+        if _shared_engine is None:
+            _shared_engine = create_engine(get_db_url(), pool_size=1, max_overflow=4, pool_pre_ping=True)
+        return _shared_engine
     return create_engine(get_db_url())
 
 @contextmanager
@@ -38,17 +58,23 @@ def get_connection():
     with engine.connect() as conn:
         yield conn
 
-def write_dataframe(df: pd.DataFrame, table_name: str, if_exists: str = 'append', index: bool = False):
+def write_dataframe(df: 'pd.DataFrame', table_name: str, if_exists: str = 'append', index: bool = False):
     """
     Writes a pandas DataFrame to the database.
+    One multi-row INSERT, split into chunks when a memory budget requires it.
     """
     if df.empty:
         print(f"Skipping write to {table_name}: DataFrame is empty.")
         return
 
+    # Statement text + bound parameters run to several times the frame's size
+    rows = chunk_rows(len(df), lambda: 8 * df.memory_usage(index=index, deep=True).sum() / len(df), f'write {table_name}')
     engine = get_engine()
     try:
-        df.to_sql(table_name, engine, if_exists=if_exists, index=index, method='multi')
+        with span(f'write {table_name}', 'db', rows_out=len(df)):
+            df.to_sql(table_name, engine, if_exists=if_exists, index=index, method='multi',
+                      chunksize=rows if rows < len(df) else None)
+        ROWS_WRITTEN.inc(len(df), table=table_name)
         print(f"Successfully wrote {len(df)} rows to {table_name}.")
     except Exception as e:
         print(f"Error writing to {table_name}: {e}")
@@ -59,5 +85,5 @@ def execute_sql(sql: str, params: dict = None):
     Executes a raw SQL statement.
     """
     engine = get_engine()
-    with engine.begin() as conn:
+    with span('execute_sql', 'db'), engine.begin() as conn:
         conn.execute(text(sql), params or {})
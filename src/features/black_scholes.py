@@ -0,0 +1,140 @@
+import numpy as np
+
+# Flat risk free rate used across the options pipeline
+RISK_FREE_RATE = 0.045
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Implied vol solver bounds / iterations (Black-76)
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+IV_ITERATIONS = 40
+
+
+def ndtr(x):
+    # scipy.special costs ~0.1s to import; only load it once a kernel runs
+    from scipy.special import ndtr as _ndtr
+    return _ndtr(x)
+
+
+def _d1(S, K, T, b, sigma):
+    """
+    Generalised d1 with cost of carry b (b = r for Black-Scholes on spot,
+    b = 0 for Black-76 on futures). Invalid rows (T <= 0 or sigma <= 0) are
+    returned as NaN. All inputs broadcast against each other.
+    """
+    valid = (T > 0) & (sigma > 0)
+    T_safe = np.where(valid, T, 1.0)
+    sigma_safe = np.where(valid, sigma, 1.0)
+    vol_sqrt_t = sigma_safe * np.sqrt(T_safe)
+    d1 = (np.log(S / K) + (b + 0.5 * sigma_safe ** 2) * T_safe) / vol_sqrt_t
+    return np.where(valid, d1, np.nan), vol_sqrt_t
+
+
+def _pdf(x):
+    return np.exp(-0.5 * x ** 2) * _INV_SQRT_2PI
+
+
+def bs_gamma(S, K, T, sigma, r: float = RISK_FREE_RATE):
+    """
+    Vectorised Black-Scholes gamma (same for calls and puts).
+    Expired / zero-vol contracts have zero gamma.
+    """
+    d1, vol_sqrt_t = _d1(S, K, T, r, sigma)
+    return np.nan_to_num(_pdf(d1) / (S * vol_sqrt_t))
+
+
+def bs_delta(S, K, T, sigma, is_call, r: float = RISK_FREE_RATE):
+    """
+    Vectorised Black-Scholes delta. Expired / zero-vol contracts fall back to
+    their intrinsic delta (0 or +/-1).
+    """
+    d1, _ = _d1(S, K, T, r, sigma)
+    call_delta = np.where(np.isnan(d1), np.greater(S, K).astype(np.float64), ndtr(np.nan_to_num(d1)))
+    return np.where(is_call, call_delta, call_delta - 1.0)
+
+
+# --- Black-76 (options on futures) ---
+
+def black76_price(F, K, T, sigma, is_call, r: float = RISK_FREE_RATE):
+    """
+    Vectorised Black-76 premium. Expired / zero-vol contracts are worth their
+    discounted intrinsic value.
+    """
+    d1, vol_sqrt_t = _d1(F, K, T, 0.0, sigma)
+    d2 = d1 - vol_sqrt_t
+    df = np.exp(-r * np.maximum(T, 0.0))
+    call = df * (F * ndtr(d1) - K * ndtr(d2))
+    put = df * (K * ndtr(-d2) - F * ndtr(-d1))
+    price = np.where(is_call, call, put)
+    intrinsic = df * np.where(is_call, np.maximum(F - K, 0.0), np.maximum(K - F, 0.0))
+    return np.where(np.isnan(d1), intrinsic, price)
+
+
+def black76_vega(F, K, T, sigma, r: float = RISK_FREE_RATE):
+    d1, _ = _d1(F, K, T, 0.0, sigma)
+    return np.nan_to_num(np.exp(-r * np.maximum(T, 0.0)) * F * _pdf(d1) * np.sqrt(np.maximum(T, 0.0)))
+
+
+def black76_gamma(F, K, T, sigma, r: float = RISK_FREE_RATE):
+    """
+    Vectorised Black-76 gamma (per unit move in the futures price).
+    """
+    d1, vol_sqrt_t = _d1(F, K, T, 0.0, sigma)
+    return np.nan_to_num(np.exp(-r * np.maximum(T, 0.0)) * _pdf(d1) / (F * vol_sqrt_t))
+
+
+def black76_delta(F, K, T, sigma, is_call, r: float = RISK_FREE_RATE):
+    """
+    Vectorised Black-76 delta. Expired / zero-vol contracts fall back to
+    their intrinsic delta.
+    """
+    d1, _ = _d1(F, K, T, 0.0, sigma)
+    df = np.exp(-r * np.maximum(T, 0.0))
+    call_delta = np.where(np.isnan(d1), np.greater(F, K).astype(np.float64), df * ndtr(np.nan_to_num(d1)))
+    return np.where(is_call, call_delta, call_delta - np.where(np.isnan(d1), 1.0, df))
+
+
+def black76_implied_vol(price, F, K, T, is_call, r: float = RISK_FREE_RATE, iterations: int = IV_ITERATIONS):
+    """
+    Vectorised Black-76 implied volatility.
+
+    Safeguarded Newton: every contract keeps a [lo, hi] bracket and falls back
+    to bisection whenever the Newton step leaves it, so the whole chain is
+    solved with a fixed number of array passes. Prices outside the no-arbitrage
+    bounds (or expired contracts) return NaN.
+    """
+    price, F, K, T = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(F, dtype=np.float64),
+        np.asarray(K, dtype=np.float64), np.asarray(T, dtype=np.float64),
+    )
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+
+    lower = black76_price(F, K, T, IV_LOWER, is_call, r)
+    upper = black76_price(F, K, T, IV_UPPER, is_call, r)
+    solvable = (T > 0) & (price >= lower) & (price <= upper)
+
+    lo = np.full(price.shape, IV_LOWER)
+    hi = np.full(price.shape, IV_UPPER)
+    sigma = np.full(price.shape, 0.3)
+    for _ in range(iterations):
+        diff = black76_price(F, K, T, sigma, is_call, r) - price
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff <= 0, sigma, lo)
+        vega = black76_vega(F, K, T, sigma, r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = sigma - diff / vega
+        inside = (vega > 1e-12) & (newton > lo) & (newton < hi)
+        sigma = np.where(inside, newton, 0.5 * (lo + hi))
+
+    return np.where(solvable, sigma, np.nan)
+
+
+def bs_implied_vol(price, S, K, T, is_call, r: float = RISK_FREE_RATE, iterations: int = IV_ITERATIONS):
+    """
+    Vectorised Black-Scholes implied volatility on spot. Solved as Black-76
+    on the forward S * exp(rT), which prices identically.
+    """
+    T = np.asarray(T, dtype=np.float64)
+    forward = np.asarray(S, dtype=np.float64) * np.exp(r * np.maximum(T, 0.0))
+    return black76_implied_vol(price, forward, K, T, is_call, r, iterations)
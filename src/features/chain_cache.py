@@ -0,0 +1,169 @@
+import os
+import json
+import fcntl
+import shutil
+import tempfile
+import numpy as np
+from datetime import date
+from typing import Iterator, Optional
+from dotenv import load_dotenv
+from src.shared.landing import read_raw_options
+from src.features.option_chain import OptionChain
+from src.shared.dates import business_days
+
+load_dotenv()
+
+# On-disk chain cache for research sweeps:
+#   {CHAIN_CACHE_DIR}/{underlying}/{YYYY-MM-DD}/{column}.npy + meta.json
+# {YYYY-MM-DD} is a symlink to a versioned directory (.{YYYY-MM-DD}.xxxx) that
+# a rebuild replaces atomically, so readers always find a complete entry.
+# Each column is a fixed-dtype .npy file that np.load memory-maps read-only,
+# so repeated runs hit the page cache instead of Postgres.
+CHAIN_CACHE_DIR = os.getenv(
+    'CHAIN_CACHE_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'chain_cache'))
+)
+
+# Bump when the column layout changes; older entries are rebuilt on load
+CACHE_VERSION = 1
+
+# column -> dtype. expiry is days since 1970-01-01, is_call is 1 / 0.
+CHAIN_COLUMNS = {
+    'strike': np.float32,
+    'expiry': np.int32,
+    'is_call': np.int8,
+    'open_interest': np.float32,
+    'implied_volatility': np.float32,
+    'gamma': np.float32,
+    'delta': np.float32,
+}
+
+
+def chain_path(as_of: date, underlying: str, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or CHAIN_CACHE_DIR, underlying, f"{as_of:%Y-%m-%d}")
+
+
+def is_cached(as_of: date, underlying: str, cache_dir: str = None) -> bool:
+    meta_path = os.path.join(chain_path(as_of, underlying, cache_dir), 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, 'r') as f:
+        return json.load(f).get('version') == CACHE_VERSION
+
+
+def materialize_chain(as_of: date, underlying: str = 'SPX', cache_dir: str = None, force: bool = False) -> Optional[str]:
+    """
+    Writes one day's chain to the cache as fixed-dtype column files.
+    Returns the entry directory, or None when there is no raw data for the day.
+    """
+    path = chain_path(as_of, underlying, cache_dir)
+    if not force and is_cached(as_of, underlying, cache_dir):
+        return path
+
+    df = read_raw_options(as_of, underlying)
+    if df.empty:
+        return None
+
+    chain = OptionChain.from_frame(df, as_of, underlying)
+    columns = {
+        'strike': chain.strike,
+        'expiry': chain.expiry_days + np.datetime64(as_of, 'D').astype(np.int64),
+        'is_call': chain.is_call,
+        'open_interest': chain.open_interest,
+        'implied_volatility': chain.implied_volatility,
+        'gamma': chain.gamma,
+        'delta': chain.delta,
+    }
+
+    # Each build writes its own versioned directory next to the entry
+    parent, day = os.path.split(path)
+    os.makedirs(parent, exist_ok=True)
+    version = tempfile.mkdtemp(dir=parent, prefix=f".{day}.")
+    try:
+        for name, dtype in CHAIN_COLUMNS.items():
+            np.save(os.path.join(version, f"{name}.npy"), np.ascontiguousarray(columns[name], dtype=dtype))
+
+        meta = {
+            'version': CACHE_VERSION,
+            'as_of': as_of.isoformat(),
+            'underlying': underlying,
+            'rows': len(chain),
+            'spot': chain.spot,
+        }
+        with open(os.path.join(version, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        swap_entry(path, version)
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+    return path
+
+
+def swap_entry(path: str, version: str):
+    """
+    Points the entry symlink at `version` (one atomic rename) and removes the
+    version it replaced. Swaps of one entry are serialised by a lock file so
+    concurrent builders never orphan or delete each other's versions.
+    """
+    parent, day = os.path.split(path)
+    link = version + '.link'
+    os.symlink(os.path.basename(version), link)
+    with open(os.path.join(parent, f".{day}.lock"), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        old = os.path.join(parent, os.readlink(path)) if os.path.islink(path) else None
+        if old is None and os.path.isdir(path):
+            # Entry written before versioned directories: a link cannot replace a directory
+            old = version + '.old'
+            os.replace(path, old)
+        os.replace(link, path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def load_chain(as_of: date, underlying: str = 'SPX', cache_dir: str = None, materialize: bool = True) -> Optional[OptionChain]:
+    """
+    Returns one day's OptionChain whose arrays are read-only np.memmaps over
+    the cached files (no copy until the data is used; only the expiry day
+    offsets are derived). Missing entries are materialized from the raw store
+    unless `materialize` is False. Returns None when the day has no chain.
+    """
+    if not is_cached(as_of, underlying, cache_dir):
+        if not materialize or materialize_chain(as_of, underlying, cache_dir) is None:
+            return None
+
+    path = chain_path(as_of, underlying, cache_dir)
+    for attempt in range(3):
+        # Read every file from one version, even if a rebuild swaps the entry meanwhile
+        version = os.path.realpath(path)
+        try:
+            with open(os.path.join(version, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+            columns = {name: np.load(os.path.join(version, f"{name}.npy"), mmap_mode='r') for name in CHAIN_COLUMNS}
+            break
+        except FileNotFoundError:
+            # That version was replaced and removed between resolving and reading
+            if attempt == 2:
+                raise
+    return OptionChain(
+        as_of=as_of,
+        underlying=underlying,
+        spot=meta['spot'],
+        strike=columns['strike'],
+        expiry_days=(columns['expiry'] - np.int32(np.datetime64(as_of, 'D').astype(np.int64))).astype(np.int32, copy=False),
+        is_call=columns['is_call'],
+        open_interest=columns['open_interest'],
+        implied_volatility=columns['implied_volatility'],
+        gamma=columns['gamma'],
+        delta=columns['delta'],
+    )
+
+
+def iter_chains(start: date, end: date, underlying: str = 'SPX', cache_dir: str = None, materialize: bool = True) -> Iterator[OptionChain]:
+    """
+    Yields the OptionChain for every business day in [start, end] that has
+    one, e.g. to sweep a year of GEX variants.
+    """
+    for as_of in business_days(start, end):
+        chain = load_chain(as_of, underlying, cache_dir, materialize)
+        if chain is not None:
+            yield chain
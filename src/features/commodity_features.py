@@ -1,7 +1,13 @@
 import pandas as pd
-from datetime import date
-from src.shared.db import get_db_connection, execute_query
+from datetime import date, timedelta
+from src.shared.db import get_db_connection, read_frame, execute_query
+from src.shared.landing import landing_enabled, read_landing
+from src.shared.tracing import traced
 
+# COT is weekly; landing reads only scan this far back for the latest report
+COT_LOOKBACK_DAYS = 31
+
+@traced('features')
 def compute_commodity_features(as_of: date, underlying: str = 'GOLD'):
     """
     Computes Commodity flow features (Term Structure, COT) and writes to features_commodity.
@@ -18,9 +24,6 @@ def compute_commodity_features(as_of: date, underlying: str = 'GOLD'):
     ORDER BY expiry ASC
     """
     
-    with get_db_connection() as conn:
-        df_fut = pd.read_sql(query_fut, conn, params=(as_of, underlying))
-        
     # 2. Fetch COT (Positioning)
     # Use latest available report on or before date
     query_cot = """
@@ -30,8 +33,17 @@ def compute_commodity_features(as_of: date, underlying: str = 'GOLD'):
     LIMIT 1
     """
     
-    with get_db_connection() as conn:
-        df_cot = pd.read_sql(query_cot, conn, params=(underlying, as_of))
+    if landing_enabled():
+        df_fut = read_landing('futures', start=as_of, end=as_of, filters={'underlying': underlying})
+        if not df_fut.empty:
+            df_fut = df_fut.sort_values('expiry', kind='stable').reset_index(drop=True)
+        df_cot = read_landing('cot', start=as_of - timedelta(days=COT_LOOKBACK_DAYS), end=as_of, filters={'market': underlying})
+        if not df_cot.empty:
+            df_cot = df_cot.sort_values('as_of', ascending=False).head(1)
+    else:
+        with get_db_connection() as conn:
+            df_fut = read_frame(query_fut, (as_of, underlying), conn)
+            df_cot = read_frame(query_cot, (underlying, as_of), conn)
 
     if df_fut.empty:
         print(f"No futures data found for {underlying} on {as_of}")
@@ -51,8 +63,8 @@ def compute_commodity_features(as_of: date, underlying: str = 'GOLD'):
         front = df_fut.iloc[0]
         back = df_fut.iloc[1]
         
-        f_price = float(front['settle_price'])
-        b_price = float(back['settle_price'])
+        f_price = front['settle_price']
+        b_price = back['settle_price']
         
         if f_price > 0:
             backwardation_pct = (f_price - b_price) / f_price
@@ -65,8 +77,8 @@ def compute_commodity_features(as_of: date, underlying: str = 'GOLD'):
     
     if not df_cot.empty:
         row = df_cot.iloc[0]
-        hedger_net = float(row['hedger_long'] - row['hedger_short'])
-        spec_net = float(row['spec_long'] - row['spec_short'])
+        hedger_net = row['hedger_long'] - row['hedger_short']
+        spec_net = row['spec_long'] - row['spec_short']
 
     # OI Change
     # Need yesterday's OI to calc change. For MVP, simplified to 0 or fetched if easy.
@@ -0,0 +1,76 @@
+import json
+from datetime import date
+from src.shared.db import execute_query
+from src.features.strike_ladder import build_strike_ladder
+from src.shared.markets import FUTURES_OPTIONS
+from src.shared.landing import read_raw_options
+from src.features.option_chain import OptionChain
+from src.shared.tracing import traced
+
+@traced('features')
+def compute_futures_options_features(as_of: date, underlying: str = 'GOLD'):
+    """
+    Computes dealer GEX features for a CME futures options market
+    (Greeks from Black-76 at ingestion) and writes to features_futures_options.
+    """
+    print(f"Computing {underlying} futures options features for {as_of}...")
+
+    df = read_raw_options(as_of, underlying, ('type', 'strike', 'expiry', 'open_interest', 'gamma', 'delta', 'underlying_price'))
+
+    if df.empty:
+        print(f"No {underlying} options data found for {as_of}")
+        return
+
+    chain = OptionChain.from_frame(df, as_of, underlying)
+    futures_price = chain.spot
+    multiplier = FUTURES_OPTIONS[underlying]['multiplier']
+
+    # Same strike ladder kernel as SPX, with the futures contract size
+    ladder = build_strike_ladder(
+        chain.strike, chain.calls, chain.gamma,
+        chain.open_interest, chain.delta, futures_price, multiplier
+    )
+
+    net_gamma = ladder.call_gex.sum() - ladder.put_gex.sum()
+    call_oi = ladder.call_oi.sum()
+    pcr = ladder.put_oi.sum() / call_oi if call_oi > 0 else 0
+    call_walls = ladder.call_walls()
+    put_walls = ladder.put_walls()
+
+    features = {
+        'as_of': as_of,
+        'underlying': underlying,
+        'futures_price': float(futures_price),
+        'net_gamma': float(net_gamma),
+        'gamma_below_spot': ladder.gamma_below_spot(futures_price),
+        'gamma_above_spot': ladder.gamma_above_spot(futures_price),
+        'put_call_oi_ratio': float(pcr),
+        'net_delta': float(ladder.dealer_delta.sum()),
+        'call_wall': float(call_walls[0]) if len(call_walls) else None,
+        'put_wall': float(put_walls[0]) if len(put_walls) else None,
+        'gex_ladder': ladder.to_array(),
+        'feature_vector': json.dumps({
+            'call_walls': [float(k) for k in call_walls],
+            'put_walls': [float(k) for k in put_walls],
+        }),
+    }
+
+    sql = """
+    INSERT INTO features_futures_options
+    (as_of, underlying, futures_price, net_gamma, gamma_below_spot, gamma_above_spot, put_call_oi_ratio, net_delta, call_wall, put_wall, gex_ladder, feature_vector)
+    VALUES (%(as_of)s, %(underlying)s, %(futures_price)s, %(net_gamma)s, %(gamma_below_spot)s, %(gamma_above_spot)s, %(put_call_oi_ratio)s, %(net_delta)s, %(call_wall)s, %(put_wall)s, %(gex_ladder)s, %(feature_vector)s)
+    ON CONFLICT (as_of, underlying) DO UPDATE SET
+    futures_price = EXCLUDED.futures_price,
+    net_gamma = EXCLUDED.net_gamma,
+    gamma_below_spot = EXCLUDED.gamma_below_spot,
+    gamma_above_spot = EXCLUDED.gamma_above_spot,
+    put_call_oi_ratio = EXCLUDED.put_call_oi_ratio,
+    net_delta = EXCLUDED.net_delta,
+    call_wall = EXCLUDED.call_wall,
+    put_wall = EXCLUDED.put_wall,
+    gex_ladder = EXCLUDED.gex_ladder,
+    feature_vector = EXCLUDED.feature_vector;
+    """
+
+    execute_query(sql, features)
+    print(f"Stored {underlying} options features: NetGEX={net_gamma:,.0f}, PCR={pcr:.2f}")
@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 from datetime import date, timedelta
 from typing import Optional
-from src.shared.db import get_db_connection, execute_query
+from src.shared.db import get_db_connection, read_frame, execute_query
+from src.shared.landing import landing_enabled, read_landing
+from src.features.commodity_features import COT_LOOKBACK_DAYS
+from src.shared.tracing import traced
 
 def annualise_vol(daily_vol: float, trading_days: int = 252) -> float:
     """Convert daily vol (std of daily returns) to annualised percentage."""
@@ -13,6 +16,7 @@ def compute_carry_from_rates(aud_rate: float, usd_rate: float) -> float:
     """Very simple proxy: carry ~ rate differential (AUD - USD) in %."""
     return (aud_rate - usd_rate)
 
+@traced('features')
 def compute_fx_features(as_of: date, pair: str = 'AUDUSD'):
     """
     Computes FX structural features (Carry, Vol, COT) and writes to features_fx.
@@ -59,10 +63,16 @@ def compute_fx_features(as_of: date, pair: str = 'AUDUSD'):
     LIMIT 1
     """
 
+    # raw_fx stays in Postgres; COT is only in the landing zone with RAW_STORE=parquet
     with get_db_connection() as conn:
-        df_prices = pd.read_sql(query_prices, conn, params=(pair, lookback_start, as_of))
-        df_rates = pd.read_sql(query_rates, conn, params=(pair, as_of))
-        df_cot = pd.read_sql(query_cot, conn, params=(as_of,))
+        df_prices = read_frame(query_prices, (pair, lookback_start, as_of), conn)
+        df_rates = read_frame(query_rates, (pair, as_of), conn)
+        if not landing_enabled():
+            df_cot = read_frame(query_cot, (as_of,), conn)
+    if landing_enabled():
+        df_cot = read_landing('cot', start=as_of - timedelta(days=COT_LOOKBACK_DAYS), end=as_of, filters={'market': 'AUD'})
+        if not df_cot.empty:
+            df_cot = df_cot.sort_values('as_of', ascending=False).head(1)
 
     # --- Calculations ---
 
@@ -71,7 +81,7 @@ def compute_fx_features(as_of: date, pair: str = 'AUDUSD'):
     if not df_prices.empty and len(df_prices) >= 20:
         df_prices['date'] = pd.to_datetime(df_prices['date']).dt.date
         df_prices = df_prices.sort_values('date')
-        df_prices['log_ret'] = np.log(df_prices['close'].astype(float)).diff()
+        df_prices['log_ret'] = np.log(df_prices['close']).diff()
         
         # Filter for window
         recent = df_prices.tail(20)
@@ -84,7 +94,7 @@ def compute_fx_features(as_of: date, pair: str = 'AUDUSD'):
     if not df_rates.empty:
         row = df_rates.iloc[0]
         # AUD Rate - USD Rate
-        carry_annualised = compute_carry_from_rates(float(row['aud_rate']), float(row['usd_rate']))
+        carry_annualised = compute_carry_from_rates(row['aud_rate'], row['usd_rate'])
 
     # 3. COT Positioning
     cot_net_spec = 0.0
@@ -92,8 +102,8 @@ def compute_fx_features(as_of: date, pair: str = 'AUDUSD'):
     
     if not df_cot.empty:
         row = df_cot.iloc[0]
-        net = float(row['spec_long'] - row['spec_short'])
-        oi = float(row['hedger_long'] + row['hedger_short'] + row['spec_long'] + row['spec_short']) / 2 # Approx OI
+        net = row['spec_long'] - row['spec_short']
+        oi = (row['hedger_long'] + row['hedger_short'] + row['spec_long'] + row['spec_short']) / 2 # Approx OI
         # Or if we had explicit OI column. The raw_cot table doesn't have explicit OI column in schema?
         # Let's check schema.
         # Schema: hedger_long, hedger_short, spec_long, spec_short...
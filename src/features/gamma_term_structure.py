@@ -0,0 +1,181 @@
+import numpy as np
+from datetime import date
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from src.features.black_scholes import bs_gamma, RISK_FREE_RATE
+from src.shared.db import execute_query
+from src.shared.tracing import traced
+from src.shared.memory import chunk_rows
+
+# Projection defaults: 20 sessions ahead on a +/-5% spot grid (1% steps)
+DEFAULT_SESSIONS = 20
+DEFAULT_SPOT_SHOCKS = tuple(np.round(np.arange(-0.05, 0.0501, 0.01), 2))
+
+# Net gamma at spot is considered "unclenched" once it has decayed below this
+# fraction of today's level (or flipped sign).
+UNCLENCH_FRACTION = 0.5
+
+# Contracts per chunk when building the spot x days grid (bounds peak memory)
+CHUNK_SIZE = 4096
+# float64 (chunk x spots x days) temporaries alive at once in bs_gamma
+WORKING_ARRAYS = 6
+
+
+@dataclass
+class GammaTermStructure:
+    """
+    Per-expiry net GEX plus the projected net GEX grid (spot levels x sessions).
+    """
+    expiries: np.ndarray          # datetime64[D], ascending
+    expiry_net_gex: np.ndarray
+    sessions: np.ndarray          # datetime64[D], sessions[0] == as_of
+    spot: float
+    spot_grid: np.ndarray
+    rolloff_gex: np.ndarray       # shape (len(spot_grid), len(sessions))
+    unclench_date: Optional[date] = None
+
+    def net_gex_at_spot(self) -> np.ndarray:
+        """Projected net GEX path at the grid level closest to the current spot."""
+        return self.rolloff_gex[np.argmin(np.abs(self.spot_grid - self.spot))]
+
+
+def expiry_term_structure(expiry: np.ndarray, is_call: np.ndarray, gex: np.ndarray):
+    """
+    Net GEX (call - put) per expiry date. Returns (expiries, net_gex).
+    """
+    expiries, idx = np.unique(np.asarray(expiry, dtype='datetime64[D]'), return_inverse=True)
+    sign = np.where(is_call, 1.0, -1.0)
+    net = np.bincount(idx, weights=sign * gex, minlength=len(expiries))
+    return expiries, net
+
+
+def project_gamma_grid(
+    strike: np.ndarray,
+    days_to_expiry: np.ndarray,
+    iv: np.ndarray,
+    is_call: np.ndarray,
+    open_interest: np.ndarray,
+    spot_grid: np.ndarray,
+    days_elapsed: np.ndarray,
+    multiplier: float = 100.0,
+    r: float = RISK_FREE_RATE,
+    chunk_size: int = None,
+) -> np.ndarray:
+    """
+    Net GEX for every (spot level, horizon) pair in one broadcast re-price.
+
+    Gamma is recomputed at the remaining time to expiry for each horizon, so
+    both expiry roll-off (T <= 0 -> zero gamma) and charm (gamma drift as T
+    shrinks) are captured. IV is held constant. Contracts are processed in
+    chunks so the contracts x spots x days cube stays bounded (CHUNK_SIZE,
+    shrunk to fit the memory budget, unless `chunk_size` is given).
+    """
+    spot_grid = np.asarray(spot_grid, dtype=np.float64)
+    days_elapsed = np.asarray(days_elapsed, dtype=np.float64)
+    chunk_size = chunk_size or chunk_rows(CHUNK_SIZE, WORKING_ARRAYS * 8 * len(spot_grid) * len(days_elapsed), 'gamma_term')
+    grid = np.zeros((len(spot_grid), len(days_elapsed)))
+
+    S = spot_grid[None, :, None]
+    for start in range(0, len(strike), chunk_size):
+        sl = slice(start, start + chunk_size)
+        K = np.asarray(strike[sl], dtype=np.float64)[:, None, None]
+        sigma = np.asarray(iv[sl], dtype=np.float64)[:, None, None]
+        T = (np.asarray(days_to_expiry[sl], dtype=np.float64)[:, None] - days_elapsed[None, :]) / 365.0
+        gamma = bs_gamma(S, K, T[:, None, :], sigma, r)
+
+        sign = np.where(is_call[sl], 1.0, -1.0)
+        weight = sign * np.asarray(open_interest[sl], dtype=np.float64) * multiplier
+        # sum_i weight_i * gamma_ijk, then scale by spot level
+        grid += np.einsum('i,ijk->jk', weight, gamma)
+
+    return grid * spot_grid[:, None]
+
+
+def find_unclench_date(sessions: np.ndarray, net_at_spot: np.ndarray, fraction: float = UNCLENCH_FRACTION) -> Optional[date]:
+    """
+    First projected session where net gamma at spot has decayed below
+    `fraction` of today's magnitude or changed sign.
+    """
+    today = net_at_spot[0]
+    if today == 0:
+        return None
+    released = (np.sign(net_at_spot) != np.sign(today)) | (np.abs(net_at_spot) < fraction * abs(today))
+    hits = np.flatnonzero(released[1:])
+    if len(hits) == 0:
+        return None
+    return sessions[hits[0] + 1].astype(object)
+
+
+@traced('features')
+def build_gamma_term_structure(
+    as_of: date,
+    strike: np.ndarray,
+    expiry: np.ndarray,
+    iv: np.ndarray,
+    is_call: np.ndarray,
+    open_interest: np.ndarray,
+    gamma: np.ndarray,
+    spot: float,
+    sessions: int = DEFAULT_SESSIONS,
+    spot_shocks: Sequence[float] = DEFAULT_SPOT_SHOCKS,
+    multiplier: float = 100.0,
+    r: float = RISK_FREE_RATE,
+) -> GammaTermStructure:
+    """
+    Builds the expiry term structure and the projected roll-off grid for one chain.
+    """
+    is_call = np.asarray(is_call, dtype=bool)
+    expiry = np.asarray(expiry, dtype='datetime64[D]')
+    gex = np.asarray(gamma, dtype=np.float64) * np.asarray(open_interest, dtype=np.float64) * multiplier * spot
+    expiries, expiry_net_gex = expiry_term_structure(expiry, is_call, gex)
+
+    # Business-day sessions from as_of (session 0 = today)
+    start = np.datetime64(as_of, 'D')
+    session_dates = np.busday_offset(start, np.arange(sessions + 1), roll='forward')
+    days_elapsed = (session_dates - start).astype(np.int64)
+    days_to_expiry = (expiry - start).astype(np.int64)
+
+    spot_grid = spot * (1.0 + np.asarray(spot_shocks, dtype=np.float64))
+    grid = project_gamma_grid(
+        strike, days_to_expiry, iv, is_call, open_interest, spot_grid, days_elapsed, multiplier, r
+    )
+
+    ts = GammaTermStructure(
+        expiries=expiries,
+        expiry_net_gex=expiry_net_gex,
+        sessions=session_dates,
+        spot=float(spot),
+        spot_grid=spot_grid,
+        rolloff_gex=grid,
+    )
+    ts.unclench_date = find_unclench_date(session_dates, ts.net_gex_at_spot())
+    return ts
+
+
+def store_gamma_term_structure(as_of: date, underlying: str, ts: GammaTermStructure):
+    """
+    Upserts the term structure / roll-off grid into features_gamma_term.
+    """
+    sql = """
+    INSERT INTO features_gamma_term
+    (as_of, underlying, expiries, expiry_net_gex, sessions, spot_grid, rolloff_gex, unclench_date)
+    VALUES (%(as_of)s, %(underlying)s, %(expiries)s, %(expiry_net_gex)s, %(sessions)s, %(spot_grid)s, %(rolloff_gex)s, %(unclench_date)s)
+    ON CONFLICT (as_of, underlying) DO UPDATE SET
+    expiries = EXCLUDED.expiries,
+    expiry_net_gex = EXCLUDED.expiry_net_gex,
+    sessions = EXCLUDED.sessions,
+    spot_grid = EXCLUDED.spot_grid,
+    rolloff_gex = EXCLUDED.rolloff_gex,
+    unclench_date = EXCLUDED.unclench_date;
+    """
+    params = {
+        'as_of': as_of,
+        'underlying': underlying,
+        'expiries': ts.expiries.astype(object).tolist(),
+        'expiry_net_gex': ts.expiry_net_gex.astype(np.float32).tolist(),
+        'sessions': ts.sessions.astype(object).tolist(),
+        'spot_grid': ts.spot_grid.astype(np.float32).tolist(),
+        'rolloff_gex': ts.rolloff_gex.astype(np.float32).tolist(),
+        'unclench_date': ts.unclench_date,
+    }
+    execute_query(sql, params)
@@ -0,0 +1,146 @@
+import numpy as np
+from datetime import date
+from dataclasses import dataclass
+from typing import Sequence
+from src.features.black_scholes import bs_delta, RISK_FREE_RATE
+from src.shared.db import execute_query
+from src.shared.tracing import traced
+from src.shared.memory import chunk_rows
+
+# Scenario grid: +/-1%..+/-5% spot shocks, vol shifts in absolute IV points
+DEFAULT_SPOT_SHOCKS = (-0.05, -0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04, 0.05)
+DEFAULT_VOL_SHIFTS = (-0.02, 0.0, 0.02)
+
+# Contracts per chunk; the working set is chunk x scenarios float64s
+CHUNK_SIZE = 8192
+# float64 (chunk x scenarios) temporaries alive at once in bs_delta
+WORKING_ARRAYS = 8
+
+# Hedge notional ($ per 1% move) that maps to a flow score of ~+/-38 around 50
+# (tanh(1) ~ 0.76). Same order as the "-5B to +5B" net gamma range in scoring.
+HEDGE_FLOW_SCALE = 5e9
+
+# Chase flow below this share of the scale is treated as no directional pressure
+PRESSURE_MIN_SHARE = 0.1
+
+
+@dataclass
+class HedgeFlowMatrix:
+    """
+    Dealer delta-hedge notional ($) per scenario.
+    Positive = dealers buy the underlying, negative = dealers sell.
+    """
+    spot_shocks: np.ndarray
+    vol_shifts: np.ndarray
+    hedge_notional: np.ndarray  # shape (len(vol_shifts), len(spot_shocks))
+
+    def base_flows(self) -> np.ndarray:
+        """Flows for the unshifted vol row (or the smallest shift available)."""
+        return self.hedge_notional[np.argmin(np.abs(self.vol_shifts))]
+
+
+@traced('features')
+def hedge_flow_matrix(
+    strike: np.ndarray,
+    T: np.ndarray,
+    iv: np.ndarray,
+    is_call: np.ndarray,
+    open_interest: np.ndarray,
+    spot: float,
+    spot_shocks: Sequence[float] = DEFAULT_SPOT_SHOCKS,
+    vol_shifts: Sequence[float] = DEFAULT_VOL_SHIFTS,
+    multiplier: float = 100.0,
+    r: float = RISK_FREE_RATE,
+    chunk_size: int = None,
+) -> HedgeFlowMatrix:
+    """
+    Re-prices every contract under every (vol shift, spot shock) scenario in
+    one batched delta evaluation and returns the dealer re-hedge notional.
+
+    Dealer positioning follows the net_gamma convention (long calls, short
+    puts), so a positive net_gamma chain produces stabilising flows (selling
+    rallies, buying dips). Hedge notional = -(dealer delta change) * shocked spot.
+    `chunk_size` defaults to CHUNK_SIZE, shrunk to fit the memory budget.
+    """
+    shocks = np.asarray(spot_shocks, dtype=np.float64)
+    shifts = np.asarray(vol_shifts, dtype=np.float64)
+    shocked_spot = spot * (1.0 + shocks)
+
+    # Scenario axis: vol shift major, spot shock minor
+    S = np.tile(shocked_spot, len(shifts))[None, :]
+    dvol = np.repeat(shifts, len(shocks))[None, :]
+
+    chunk_size = chunk_size or chunk_rows(CHUNK_SIZE, WORKING_ARRAYS * 8 * S.shape[1], 'hedge_flow')
+    delta_change = np.zeros(S.shape[1])
+    for start in range(0, len(strike), chunk_size):
+        sl = slice(start, start + chunk_size)
+        K = np.asarray(strike[sl], dtype=np.float64)[:, None]
+        t = np.asarray(T[sl], dtype=np.float64)[:, None]
+        sigma = np.asarray(iv[sl], dtype=np.float64)[:, None]
+        call = np.asarray(is_call[sl], dtype=bool)[:, None]
+        position = np.where(call[:, 0], 1.0, -1.0) * np.asarray(open_interest[sl], dtype=np.float64) * multiplier
+
+        base = bs_delta(spot, K, t, sigma, call, r)
+        shocked = bs_delta(S, K, t, np.maximum(sigma + dvol, 0.0), call, r)
+        delta_change += position @ (shocked - base)
+
+    notional = -delta_change * S[0]
+    return HedgeFlowMatrix(
+        spot_shocks=shocks,
+        vol_shifts=shifts,
+        hedge_notional=notional.reshape(len(shifts), len(shocks)),
+    )
+
+
+def summarize_hedge_flow(spot_shocks, flows, scale: float = HEDGE_FLOW_SCALE) -> dict:
+    """
+    Reduces one row of hedge flows to scoring inputs.
+
+    Chase flow is hedging in the direction of the move (buying rallies /
+    selling dips), which amplifies it. flow_risk is 0-100 (50 = neutral) and
+    pressure_direction points the way the larger chase flow pushes.
+    """
+    shocks = np.asarray(spot_shocks, dtype=np.float64)
+    flows = np.asarray(flows, dtype=np.float64)
+    if len(shocks) == 0:
+        return {'flow_risk': 50.0, 'pressure_direction': 'NEUTRAL', 'chase_per_pct': 0.0}
+
+    # Signed chase per 1% move: > 0 amplifying, < 0 dampening
+    chase_per_pct = float(np.mean(np.sign(shocks) * flows / (np.abs(shocks) * 100)))
+    flow_risk = 50.0 + 50.0 * np.tanh(chase_per_pct / scale)
+
+    down_chase = float(np.clip(-flows[shocks < 0], 0, None).sum())
+    up_chase = float(np.clip(flows[shocks > 0], 0, None).sum())
+
+    pressure = "NEUTRAL"
+    if max(down_chase, up_chase) >= PRESSURE_MIN_SHARE * scale:
+        pressure = "DOWN" if down_chase >= up_chase else "UP"
+
+    return {
+        'flow_risk': float(flow_risk),
+        'pressure_direction': pressure,
+        'chase_per_pct': chase_per_pct,
+    }
+
+
+def store_hedge_flow(as_of: date, underlying: str, matrix: HedgeFlowMatrix):
+    """
+    Upserts the scenario matrix into features_hedge_flow.
+    """
+    sql = """
+    INSERT INTO features_hedge_flow
+    (as_of, underlying, spot_shocks, vol_shifts, hedge_notional)
+    VALUES (%(as_of)s, %(underlying)s, %(spot_shocks)s, %(vol_shifts)s, %(hedge_notional)s)
+    ON CONFLICT (as_of, underlying) DO UPDATE SET
+    spot_shocks = EXCLUDED.spot_shocks,
+    vol_shifts = EXCLUDED.vol_shifts,
+    hedge_notional = EXCLUDED.hedge_notional;
+    """
+    params = {
+        'as_of': as_of,
+        'underlying': underlying,
+        'spot_shocks': matrix.spot_shocks.tolist(),
+        'vol_shifts': matrix.vol_shifts.tolist(),
+        'hedge_notional': matrix.hedge_notional.tolist(),
+    }
+    execute_query(sql, params)
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from datetime import date
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+from src.features.black_scholes import (
+    bs_implied_vol, bs_delta, bs_gamma,
+    black76_implied_vol, black76_delta, black76_gamma, RISK_FREE_RATE,
+)
+from src.shared.tracing import traced
+
+# Contracts closer to expiry than this (years) keep their existing Greeks
+MIN_GREEKS_T = 0.001
+
+
+@dataclass
+class OptionChain:
+    """
+    One day's option chain as contiguous arrays (struct of arrays).
+
+    expiry_days is the day offset from as_of and is_call is 1 / 0, so
+    selections never compare strings or touch a DataFrame. Slices of the
+    arrays are views; boolean / index selections compact only the arrays.
+    Arrays may be read-only memmaps (see chain_cache.load_chain).
+    """
+    as_of: date
+    underlying: str
+    spot: float
+    strike: np.ndarray
+    expiry_days: np.ndarray
+    is_call: np.ndarray
+    open_interest: np.ndarray
+    implied_volatility: np.ndarray
+    gamma: np.ndarray
+    delta: np.ndarray
+    last: Optional[np.ndarray] = None  # traded price, for IV solves at ingestion
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    @property
+    def calls(self) -> np.ndarray:
+        """Boolean call mask (zero-copy view of is_call)."""
+        return self.is_call.view(bool)
+
+    @property
+    def T(self) -> np.ndarray:
+        """Time to expiry in years."""
+        return self.expiry_days / 365.0
+
+    def expiry_dates(self) -> np.ndarray:
+        return np.datetime64(self.as_of, 'D') + self.expiry_days.astype('timedelta64[D]')
+
+    def gex(self, multiplier: float = 100.0) -> np.ndarray:
+        """Per-contract gamma exposure: gamma * OI * multiplier * spot."""
+        return self.gamma * self.open_interest * (multiplier * self.spot)
+
+    def _arrays(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self) if isinstance(getattr(self, f.name), np.ndarray)}
+
+    def take(self, index) -> 'OptionChain':
+        """
+        Sub-chain for a slice (views) or a boolean mask / index array (compacted copies).
+        """
+        return replace(self, **{name: arr[index] for name, arr in self._arrays().items()})
+
+    def sorted(self) -> 'OptionChain':
+        """
+        Chain ordered puts-then-calls, by expiry then strike, so call_slice()
+        / put_slice() and per-expiry ranges are contiguous views.
+        """
+        order = np.lexsort((self.strike, self.expiry_days, self.is_call))
+        return self.take(order)
+
+    def call_slice(self) -> 'OptionChain':
+        """Calls of a sorted() chain, as views."""
+        return self.take(slice(int(np.searchsorted(self.is_call, 1)), None))
+
+    def put_slice(self) -> 'OptionChain':
+        """Puts of a sorted() chain, as views."""
+        return self.take(slice(0, int(np.searchsorted(self.is_call, 1))))
+
+    def prune(self, min_open_interest: float = 0.0, max_days: Optional[int] = None, moneyness: Optional[float] = None) -> 'OptionChain':
+        """
+        Drops contracts that cannot contribute exposure: expired, OI at or
+        below `min_open_interest`, beyond `max_days`, or with strikes further
+        than `moneyness` (fraction of spot) away from spot.
+        """
+        keep = (self.expiry_days >= 0) & (self.open_interest > min_open_interest)
+        if max_days is not None:
+            keep &= self.expiry_days <= max_days
+        if moneyness is not None:
+            keep &= np.abs(self.strike - self.spot) <= moneyness * self.spot
+        return self if keep.all() else self.take(keep)
+
+    @traced('greeks')
+    def compute_greeks(self, price: np.ndarray = None, r: float = RISK_FREE_RATE, futures: bool = False, min_T: float = MIN_GREEKS_T):
+        """
+        Solves IV from `price` (default: last) and fills implied_volatility,
+        delta and gamma in place. Black-Scholes on spot, or Black-76 when
+        `futures` (spot is then the futures price). Contracts within min_T
+        of expiry keep their existing values.
+        """
+        price = self.last if price is None else price
+        K = self.strike
+        T = self.T
+        valid = T > min_T
+
+        if futures:
+            iv = np.nan_to_num(black76_implied_vol(price, self.spot, K, T, self.calls, r))
+            delta = black76_delta(self.spot, K, T, iv, self.calls, r)
+            gamma = black76_gamma(self.spot, K, T, iv, r)
+        else:
+            iv = np.nan_to_num(bs_implied_vol(price, self.spot, K, T, self.calls, r))
+            delta = bs_delta(self.spot, K, T, iv, self.calls, r)
+            gamma = bs_gamma(self.spot, K, T, iv, r)
+
+        self.implied_volatility = np.where(valid, iv, self.implied_volatility)
+        self.delta = np.where(valid, delta, self.delta)
+        self.gamma = np.where(valid, gamma, self.gamma)
+        return self
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, as_of: date, underlying: str, spot: Optional[float] = None) -> 'OptionChain':
+        """
+        Builds a chain from a raw_options-shaped frame (type / strike / expiry /
+        open_interest / implied_volatility / gamma / delta, optional last and
+        underlying_price). Missing numeric values become 0.
+        """
+        n = len(df)
+
+        def column(name, dtype):
+            if name not in df.columns:
+                return np.zeros(n, dtype=dtype)
+            return np.nan_to_num(np.asarray(df[name].values, dtype=dtype))
+
+        if spot is None:
+            spot = float(column('underlying_price', np.float64)[0]) if n else 0.0
+        expiry = pd.to_datetime(df['expiry']).values.astype('datetime64[D]')
+
+        return cls(
+            as_of=as_of,
+            underlying=underlying,
+            spot=float(spot),
+            strike=column('strike', np.float64),
+            expiry_days=(expiry - np.datetime64(as_of, 'D')).astype(np.int32),
+            is_call=(df['type'].values == 'call').astype(np.int8),
+            open_interest=column('open_interest', np.float64),
+            implied_volatility=column('implied_volatility', np.float64),
+            gamma=column('gamma', np.float64),
+            delta=column('delta', np.float64),
+            last=column('last', np.float64) if 'last' in df.columns else None,
+        )
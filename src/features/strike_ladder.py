@@ -0,0 +1,152 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from src.shared.tracing import traced
+
+# Row order of the persisted ladder (features_equity.gex_ladder is a 2-D REAL[]
+# with one row per field and one column per strike).
+LADDER_FIELDS = ('strike', 'call_gex', 'put_gex', 'call_oi', 'put_oi', 'dealer_delta')
+
+# Days-to-expiry bucket edges for the per-expiry GEX breakdown.
+# Buckets: 0-1d, 2-7d, 8-30d, 31-90d, 91d+
+EXPIRY_BUCKET_EDGES = (2, 8, 31, 91)
+EXPIRY_BUCKET_LABELS = ('0-1d', '2-7d', '8-30d', '31-90d', '91d+')
+
+
+@dataclass
+class StrikeLadder:
+    """
+    Per-strike dealer exposure, one entry per unique strike (ascending).
+    GEX is in $ notional (Gamma * OI * multiplier * Spot).
+    dealer_delta follows the features convention of dealers short every contract.
+    """
+    strikes: np.ndarray
+    call_gex: np.ndarray
+    put_gex: np.ndarray
+    call_oi: np.ndarray
+    put_oi: np.ndarray
+    dealer_delta: np.ndarray
+
+    @property
+    def net_gex(self) -> np.ndarray:
+        return self.call_gex - self.put_gex
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def gamma_below_spot(self, spot: float) -> float:
+        # Strikes are sorted, so the split point is a single binary search
+        split = np.searchsorted(self.strikes, spot, side='left')
+        return float(self.net_gex[:split].sum())
+
+    def gamma_above_spot(self, spot: float) -> float:
+        split = np.searchsorted(self.strikes, spot, side='left')
+        return float(self.net_gex[split:].sum())
+
+    def top_strikes(self, values: np.ndarray, k: int = 3) -> np.ndarray:
+        """
+        Returns the k strikes with the largest values, largest first.
+        Uses argpartition so only the top-k slice is sorted.
+        """
+        if len(values) == 0:
+            return np.empty(0, dtype=self.strikes.dtype)
+        k = min(k, len(values))
+        idx = np.argpartition(values, -k)[-k:]
+        idx = idx[np.argsort(values[idx])[::-1]]
+        return self.strikes[idx]
+
+    def call_walls(self, k: int = 3) -> np.ndarray:
+        return self.top_strikes(self.call_gex, k)
+
+    def put_walls(self, k: int = 3) -> np.ndarray:
+        return self.top_strikes(self.put_gex, k)
+
+    def to_array(self) -> list:
+        """
+        Compact 2-D representation for the gex_ladder column (rows = LADDER_FIELDS).
+        """
+        stacked = np.vstack([
+            self.strikes, self.call_gex, self.put_gex,
+            self.call_oi, self.put_oi, self.dealer_delta,
+        ])
+        return stacked.astype(np.float32).tolist()
+
+    @classmethod
+    def from_array(cls, arr) -> 'StrikeLadder':
+        """
+        Rebuilds a ladder from the persisted gex_ladder value, no recomputation needed.
+        """
+        data = np.asarray(arr, dtype=np.float64)
+        if data.size == 0:
+            data = np.zeros((len(LADDER_FIELDS), 0))
+        rows = dict(zip(LADDER_FIELDS, data))
+        return cls(
+            strikes=rows['strike'],
+            call_gex=rows['call_gex'],
+            put_gex=rows['put_gex'],
+            call_oi=rows['call_oi'],
+            put_oi=rows['put_oi'],
+            dealer_delta=rows['dealer_delta'],
+        )
+
+
+@traced('features')
+def build_strike_ladder(
+    strike: np.ndarray,
+    is_call: np.ndarray,
+    gamma: np.ndarray,
+    open_interest: np.ndarray,
+    delta: np.ndarray,
+    spot: float,
+    multiplier: float = 100.0,
+) -> StrikeLadder:
+    """
+    Bins a chain by strike in a single pass.
+
+    Strikes are sorted once (np.unique); each contract is mapped to its strike
+    bin with searchsorted and call/put sides are interleaved into one index, so
+    every quantity is accumulated with a single np.bincount.
+    """
+    strike = np.asarray(strike, dtype=np.float64)
+    is_call = np.asarray(is_call, dtype=bool)
+    gamma = np.asarray(gamma, dtype=np.float64)
+    open_interest = np.asarray(open_interest, dtype=np.float64)
+    delta = np.asarray(delta, dtype=np.float64)
+
+    strikes = np.unique(strike)
+    n = len(strikes)
+
+    # Bin index: 2*strike_bin + side (0 = put, 1 = call)
+    key = np.searchsorted(strikes, strike) * 2 + is_call
+    size = 2 * n
+
+    gex = np.bincount(key, weights=gamma * open_interest * multiplier * spot, minlength=size).reshape(n, 2)
+    oi = np.bincount(key, weights=open_interest, minlength=size).reshape(n, 2)
+    # Dealers assumed short every contract: dealer delta = -1 * Delta * OI
+    dd = np.bincount(key, weights=-delta * open_interest, minlength=size).reshape(n, 2)
+
+    return StrikeLadder(
+        strikes=strikes,
+        call_gex=gex[:, 1],
+        put_gex=gex[:, 0],
+        call_oi=oi[:, 1],
+        put_oi=oi[:, 0],
+        dealer_delta=dd.sum(axis=1),
+    )
+
+
+def expiry_buckets(
+    days_to_expiry: np.ndarray,
+    is_call: np.ndarray,
+    gex: np.ndarray,
+    edges: Sequence[int] = EXPIRY_BUCKET_EDGES,
+    labels: Optional[Sequence[str]] = None,
+) -> dict:
+    """
+    Net GEX (call - put) per days-to-expiry bucket.
+    """
+    labels = labels or EXPIRY_BUCKET_LABELS
+    sign = np.where(np.asarray(is_call, dtype=bool), 1.0, -1.0)
+    bucket = np.digitize(np.asarray(days_to_expiry), edges)
+    totals = np.bincount(bucket, weights=sign * np.asarray(gex, dtype=np.float64), minlength=len(edges) + 1)
+    return {label: float(v) for label, v in zip(labels, totals)}
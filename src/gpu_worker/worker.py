@@ -2,8 +2,15 @@ import os
 import time
 import json
 import logging
+from src.shared.metrics import (
+    QUEUE_WAIT, JOB_DURATION, JOBS_IN_FLIGHT, start_metrics_server,
+)
 # import torch # Uncomment in real environment with GPU support
 
+JOB_QUEUE_NAME = os.getenv('JOB_QUEUE_NAME', 'dealerflow-gpu-jobs')
+# /metrics for Prometheus (queue wait, job durations, jobs in flight)
+WORKER_METRICS_PORT = int(os.getenv('METRICS_PORT', '9100'))
+
 # Mock Azure Queue Client
 class MockQueueClient:
     def receive_messages(self):
@@ -14,6 +21,17 @@ class MockQueueClient:
     def delete_message(self, msg):
         pass
 
+    def send_message(self, content):
+        logging.info(f"Enqueued GPU job: {content}")
+
+def enqueue_gpu_job(task, as_of, queue=None):
+    """
+    Pushes a job onto dealerflow-gpu-jobs (KEDA scales the worker pool on depth).
+    """
+    # In real usage: QueueClient.from_connection_string(...).send_message(...)
+    queue = queue or MockQueueClient()
+    queue.send_message(json.dumps({'task': task, 'date': str(as_of), 'enqueued_at': time.time()}))
+
 def run_gpu_job(job_data):
     """
     Simulates a heavy PyTorch/GPU workload.
@@ -29,10 +47,40 @@ def run_gpu_job(job_data):
     
     logging.info("Job Complete. Persisting results to Postgres.")
 
+def queue_wait_seconds(msg, job_data) -> float:
+    """
+    Seconds between enqueue and pickup: the queue's insertion time when the
+    client provides it (Azure QueueMessage.inserted_on), else the producer's stamp.
+    """
+    inserted_on = getattr(msg, 'inserted_on', None)
+    enqueued_at = inserted_on.timestamp() if inserted_on is not None else job_data.get('enqueued_at')
+    return max(time.time() - enqueued_at, 0.0) if enqueued_at else None
+
+def process_message(queue, msg, handler=run_gpu_job):
+    """
+    Runs one queued job and records queue wait, duration and in-flight metrics.
+    """
+    job_data = json.loads(msg.content)
+    task = job_data.get('task', 'unknown')
+    wait = queue_wait_seconds(msg, job_data)
+    if wait is not None:
+        QUEUE_WAIT.observe(wait, queue=JOB_QUEUE_NAME, task=task)
+
+    start = time.perf_counter()
+    status = 'failed'
+    try:
+        with JOBS_IN_FLIGHT.track(task=task):
+            handler(job_data)
+        queue.delete_message(msg)
+        status = 'success'
+    finally:
+        JOB_DURATION.observe(time.perf_counter() - start, task=task, status=status)
+
 def main():
     logging.basicConfig(level=logging.INFO)
     logging.info("DealerFlow GPU Worker Starting...")
-    logging.info("Connecting to Azure Storage Queue: dealerflow-gpu-jobs")
+    logging.info(f"Connecting to Azure Storage Queue: {JOB_QUEUE_NAME}")
+    start_metrics_server(WORKER_METRICS_PORT)
     
     # In real usage: client = QueueClient.from_connection_string(...)
     queue = MockQueueClient()
@@ -47,9 +95,7 @@ def main():
             
         for msg in messages:
             try:
-                job_data = json.loads(msg.content)
-                run_gpu_job(job_data)
-                queue.delete_message(msg)
+                process_message(queue, msg)
             except Exception as e:
                 logging.error(f"Job failed: {e}")
 
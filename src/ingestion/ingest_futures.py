@@ -0,0 +1,75 @@
+import pandas as pd
+from datetime import timedelta
+
+from src.data_connectors.databento_futures import DatabentoFuturesConnector
+from src.db import execute_sql
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+
+def front_back_expiry(as_of, contract_symbol):
+    # Expiry proxy: 1 month out for Front, 2 months for Back
+    if "n.1" in contract_symbol:
+        return as_of + timedelta(days=60)
+    return as_of + timedelta(days=30)
+
+def upsert_future(as_of, underlying, contract_symbol, price, table="raw_futures"):
+    # Delete existing to avoid ON CONFLICT issues (Schema drift protection)
+    del_sql = "DELETE FROM raw_futures WHERE as_of = :as_of AND underlying = :underlying AND contract_symbol = :contract_symbol"
+    execute_sql(del_sql, {"as_of": as_of, "underlying": underlying, "contract_symbol": contract_symbol})
+
+    # Map to raw_futures schema
+    sql = """
+    INSERT INTO raw_futures (as_of, underlying, contract_symbol, settle_price, expiry, open_interest)
+    VALUES (:as_of, :underlying, :contract_symbol, :price, :expiry, 0)
+    """
+    expiry = front_back_expiry(as_of, contract_symbol)
+        
+    execute_sql(sql, {
+        "as_of": as_of,
+        "underlying": underlying,
+        "contract_symbol": contract_symbol,
+        "price": price,
+        "expiry": expiry
+    })
+
+def ingest_all(target_date) -> int:
+    """
+    Front / back futures bars for one day (date or YYYY-MM-DD). Returns the
+    number of contracts fetched.
+    """
+    # The connector takes YYYY-MM-DD strings
+    target_date = str(target_date)
+    connector = DatabentoFuturesConnector()
+    fetched = 0
+    print(f"--- Ingesting Futures via Databento for {target_date} ---")
+    
+    # Define assets to fetch (Front .n.0 and Back .n.1 for curve)
+    assets = {
+        "GOLD": ["GC.n.0", "GC.n.1"],
+        "WTI": ["CL.n.0", "CL.n.1"],
+        "AUDUSD": ["6A.n.0"], # FX Futures
+        "JPY": ["6J.n.0"]     # JPY Futures
+    }
+    
+    for underlying, symbols in assets.items():
+        bars = []
+        for sym in symbols:
+            df = connector.get_daily_bars(sym, target_date, target_date)
+            if not df.empty:
+                row = df.iloc[0]
+                price = float(row['close'])
+                print(f"Fetched {underlying} ({sym}): {price}")
+                fetched += 1
+                if postgres_enabled():
+                    upsert_future(row['as_of'], underlying, sym, price)
+                bars.append({
+                    'as_of': row['as_of'], 'underlying': underlying, 'contract_symbol': sym,
+                    'expiry': front_back_expiry(row['as_of'], sym), 'settle_price': price,
+                    'open_interest': 0.0, 'volume': float(row['volume']),
+                })
+            else:
+                print(f"Missing {underlying} ({sym})")
+
+        # One landing file per underlying and day (front + back contracts)
+        if bars and landing_enabled():
+            write_landing(pd.DataFrame(bars), 'futures', underlying, sort_by=('expiry',))
+    return fetched
@@ -0,0 +1,78 @@
+from datetime import date
+from typing import Optional
+
+from src.data_connectors.databento_futures import DatabentoFuturesConnector
+from src.data_connectors.futures_options import FuturesOptionsConnector
+from src.shared.markets import FUTURES_OPTIONS
+from src.db import write_dataframe
+from src.shared.migrations import ensure_monthly_partitions
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+from src.features.futures_options_features import compute_futures_options_features
+from src.shared.tracing import traced
+from src.shared.metrics import ROWS_INGESTED
+
+
+@traced('ingest')
+def ingest_futures_options(
+    underlying: str,
+    as_of: date,
+    futures_price: Optional[float] = None,
+    compute_features: bool = True,
+) -> int:
+    """Fetch, price (Black-76) and store one futures options chain.
+
+    Runs the full per-underlying pipeline so it can be fanned out across
+    processes: chain -> Greeks -> raw_options -> features_futures_options.
+
+    Parameters
+    ----------
+    underlying : str
+        Internal name from FUTURES_OPTIONS (e.g. "GOLD", "WTI", "AUDUSD").
+    as_of : date
+        Trade date.
+    futures_price : float, optional
+        Underlying futures price for the Greeks. Defaults to the front-month
+        settle from Databento.
+    compute_features : bool
+        Also compute GEX features after ingestion (default: True).
+
+    Returns
+    -------
+    int
+        Number of contracts ingested.
+    """
+    spec = FUTURES_OPTIONS[underlying]
+    connector = FuturesOptionsConnector()
+
+    if futures_price is None:
+        bars = DatabentoFuturesConnector().get_daily_bars(
+            spec['future'], as_of.strftime("%Y-%m-%d"), as_of.strftime("%Y-%m-%d")
+        )
+        if bars.empty:
+            print(f"No {spec['future']} futures price for {as_of}; skipping {underlying}.")
+            return 0
+        futures_price = float(bars.iloc[0]['close'])
+
+    df = connector.get_option_chain(as_of, underlying=underlying)
+    if df.empty:
+        print(f"No {underlying} options data found.")
+        return 0
+
+    df = connector.calculate_greeks(df, futures_price)
+
+    if df['open_interest'].max() == 0:
+        print(f"WARNING: No Open Interest found in {underlying} feed. Using synthetic generator.")
+        df = connector.generate_synthetic_oi(df, futures_price)
+
+    if landing_enabled():
+        write_landing(df, 'options', underlying, sort_by=('expiry', 'strike'))
+    if postgres_enabled():
+        print(f"Ingesting {len(df)} {underlying} rows to raw_options...")
+        ensure_monthly_partitions(as_of, as_of)
+        write_dataframe(df, 'raw_options', if_exists='append', index=False)
+    ROWS_INGESTED.inc(len(df), source='futures_options', underlying=underlying)
+
+    if compute_features:
+        compute_futures_options_features(as_of, underlying)
+
+    return len(df)
@@ -0,0 +1,33 @@
+from src.data_connectors.alpha_vantage import AlphaVantageConnector
+from src.db import write_dataframe
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+
+def ingest_gold():
+    connector = AlphaVantageConnector()
+    # Fetch XAUUSD (Spot Gold)
+    df = connector.get_commodity_daily("GOLD")
+    
+    if df.empty:
+        print("No data fetched.")
+        return
+
+    # Transform for raw_futures table
+    # Columns: as_of, underlying, contract_symbol, expiry, settle_price, open_interest, volume
+    
+    # Map XAUUSD spot data to this schema
+    df_fut = df.copy()
+    df_fut['underlying'] = 'GOLD'
+    df_fut['contract_symbol'] = 'SPOT'
+    df_fut['expiry'] = df_fut['as_of'] # Spot expires daily?
+    df_fut['settle_price'] = df_fut['spot_price']
+    df_fut['open_interest'] = 0
+    df_fut['volume'] = 0
+    
+    # Select only needed columns
+    df_fut = df_fut[['as_of', 'underlying', 'contract_symbol', 'expiry', 'settle_price', 'open_interest', 'volume']]
+    
+    print(f"Ingesting {len(df_fut)} rows of Gold Spot...")
+    if landing_enabled():
+        write_landing(df_fut, 'futures', 'GOLD_SPOT')
+    if postgres_enabled():
+        write_dataframe(df_fut, 'raw_futures', if_exists='append', index=False)
@@ -0,0 +1,96 @@
+from datetime import date
+from typing import Optional
+
+from src.data_connectors.futures_options import FuturesOptionsConnector
+from src.data_connectors.spx_options import SPXOptionsConnector
+from src.db import write_dataframe
+from src.shared.migrations import ensure_monthly_partitions
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+from src.shared.markets import INDEX_OPTIONS, DEFAULT_SPOTS
+from src.shared.tracing import traced
+from src.shared.metrics import ROWS_INGESTED
+
+
+def parse_spots(value: Optional[str], underlyings) -> dict:
+    """Parse a --spot argument into {underlying: spot}.
+
+    Accepts a single number (applied to every underlying) or a
+    comma-separated "SYM=PRICE" list; missing entries use DEFAULT_SPOTS.
+    """
+    spots = {u: DEFAULT_SPOTS.get(u) for u in underlyings}
+    if not value:
+        return spots
+    if "=" not in value:
+        return {u: float(value) for u in underlyings}
+    for part in value.split(","):
+        sym, price = part.split("=")
+        spots[sym.strip().upper()] = float(price)
+    return spots
+
+
+@traced('ingest')
+def ingest_index_options(
+    underlying: str,
+    as_of: date,
+    spot_price: Optional[float] = None,
+    spots: Optional[dict] = None,
+) -> int:
+    """Fetch, price and store one index options chain into raw_options.
+
+    Designed to run in its own process: each call opens its own Databento
+    client and DB connection and writes only its own underlying's rows.
+
+    Parameters
+    ----------
+    underlying : str
+        Key of INDEX_OPTIONS (e.g. "SPX", "NDX", "RUT", "ES").
+    as_of : date
+        Trade date.
+    spot_price : float, optional
+        Underlying level used for the Greeks (futures price for ES).
+    spots : dict, optional
+        {underlying: spot} map used when spot_price is not given (lets one
+        pool call cover several underlyings). Falls back to DEFAULT_SPOTS.
+
+    Returns
+    -------
+    int
+        Number of contracts ingested.
+    """
+    spec = INDEX_OPTIONS[underlying]
+    if spot_price is None:
+        spot_price = (spots or DEFAULT_SPOTS)[underlying]
+
+    # 1. Fetch Chain (options on futures go through the GLBX / Black-76 connector)
+    if spec['futures']:
+        connector = FuturesOptionsConnector()
+        df = connector.get_option_chain(as_of, underlying=underlying, parent=spec['parent'])
+    else:
+        connector = SPXOptionsConnector()
+        df = connector.get_option_chain(as_of, underlying=spec['parent'], dataset=spec['dataset'])
+        if not df.empty:
+            df['underlying'] = underlying
+
+    if df.empty:
+        print(f"No {underlying} options data found.")
+        return 0
+
+    print(f"Fetched {len(df)} {underlying} contracts.")
+
+    # 2. Calculate Greeks
+    df = connector.calculate_greeks(df, spot_price)
+
+    # 2b. Databento OHLCV-1d usually lacks OI. If max OI is 0, generate synthetic.
+    if df['open_interest'].max() == 0:
+        print(f"WARNING: No Open Interest found in {underlying} feed. Using synthetic generator.")
+        df = connector.generate_synthetic_oi(df, spot_price)
+
+    # 3. Write to DB
+    if landing_enabled():
+        write_landing(df, 'options', underlying, sort_by=('expiry', 'strike'))
+    if postgres_enabled():
+        print(f"Ingesting {len(df)} {underlying} rows to raw_options...")
+        ensure_monthly_partitions(as_of, as_of)
+        write_dataframe(df, 'raw_options', if_exists='append', index=False)
+    ROWS_INGESTED.inc(len(df), source='index_options', underlying=underlying)
+    return len(df)
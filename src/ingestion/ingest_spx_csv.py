@@ -1,13 +1,20 @@
 import os
+from contextlib import nullcontext
 from datetime import date
 from typing import Optional
 
 import pandas as pd
 
-from src.shared.db import get_db_connection
+from src.shared.db import copy_frame, get_db_connection
+from src.shared.migrations import ensure_monthly_partitions
+from src.shared.landing import write_landing, landing_enabled, postgres_enabled
+from src.shared.tracing import traced
+from src.shared.metrics import ROWS_INGESTED
+from src.shared.memory import chunk_rows
 
 
-REQUIRED_COLUMNS = {
+# raw_options columns loaded from the CSV, in table order
+RAW_OPTION_COLUMNS = [
     "option_symbol",
     "type",
     "strike",
@@ -20,7 +27,16 @@ REQUIRED_COLUMNS = {
     "implied_volatility",
     "delta",
     "gamma",
-}
+]
+NUMERIC_COLUMNS = [c for c in RAW_OPTION_COLUMNS if c not in ("option_symbol", "type", "expiry")]
+
+REQUIRED_COLUMNS = set(RAW_OPTION_COLUMNS)
+
+# Rows parsed per chunk (a full SPX chain is ~35k rows, so one chunk);
+# shrunk under a memory budget
+CSV_CHUNK_ROWS = 250_000
+# Parsed row (~400 B) plus its Arrow / CSV copies while it is COPYed
+CSV_ROW_BYTES = 1600
 
 
 def _validate_columns(df: pd.DataFrame) -> None:
@@ -29,12 +45,14 @@ def _validate_columns(df: pd.DataFrame) -> None:
         raise ValueError(f"CSV is missing required columns: {sorted(missing)}")
 
 
+@traced('ingest')
 def ingest_spx_from_csv(
     csv_path: str,
     as_of: Optional[date] = None,
     underlying: str = "SPX",
 ) -> int:
-    """Ingest SPX options from a CSV file into raw_options.
+    """Ingest SPX options from a CSV file into raw_options and / or the
+    landing zone (RAW_STORE).
 
     The CSV must contain at least the columns in REQUIRED_COLUMNS.
 
@@ -57,57 +75,31 @@ def ingest_spx_from_csv(
 
     as_of = as_of or date.today()
 
-    df = pd.read_csv(csv_path)
-    _validate_columns(df)
-
-    # Ensure expiry is a proper date
-    if df["expiry"].dtype == object:
-        df["expiry"] = pd.to_datetime(df["expiry"]).dt.date
-
-    records = [
-        (
-            as_of,
-            underlying,
-            row["option_symbol"],
-            row["type"],
-            float(row["strike"]),
-            row["expiry"],
-            float(row["underlying_price"]),
-            float(row["bid"]),
-            float(row["ask"]),
-            float(row["last"]),
-            float(row["open_interest"]),
-            float(row["implied_volatility"]),
-            float(row["delta"]),
-            float(row["gamma"]),
-        )
-        for _, row in df.iterrows()
-    ]
-
-    sql = """
-        INSERT INTO raw_options (
-            as_of,
-            underlying,
-            option_symbol,
-            type,
-            strike,
-            expiry,
-            underlying_price,
-            bid,
-            ask,
-            last,
-            open_interest,
-            implied_volatility,
-            delta,
-            gamma
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-        )
-    """
-
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.executemany(sql, records)
-        conn.commit()
-
-    return len(records)
+    columns = ["as_of", "underlying", *RAW_OPTION_COLUMNS]
+    rows = chunk_rows(CSV_CHUNK_ROWS, CSV_ROW_BYTES, 'csv ingest')
+
+    # One COPY per chunk instead of an INSERT per contract, all in one transaction
+    if postgres_enabled():
+        ensure_monthly_partitions(as_of, as_of)
+    count = 0
+    landed = []
+    with get_db_connection() if postgres_enabled() else nullcontext() as conn:
+        for df in pd.read_csv(csv_path, chunksize=rows):
+            _validate_columns(df)
+
+            # Ensure expiry is a proper date
+            df["expiry"] = pd.to_datetime(df["expiry"]).dt.date
+            df = df.assign(as_of=as_of, underlying=underlying)
+            df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].astype(float)
+            if postgres_enabled():
+                copy_frame(df[columns], "raw_options", conn)
+            if landing_enabled():
+                # write_landing replaces the day's file, so the chain is landed in one go
+                landed.append(df[columns])
+            count += len(df)
+        if conn is not None:
+            conn.commit()
+    if landed:
+        write_landing(pd.concat(landed, ignore_index=True), 'options', underlying, sort_by=('expiry', 'strike'))
+    ROWS_INGESTED.inc(count, source='csv', underlying=underlying)
+    return count
@@ -0,0 +1,108 @@
+import os
+import re
+import aiohttp
+from abc import ABC, abstractmethod
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 'mock' (canned note, no network) or 'http' (OpenAI-compatible chat endpoint,
+# e.g. a hosted model or scripts/run_llm_stub.py)
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'mock').lower()
+LLM_BASE_URL = os.getenv('LLM_BASE_URL', 'http://localhost:8088/v1')
+LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4o-mini')
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '120'))
+
+
+class LLMClient(ABC):
+    """
+    Interface for macro note generation: one system + user prompt in, text out.
+    `model` is part of the note cache key, so switching models regenerates notes.
+    """
+    model = 'base'
+
+    @abstractmethod
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        ...
+
+    async def close(self):
+        pass
+
+
+class MockLLMClient(LLMClient):
+    """
+    Canned note for the portfolio demo without an API key.
+    """
+    model = 'mock'
+
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        match = re.search(r'Date:\s*(\d{4}-\d{2}-\d{2})', user_prompt)
+        note_date = match.group(1) if match else datetime.now().strftime('%Y-%m-%d')
+        return f"""
+# Macro Note: The Reflexive Edge
+
+**Date:** {note_date}
+
+## 1. Structural Flow
+The DealerFlow engine flags SPX as **FRAGILE** (Score 48). Dealers are in negative gamma territory, meaning they are forced to sell into weakness and buy into strength. This mechanical hedging flow amplifies volatility but hasn't yet reached "Explosive" extremes. Meanwhile, cross-border flows show signs of stress, with the Dollar strengthening alongside falling equity markets.
+
+## 2. Reflexivity
+A classic reflexive loop is forming in Japan. Rising JGB yields are failing to attract capital because the Yen is simultaneously weakening. This suggests the carry trade unwind is not over; instead, capital is fleeing Japan despite higher nominal rates, which forces the BOJ into a corner.
+
+## 3. The Truth
+Consensus believes the "Soft Landing" is locked in. The truth is that structural liquidity conditions are deteriorating. The equity market is supporting the economy, not the other way around. If SPX breaks key dealer levels, the feedback loop reverses.
+
+## 4. Signals to Watch
+*   **USDJPY**: If it breaks 152 despite rising JGB yields, the reflexive loop accelerates.
+*   **SPX Net Gamma**: Currently negative. Watch for a flip back to positive to signal stability.
+
+## 5. How DealerFlow Tracks This
+Our composite instability index captures the interaction between Option Gamma, FX Carry, and Rates Spreads. Today, 3 out of 5 pillars are flashing warning signs.
+
+## 6. Stance
+**Cautious / Hedged.** Structurally, the environment favors volatility-aware positioning rather than passive long-only risk. Net Gamma suggests jagged price action ahead.
+"""
+
+
+class HTTPLLMClient(LLMClient):
+    """
+    OpenAI-compatible /chat/completions client sharing one aiohttp session.
+    """
+
+    def __init__(self, base_url: str = LLM_BASE_URL, model: str = LLM_MODEL, api_key: str = None, timeout: float = LLM_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.api_key = api_key or os.getenv('LLM_API_KEY') or os.getenv('OPENAI_API_KEY')
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        if self._session is None:
+            headers = {'Authorization': f'Bearer {self.api_key}'} if self.api_key else {}
+            self._session = aiohttp.ClientSession(headers=headers, timeout=self.timeout)
+
+        payload = {
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': system_prompt},
+                {'role': 'user', 'content': user_prompt},
+            ],
+        }
+        async with self._session.post(f"{self.base_url}/chat/completions", json=payload) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        return data['choices'][0]['message']['content']
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def get_llm_client(provider: str = LLM_PROVIDER) -> LLMClient:
+    if provider == 'mock':
+        return MockLLMClient()
+    if provider == 'http':
+        return HTTPLLMClient()
+    raise ValueError(f"Unknown LLM provider: {provider}")
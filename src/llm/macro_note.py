@@ -0,0 +1,108 @@
+import os
+import json
+import asyncio
+import hashlib
+from dataclasses import asdict
+from datetime import date
+from typing import Iterable
+from dotenv import load_dotenv
+from src.llm.client import LLMClient
+from src.llm.macro_state import MacroState, build_macro_state
+
+load_dotenv()
+
+PROMPT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'prompts', 'macro_note.txt'))
+REPORTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'reports'))
+
+# Generated notes keyed by (prompt template, MacroState, model): {key}.md
+LLM_CACHE_DIR = os.getenv(
+    'LLM_CACHE_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'llm_cache'))
+)
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '4'))
+
+
+def load_prompt(path: str = PROMPT_PATH) -> str:
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def build_summary(ms: MacroState) -> str:
+    return f"""
+    Date: {ms.as_of}
+    SPX: {ms.spx_instability} ({ms.spx_regime})
+    AUD/USD: {ms.audusd_instability} ({ms.audusd_regime})
+    USD/JPY: {ms.jpy_instability} (FRAGILE)
+    Reflexivity Loop: {ms.reflexive_loop_active}
+    Rates Spread: {ms.spread_usjp_10y:.2f}%
+    DXY 20d: {ms.dxy_ret_20d:.2f}%
+    FX Equity Stress: {ms.fx_equity_stress}
+    """
+
+
+def note_cache_key(system_prompt: str, ms: MacroState, model: str) -> str:
+    """
+    sha256 of the prompt template, the MacroState fields and the model: an
+    unchanged day with an unchanged prompt maps to the same note.
+    """
+    template_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+    state_hash = hashlib.sha256(json.dumps(asdict(ms), sort_keys=True).encode()).hexdigest()
+    return hashlib.sha256(f"{template_hash}:{state_hash}:{model}".encode()).hexdigest()[:32]
+
+
+def note_cache_path(key: str, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or LLM_CACHE_DIR, f"{key}.md")
+
+
+async def generate_note_for_state(ms: MacroState, client: LLMClient, system_prompt: str, cache_dir: str = None) -> tuple:
+    """
+    Returns (note, cached). Only calls the LLM on a cache miss.
+    """
+    path = note_cache_path(note_cache_key(system_prompt, ms, client.model), cache_dir)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read(), True
+
+    note = await client.complete(system_prompt, build_summary(ms))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(note)
+    os.replace(tmp, path)
+    return note, False
+
+
+def save_note(note: str, as_of: str, output_dir: str = REPORTS_DIR) -> str:
+    path = os.path.join(output_dir, f'macro_note_{as_of}.md')
+    with open(path, 'w', encoding="utf-8") as f:
+        f.write(note)
+    return path
+
+
+async def generate_notes(
+    dates: Iterable[date],
+    client: LLMClient,
+    max_concurrency: int = LLM_CONCURRENCY,
+    output_dir: str = REPORTS_DIR,
+    cache_dir: str = None,
+) -> dict:
+    """
+    Generates and saves macro notes for many dates with at most
+    `max_concurrency` LLM calls in flight. Returns {as_of: path}.
+    """
+    system_prompt = load_prompt()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+    os.makedirs(output_dir, exist_ok=True)
+
+    async def one(as_of):
+        ms = await loop.run_in_executor(None, build_macro_state, as_of)
+        async with semaphore:
+            note, cached = await generate_note_for_state(ms, client, system_prompt, cache_dir)
+        return as_of, save_note(note, ms.as_of, output_dir), cached
+
+    results = await asyncio.gather(*(one(as_of) for as_of in dates))
+    calls = sum(1 for _, _, cached in results if not cached)
+    print(f"Saved {len(results)} macro notes ({calls} LLM calls, {len(results) - calls} from cache) to {output_dir}")
+    return {as_of: path for as_of, path, _ in results}
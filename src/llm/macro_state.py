@@ -1,11 +1,53 @@
-from dataclasses import dataclass
+import os
+import json
+from dataclasses import dataclass, asdict
 from typing import Literal, Optional
 from datetime import date
-import pandas as pd
+from sqlalchemy import text
+from dotenv import load_dotenv
 from src.db import get_connection
+from src.shared.files import write_json_atomic
+
+load_dotenv()
 
 Regime = Literal["STABLE", "FRAGILE", "EXPLOSIVE", "UNSTABLE", "PENDING"]
 
+# Snapshot cache shared by the dashboard, macro note and report scripts:
+#   {MACRO_STATE_CACHE_DIR}/{YYYY-MM-DD}.json = {"fingerprint": ..., "state": {...}}
+MACRO_STATE_CACHE_DIR = os.getenv(
+    'MACRO_STATE_CACHE_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'macro_state'))
+)
+
+# Every row a MacroState is built from, for one date
+MACRO_STATE_SOURCES = """
+FROM (SELECT CAST(:as_of AS DATE) AS as_of) d
+LEFT JOIN asset_scores spx ON spx.as_of = d.as_of AND spx.symbol = 'SPX'
+LEFT JOIN asset_scores aud ON aud.as_of = d.as_of AND aud.symbol = 'AUDUSD'
+LEFT JOIN features_rates_spreads rs ON rs.as_of = d.as_of
+LEFT JOIN features_reflexivity_jp rj ON rj.as_of = d.as_of
+LEFT JOIN features_crossborder_fx_equity cb ON cb.as_of = d.as_of
+"""
+
+# Content hash of those rows: any upsert into them changes it
+MACRO_STATE_FINGERPRINT = """
+md5(concat_ws('|', to_jsonb(spx)::text, to_jsonb(aud)::text, to_jsonb(rs)::text,
+                   to_jsonb(rj)::text, to_jsonb(cb)::text))
+"""
+
+MACRO_FINGERPRINT_QUERY = f"SELECT {MACRO_STATE_FINGERPRINT} AS fingerprint {MACRO_STATE_SOURCES}"
+
+MACRO_STATE_QUERY = f"""
+SELECT
+    spx.instability_index AS spx_instability, spx.regime AS spx_regime,
+    aud.instability_index AS audusd_instability, aud.regime AS audusd_regime,
+    rs.us10y, rs.jp10y, rs.spread_usjp_10y,
+    rj.reflexive_loop_active,
+    cb.fx_equity_stress, cb.dxy_ret_20d,
+    {MACRO_STATE_FINGERPRINT} AS fingerprint
+{MACRO_STATE_SOURCES}
+"""
+
 @dataclass
 class MacroState:
     as_of: str
@@ -23,52 +65,73 @@ class MacroState:
     reflexive_loop_active: bool
     fx_equity_stress: str
 
-def build_macro_state(as_of: date) -> MacroState:
+def macro_state_from_row(as_of: date, row) -> MacroState:
     """
-    Queries the database to construct a unified MacroState snapshot.
+    Builds a MacroState from one MACRO_STATE_QUERY row, with the usual
+    defaults for assets / features not computed for the date.
     """
-    with get_connection() as conn:
-        # 1. Asset Scores
-        df_scores = pd.read_sql("SELECT * FROM asset_scores WHERE as_of = %s", conn, params=(as_of,))
-        
-        # Helpers
-        def get_score(sym):
-            row = df_scores[df_scores['symbol'] == sym]
-            if row.empty: return 0.0, "PENDING"
-            return float(row.iloc[0]['instability_index']), row.iloc[0]['regime']
-
-        spx_score, spx_reg = get_score('SPX')
-        aud_score, aud_reg = get_score('AUDUSD')
+    def number(key):
+        return float(row[key]) if row[key] is not None else 0.0
+
+    return MacroState(
+        as_of=as_of.strftime("%Y-%m-%d"),
+        spx_instability=number('spx_instability'),
+        spx_regime=row['spx_regime'] or "PENDING",
+        audusd_instability=number('audusd_instability'),
+        audusd_regime=row['audusd_regime'] or "PENDING",
         # JPY score? We didn't compute it in score_assets yet. Assume mock for now.
-        jpy_score, jpy_reg = 60.0, "FRAGILE" 
-        
-        # 2. Macro Features
-        df_rates = pd.read_sql("SELECT * FROM features_rates_spreads WHERE as_of = %s", conn, params=(as_of,))
-        df_reflex = pd.read_sql("SELECT * FROM features_reflexivity_jp WHERE as_of = %s", conn, params=(as_of,))
-        df_cb = pd.read_sql("SELECT * FROM features_crossborder_fx_equity WHERE as_of = %s", conn, params=(as_of,))
-        
-        us10y = float(df_rates.iloc[0]['us10y']) if not df_rates.empty else 0.0
-        jp10y = float(df_rates.iloc[0]['jp10y']) if not df_rates.empty else 0.0
-        spread = float(df_rates.iloc[0]['spread_usjp_10y']) if not df_rates.empty else 0.0
-        
-        reflexive = bool(df_reflex.iloc[0]['reflexive_loop_active']) if not df_reflex.empty else False
-        
-        stress = df_cb.iloc[0]['fx_equity_stress'] if not df_cb.empty else "NORMAL"
-        dxy_ret = float(df_cb.iloc[0]['dxy_ret_20d']) if not df_cb.empty else 0.0
-        
-        return MacroState(
-            as_of=as_of.strftime("%Y-%m-%d"),
-            spx_instability=spx_score,
-            spx_regime=spx_reg,
-            audusd_instability=aud_score,
-            audusd_regime=aud_reg,
-            jpy_instability=jpy_score,
-            dxy_ret_20d=dxy_ret,
-            wti_instability=58.0, # Mock
-            nem_instability=65.0, # Mock
-            us10y=us10y,
-            jp10y=jp10y,
-            spread_usjp_10y=spread,
-            reflexive_loop_active=reflexive,
-            fx_equity_stress=stress
-        )
+        jpy_instability=60.0,
+        dxy_ret_20d=number('dxy_ret_20d'),
+        wti_instability=58.0, # Mock
+        nem_instability=65.0, # Mock
+        us10y=number('us10y'),
+        jp10y=number('jp10y'),
+        spread_usjp_10y=number('spread_usjp_10y'),
+        reflexive_loop_active=bool(row['reflexive_loop_active']),
+        fx_equity_stress=row['fx_equity_stress'] or "NORMAL"
+    )
+
+def cache_path(as_of: date, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or MACRO_STATE_CACHE_DIR, f"{as_of:%Y-%m-%d}.json")
+
+def load_cached_state(as_of: date, fingerprint: str, cache_dir: str = None) -> Optional[MacroState]:
+    """
+    Returns the cached snapshot for `as_of` if it was built from rows with
+    the same fingerprint, otherwise None.
+    """
+    path = cache_path(as_of, cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        cached = json.load(f)
+    if cached.get('fingerprint') != fingerprint:
+        return None
+    return MacroState(**cached['state'])
+
+def save_cached_state(ms: MacroState, fingerprint: str, cache_dir: str = None) -> str:
+    path = cache_path(date.fromisoformat(ms.as_of), cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return write_json_atomic(path, {'fingerprint': fingerprint, 'state': asdict(ms)})
+
+def build_macro_state(as_of: date, use_cache: bool = True, cache_dir: str = None) -> MacroState:
+    """
+    Returns the unified MacroState snapshot for a date.
+
+    The cached snapshot is reused while the fingerprint of its source rows
+    (scores and macro features) is unchanged; otherwise it is rebuilt from
+    one joined query and the cache entry replaced.
+    """
+    with get_connection() as conn:
+        params = {'as_of': as_of}
+        if use_cache:
+            fingerprint = conn.execute(text(MACRO_FINGERPRINT_QUERY), params).scalar()
+            cached = load_cached_state(as_of, fingerprint, cache_dir)
+            if cached is not None:
+                return cached
+
+        row = conn.execute(text(MACRO_STATE_QUERY), params).mappings().one()
+
+    ms = macro_state_from_row(as_of, row)
+    if use_cache:
+        save_cached_state(ms, row['fingerprint'], cache_dir)
+    return ms
@@ -0,0 +1,36 @@
+from aiohttp import web
+
+# Local stand-in for an OpenAI-compatible chat endpoint: deterministic notes,
+# no key, and a call counter to check what the note cache saves.
+CALLS = web.AppKey('calls', dict)
+
+
+def stub_note(user_prompt: str) -> str:
+    lines = [line.strip() for line in user_prompt.strip().splitlines() if line.strip()]
+    body = "\n".join(f"*   {line}" for line in lines)
+    return f"# Macro Note (stub)\n\n## 1. Structural Flow\n{body}\n"
+
+
+async def chat_completions(request):
+    request.app[CALLS]['count'] += 1
+    payload = await request.json()
+    user_prompt = next((m['content'] for m in payload['messages'] if m['role'] == 'user'), '')
+    return web.json_response({
+        'object': 'chat.completion',
+        'model': payload.get('model', 'stub'),
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': stub_note(user_prompt)}, 'finish_reason': 'stop'}],
+    })
+
+
+async def stats(request):
+    return web.json_response({'calls': request.app[CALLS]['count']})
+
+
+def create_stub_app() -> web.Application:
+    app = web.Application()
+    app[CALLS] = {'count': 0}
+    app.add_routes([
+        web.post('/v1/chat/completions', chat_completions),
+        web.get('/stats', stats),
+    ])
+    return app
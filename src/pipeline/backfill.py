@@ -0,0 +1,231 @@
+import os
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Iterable, Optional
+from src.shared.db import execute_query, enable_connection_reuse, disable_connection_reuse
+from src.pipeline.dag import Pipeline, ONCE
+
+# Multi-date backfills (`python -m src backfill --start ... --end ...`):
+#
+#   once        run-once stages, in this process
+#   dates       per-date stages, contiguous date shards across a process
+#               pool; each worker runs its shard in date order over one
+#               pooled connection
+#   sequential  `sequential` stages and everything after them, one date at
+#               a time in date order, stopping at the first failure
+#
+# Every finished date is checkpointed in backfill_checkpoints (migration
+# 004), so rerunning an interrupted backfill skips what is already done.
+
+# Consecutive business days handed to a worker at a time
+BACKFILL_SHARD_DAYS = int(os.getenv('BACKFILL_SHARD_DAYS', '20'))
+
+PHASES = ('once', 'dates', 'sequential')
+
+
+def split_phases(pipeline: Pipeline) -> dict:
+    """
+    {phase: [stage names in pipeline order]}. Stages downstream of a
+    sequential stage are sequential too.
+    """
+    phases = {phase: [] for phase in PHASES}
+    ordered = set()
+    for name in pipeline.order:
+        stage = pipeline.stages[name]
+        if not stage.per_date:
+            phases['once'].append(name)
+        elif stage.sequential or any(dep in ordered for dep in stage.deps):
+            ordered.add(name)
+            phases['sequential'].append(name)
+        else:
+            phases['dates'].append(name)
+    return phases
+
+
+def plan_shards(dates: Iterable[date], workers: int, shard_days: int = None) -> list:
+    """
+    Splits sorted dates into contiguous shards of at most `shard_days`,
+    smaller when needed to give every worker a shard.
+    """
+    dates = sorted(dates)
+    if not dates:
+        return []
+    size = max(1, min(shard_days or BACKFILL_SHARD_DAYS, -(-len(dates) // max(1, workers))))
+    return [dates[i:i + size] for i in range(0, len(dates), size)]
+
+
+def backfill_id(pipeline: Pipeline, start: date, end: date) -> str:
+    """
+    Same stages (and versions) over the same range -> same id, so a rerun resumes.
+    """
+    key = ','.join(f"{name}:{pipeline.stages[name].version}" for name in sorted(pipeline.stages))
+    return hashlib.md5(f"{key}|{start}|{end}".encode()).hexdigest()[:16]
+
+
+def throughput(dates_done: int, seconds: float) -> float:
+    """
+    Dates per minute.
+    """
+    return dates_done * 60.0 / seconds if seconds > 0 else 0.0
+
+
+def format_progress(done: int, total: int, seconds: float) -> str:
+    rate = throughput(done, seconds)
+    eta = (total - done) / rate if rate else 0.0
+    return f"{done}/{total} dates, {rate:.1f} dates/min, ETA {eta:.1f} min"
+
+
+def start_checkpoints(run_id: str, stages: list, start: date, end: date, total: int, restart: bool = False):
+    if restart:
+        execute_query("DELETE FROM backfill_runs WHERE backfill_id = %s", (run_id,))
+    execute_query("""
+    INSERT INTO backfill_runs (backfill_id, stages, start_date, end_date, dates_total, status)
+    VALUES (%s, %s, %s, %s, %s, 'running')
+    ON CONFLICT (backfill_id) DO UPDATE SET status = 'running', finished_at = NULL;
+    """, (run_id, ','.join(stages), start, end, total))
+
+
+def completed_dates(run_id: str, phase: str) -> set:
+    rows = execute_query(
+        "SELECT as_of FROM backfill_checkpoints WHERE backfill_id = %s AND phase = %s AND status = 'done'",
+        (run_id, phase), fetch=True
+    )
+    return {row['as_of'] for row in rows}
+
+
+def checkpoint(run_id: str, phase: str, as_of: date, status: str, seconds: float, error: str = None):
+    execute_query("""
+    INSERT INTO backfill_checkpoints (backfill_id, phase, as_of, status, worker, duration_s, error, finished_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (backfill_id, phase, as_of) DO UPDATE SET
+    status = EXCLUDED.status,
+    worker = EXCLUDED.worker,
+    duration_s = EXCLUDED.duration_s,
+    error = EXCLUDED.error,
+    finished_at = EXCLUDED.finished_at;
+    """, (run_id, phase, as_of, status, os.getpid(), seconds, error))
+
+
+def finish_checkpoints(run_id: str, status: str, dates_per_minute: float):
+    execute_query(
+        "UPDATE backfill_runs SET status = %s, dates_per_minute = %s, finished_at = CURRENT_TIMESTAMP WHERE backfill_id = %s",
+        (status, dates_per_minute, run_id)
+    )
+
+
+def run_dates(pipeline: Pipeline, dates: list, run_id: str, phase: str, force: bool = False, stop_on_failure: bool = False) -> list:
+    """
+    Runs the pipeline one date at a time in date order, checkpointing each.
+    Returns every StageResult.
+    """
+    results = []
+    for as_of in dates:
+        start = time.perf_counter()
+        day = pipeline.run([as_of], workers=1, force=force)
+        results += day
+        failed = [r for r in day if r.status in ('failed', 'blocked')]
+        error = '; '.join(f"{r.stage}: {r.error or r.status}" for r in failed) or None
+        checkpoint(run_id, phase, as_of if phase != 'once' else ONCE, 'failed' if failed else 'done',
+                   time.perf_counter() - start, error)
+        if failed and stop_on_failure:
+            break
+    return results
+
+
+def _init_worker():
+    # One connection per worker process for checkpoints, fingerprints and stages
+    enable_connection_reuse()
+
+
+def run_backfill(pipeline: Pipeline, dates: list, workers: int = None, force: bool = False,
+                 restart: bool = False, shard_days: int = None, run_id: Optional[str] = None) -> dict:
+    """
+    Backfills `dates` (business days) phase by phase, resuming from the
+    checkpoints of an earlier run of the same backfill. Returns a summary
+    with the StageResults, dates done / failed and dates per minute.
+    """
+    dates = sorted(dates)
+    workers = workers or os.cpu_count() or 1
+    run_id = run_id or backfill_id(pipeline, dates[0], dates[-1])
+    phases = split_phases(pipeline)
+    results = []
+    t0 = time.perf_counter()
+
+    # The parent's own checkpoint writes / run-once stages share one connection too
+    enable_connection_reuse()
+    try:
+        start_checkpoints(run_id, pipeline.order, dates[0], dates[-1], len(dates), restart)
+        print(f"Backfill {run_id}: {len(dates)} dates {dates[0]} .. {dates[-1]}, {workers} workers")
+
+        if phases['once'] and ONCE not in completed_dates(run_id, 'once'):
+            results += run_dates(pipeline.select(phases['once']), [dates[0]], run_id, 'once', force)
+            if any(r.status == 'failed' for r in results):
+                print("Run-once stages failed; not starting the per-date phases")
+                finish_checkpoints(run_id, 'failed', 0.0)
+                return {'backfill_id': run_id, 'results': results, 'done': 0, 'failed': len(dates), 'dates_per_minute': 0.0}
+
+        # A date is done once its last phase is; throughput counts only dates run now
+        last_phase = 'sequential' if phases['sequential'] else 'dates'
+        finished = completed_dates(run_id, last_phase)
+        remaining = [d for d in dates if d not in finished]
+        if len(remaining) < len(dates):
+            print(f"Resuming: {len(dates) - len(remaining)} dates already done")
+        total, done = len(remaining), 0
+
+        if phases['dates'] and remaining:
+            finished = completed_dates(run_id, 'dates')
+            todo = [d for d in remaining if d not in finished]
+            stage_pipeline = pipeline.select(phases['dates'])
+            shards = plan_shards(todo, workers, shard_days)
+            if workers == 1 or len(shards) <= 1:
+                for shard in shards:
+                    shard_results = run_dates(stage_pipeline, shard, run_id, 'dates', force)
+                    results += shard_results
+                    done += len(shard)
+                    print(f"  {shard[0]} .. {shard[-1]}: {format_progress(done, total, time.perf_counter() - t0)}")
+            else:
+                # spawn: workers must not inherit the parent's open connections
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+                    futures = {pool.submit(run_dates, stage_pipeline, shard, run_id, 'dates', force): shard for shard in shards}
+                    for future in as_completed(futures):
+                        shard = futures[future]
+                        try:
+                            shard_results = future.result()
+                        except Exception as e:
+                            print(f"Shard {shard[0]} .. {shard[-1]} failed: {e}")
+                            continue
+                        results += shard_results
+                        done += len(shard)
+                        print(f"  {shard[0]} .. {shard[-1]}: {format_progress(done, total, time.perf_counter() - t0)}")
+
+        if phases['sequential'] and remaining:
+            # Later dates read earlier ones: stop at the first date that is not ready
+            ready = completed_dates(run_id, 'dates') if phases['dates'] else set(remaining)
+            stage_pipeline = pipeline.select(phases['sequential'])
+            done = 0
+            for as_of in remaining:
+                if as_of not in ready:
+                    print(f"Sequential stages stop at {as_of}: per-date stages did not finish")
+                    break
+                day = run_dates(stage_pipeline, [as_of], run_id, 'sequential', force, stop_on_failure=True)
+                results += day
+                if any(r.status in ('failed', 'blocked') for r in day):
+                    break
+                done += 1
+                if done % 20 == 0:
+                    print(f"  sequential {as_of}: {format_progress(done, total, time.perf_counter() - t0)}")
+
+        completed = completed_dates(run_id, last_phase)
+        done = len([d for d in remaining if d in completed])
+        failed = len(dates) - len(completed & set(dates))
+        rate = throughput(done, time.perf_counter() - t0)
+        finish_checkpoints(run_id, 'failed' if failed else 'done', rate)
+        print(f"Backfill {run_id}: {done} dates in {time.perf_counter() - t0:.1f}s ({rate:.1f} dates/min), "
+              f"{failed} not done{' - rerun to resume' if failed else ''}")
+        return {'backfill_id': run_id, 'results': results, 'done': done, 'failed': failed, 'dates_per_minute': rate}
+    finally:
+        disable_connection_reuse()
@@ -0,0 +1,284 @@
+import os
+import time
+import hashlib
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Iterable, Optional
+from src.shared.db import execute_query
+from src.shared.landing import LANDING_ROOT, landing_enabled
+from src.shared.tracing import span
+from src.shared.metrics import STAGE_DURATION, STAGE_LAST_SUCCESS
+
+# pipeline_runs.as_of for stages that run once per pipeline run
+ONCE = date.min
+
+# Raw tables that live in the Parquet landing zone when RAW_STORE=parquet
+LANDING_SOURCES = {'raw_options': 'options', 'raw_futures': 'futures', 'raw_cot': 'cot'}
+
+# Order-independent hash of a table's rows in an as_of window
+TABLE_FINGERPRINT_SQL = """
+SELECT md5(coalesce(string_agg(h, '' ORDER BY h), '')) AS fingerprint
+FROM (SELECT md5(to_jsonb(t)::text) AS h FROM {table} t WHERE as_of BETWEEN %s AND %s) rows
+"""
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    `fn(as_of)` does the work (`fn()` when per_date is False). `inputs` maps
+    the tables the stage reads to a lookback in days; their rows in that
+    window form the stage's fingerprint. Per-date stages without inputs
+    (ingestion from external APIs) run once per date and are skipped
+    afterwards; run-once stages without inputs (full-history downloads)
+    rerun each day and whenever a run reaches a new last date.
+    Bump `version` when the stage's logic changes to force a rerun.
+    Set `sequential` when the stage reads its own output for earlier dates:
+    each date then waits for the previous one (and backfills run it in
+    date order rather than in shards).
+    """
+    name: str
+    fn: Callable
+    deps: tuple = ()
+    inputs: dict = field(default_factory=dict)
+    group: str = 'features'
+    per_date: bool = True
+    version: str = '1'
+    sequential: bool = False
+
+
+@dataclass
+class StageResult:
+    stage: str
+    as_of: Optional[date]
+    status: str # 'success', 'skipped', 'failed', 'blocked'
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def landing_stats(source: str, start: date, end: date) -> list:
+    """
+    (path, size, mtime) of the landing files for `source` in [start, end].
+    """
+    root = os.path.join(LANDING_ROOT, source)
+    if not os.path.isdir(root):
+        return []
+    stats = []
+    for entry in sorted(os.scandir(root), key=lambda e: e.name):
+        if not entry.name.startswith('as_of='):
+            continue
+        if not start <= date.fromisoformat(entry.name[len('as_of='):]) <= end:
+            continue
+        for f in sorted(os.scandir(entry.path), key=lambda e: e.name):
+            st = f.stat()
+            stats.append((f.path, st.st_size, st.st_mtime_ns))
+    return stats
+
+
+class Pipeline:
+    """
+    Runs a stage graph over one or many dates in a thread pool.
+
+    Stages for the same date run as soon as their dependencies have
+    succeeded (or been skipped), so independent stages overlap, and several
+    dates are in flight at once. A failed stage blocks its dependents for
+    that date only.
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = {s.name: s for s in stages}
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+                if stage.per_date is False and self.stages[dep].per_date:
+                    raise ValueError(f"Run-once stage {stage.name} cannot depend on per-date stage {dep}")
+        self.order = self.topological_order()
+
+    def topological_order(self) -> list:
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Cycle in pipeline: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def select(self, names: Iterable[str]) -> 'Pipeline':
+        """
+        Sub-pipeline of the given stage names or groups. Dependencies outside
+        the selection are treated as already satisfied.
+        """
+        names = set(names)
+        chosen = [s for s in self.stages.values() if s.name in names or s.group in names]
+        unknown = names - {s.name for s in chosen} - {s.group for s in chosen}
+        if unknown:
+            raise ValueError(f"Unknown stages / groups: {', '.join(sorted(unknown))}")
+        keep = {s.name for s in chosen}
+        return Pipeline([
+            Stage(s.name, s.fn, tuple(d for d in s.deps if d in keep), s.inputs, s.group, s.per_date, s.version, s.sequential)
+            for s in chosen
+        ])
+
+    def fingerprint(self, stage: Stage, as_of: date) -> str:
+        h = hashlib.md5(f"{stage.name}:{stage.version}".encode())
+        if not stage.per_date and not stage.inputs:
+            # Nothing to hash, so key on the run's last date and today to pick up new data
+            h.update(f"{as_of}:{date.today()}".encode())
+        for table, lookback in sorted(stage.inputs.items()):
+            start = as_of - timedelta(days=lookback)
+            if landing_enabled() and table in LANDING_SOURCES:
+                h.update(repr(landing_stats(LANDING_SOURCES[table], start, as_of)).encode())
+            else:
+                row = execute_query(TABLE_FINGERPRINT_SQL.format(table=table), (start, as_of), fetch=True)[0]
+                h.update(f"{table}:{row['fingerprint']}".encode())
+        return h.hexdigest()
+
+    def last_fingerprint(self, stage: Stage, as_of: date) -> Optional[str]:
+        rows = execute_query(
+            "SELECT fingerprint FROM pipeline_runs WHERE stage = %s AND as_of = %s AND status = 'success'",
+            (stage.name, as_of), fetch=True
+        )
+        return rows[0]['fingerprint'] if rows else None
+
+    def record(self, stage: Stage, as_of: date, fingerprint: Optional[str], status: str, seconds: float, error: str = None):
+        execute_query("""
+        INSERT INTO pipeline_runs (stage, as_of, fingerprint, status, duration_s, error, finished_at)
+        VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+        ON CONFLICT (stage, as_of) DO UPDATE SET
+        fingerprint = EXCLUDED.fingerprint,
+        status = EXCLUDED.status,
+        duration_s = EXCLUDED.duration_s,
+        error = EXCLUDED.error,
+        finished_at = EXCLUDED.finished_at;
+        """, (stage.name, as_of, fingerprint, status, seconds, error))
+
+    def execute(self, stage: Stage, as_of: date, force: bool = False) -> StageResult:
+        key_date = as_of if stage.per_date else ONCE
+        label = None if key_date == ONCE else key_date
+        start = time.perf_counter()
+        fingerprint = None
+        try:
+            fingerprint = self.fingerprint(stage, as_of)
+            if not force and self.last_fingerprint(stage, key_date) == fingerprint:
+                return StageResult(stage.name, label, 'skipped', time.perf_counter() - start)
+
+            with span(stage.name, 'stage', as_of=label):
+                stage.fn(as_of) if stage.per_date else stage.fn()
+            seconds = time.perf_counter() - start
+            STAGE_DURATION.observe(seconds, stage=stage.name, status='success')
+            STAGE_LAST_SUCCESS.set(time.time(), stage=stage.name)
+            self.record(stage, key_date, fingerprint, 'success', seconds)
+            return StageResult(stage.name, label, 'success', seconds)
+        except Exception as e:
+            seconds = time.perf_counter() - start
+            STAGE_DURATION.observe(seconds, stage=stage.name, status='failed')
+            print(f"Stage {stage.name} failed for {label or 'run'}: {e}")
+            traceback.print_exc()
+            try:
+                self.record(stage, key_date, fingerprint, 'failed', seconds, str(e))
+            except Exception as record_error:
+                print(f"Could not record failure of {stage.name}: {record_error}")
+            return StageResult(stage.name, label, 'failed', seconds, str(e))
+
+    def run(self, dates: Iterable[date], workers: int = 4, force: bool = False) -> list:
+        """
+        Runs every stage for every date. Returns one StageResult per task.
+        """
+        dates = sorted(dates)
+        if not dates:
+            return []
+
+        # task key: (stage name, date or None for run-once stages)
+        tasks = {}
+        for name in self.order:
+            stage = self.stages[name]
+            if stage.per_date:
+                for i, d in enumerate(dates):
+                    tasks[(name, d)] = [(dep, d if self.stages[dep].per_date else None) for dep in stage.deps]
+                    if stage.sequential and i:
+                        tasks[(name, d)].append((name, dates[i - 1]))
+            else:
+                tasks[(name, None)] = [(dep, None) for dep in stage.deps]
+
+        # Dependencies each task still waits for, and the tasks waiting on it
+        waiting = {key: len(deps) for key, deps in tasks.items()}
+        dependents = {key: [] for key in tasks}
+        for key, deps in tasks.items():
+            for dep in deps:
+                dependents[dep].append(key)
+        ready = deque(key for key, count in waiting.items() if not count)
+        results = {}
+
+        def settle(key, result):
+            # Releases the task's dependents, or blocks everything downstream of a failure
+            stack = [(key, result)]
+            while stack:
+                key, result = stack.pop()
+                results[key] = result
+                for child in dependents[key]:
+                    if child in results:
+                        continue
+                    if result.status in ('failed', 'blocked'):
+                        results[child] = StageResult(child[0], child[1], 'blocked')
+                        stack.append((child, results[child]))
+                    else:
+                        waiting[child] -= 1
+                        if not waiting[child]:
+                            ready.append(child)
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while ready or running:
+                # A few tasks beyond the pool size, so each wait() scans a short list
+                while ready and len(running) < 2 * workers:
+                    key = ready.popleft()
+                    # Run-once stages take the last date of the range
+                    future = pool.submit(self.execute, self.stages[key[0]], key[1] or dates[-1], force)
+                    running[future] = key
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    settle(running.pop(future), future.result())
+
+        return [results[key] for key in tasks]
+
+
+def timing_summary(results: list) -> list:
+    """
+    Per-stage counts and timings, in pipeline order.
+    """
+    summary = {}
+    for r in results:
+        row = summary.setdefault(r.stage, {
+            'stage': r.stage, 'success': 0, 'skipped': 0, 'failed': 0, 'blocked': 0,
+            'total_s': 0.0, 'max_s': 0.0,
+        })
+        row[r.status] += 1
+        row['total_s'] += r.seconds
+        row['max_s'] = max(row['max_s'], r.seconds)
+    return list(summary.values())
+
+
+def format_summary(results: list, wall_seconds: float = None) -> str:
+    lines = [f"{'Stage':<26}{'Ran':>5}{'Skip':>6}{'Fail':>6}{'Block':>7}{'Total s':>10}{'Max s':>9}"]
+    for row in timing_summary(results):
+        lines.append(
+            f"{row['stage']:<26}{row['success']:>5}{row['skipped']:>6}{row['failed']:>6}{row['blocked']:>7}"
+            f"{row['total_s']:>10.2f}{row['max_s']:>9.2f}"
+        )
+    if wall_seconds is not None:
+        lines.append(f"Wall clock: {wall_seconds:.2f}s")
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import string
+import subprocess
+import multiprocessing
+from abc import ABC, abstractmethod
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, wait
+from src.pipeline.work_units import work
+
+# Where the shard workers of a sharded backfill run. Both executors start
+# workers 0 .. shards - 1 with at most `parallelism` at a time; the workers
+# coordinate through backfill_units, so neither needs to know the plan.
+#
+#   executor = get_executor('local')   # or 'k8s'
+#   executor.start(backfill_id, shards=16, parallelism=4)
+#   executor.wait()
+
+BACKFILL_EXECUTOR = os.getenv('BACKFILL_EXECUTOR', 'local')
+BACKFILL_IMAGE = os.getenv('BACKFILL_IMAGE', 'dealerflowacr.azurecr.io/dealerflow-core:latest')
+K8S_NAMESPACE = os.getenv('K8S_NAMESPACE', 'dealerflow')
+K8S_POLL_S = float(os.getenv('K8S_POLL_S', '15'))
+JOB_TEMPLATE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'k8s', 'job-backfill.yaml'))
+
+
+class ShardExecutor(ABC):
+    @abstractmethod
+    def start(self, backfill_id: str, shards: int, parallelism: int):
+        ...
+
+    @abstractmethod
+    def wait(self, timeout_s: float = None) -> bool:
+        """
+        Blocks until every shard worker has exited. True when none crashed.
+        """
+
+
+class LocalExecutor(ShardExecutor):
+    """
+    Runs the shard workers as local processes (tests, one-box backfills).
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.futures = []
+
+    def start(self, backfill_id: str, shards: int, parallelism: int):
+        # spawn: workers must not inherit the parent's open connections
+        self.pool = ProcessPoolExecutor(max_workers=max(1, parallelism), mp_context=multiprocessing.get_context('spawn'))
+        self.futures = [self.pool.submit(work, backfill_id, shard) for shard in range(shards)]
+
+    def wait(self, timeout_s: float = None) -> bool:
+        _, pending = wait(self.futures, timeout=timeout_s)
+        ok = not pending
+        for future in self.futures:
+            if future.done() and future.exception() is not None:
+                print(f"Shard worker failed: {future.exception()}")
+                ok = False
+        self.pool.shutdown(wait=not pending, cancel_futures=bool(pending))
+        return ok
+
+
+class KubernetesJobExecutor(ShardExecutor):
+    """
+    Runs the shard workers as an indexed Job (k8s/job-backfill.yaml) via kubectl.
+    Each start() creates a new Job (the name carries a start timestamp), since
+    re-applying a finished Job is a no-op until its TTL removes it.
+    """
+
+    def __init__(self, namespace: str = K8S_NAMESPACE, image: str = BACKFILL_IMAGE,
+                 template: str = JOB_TEMPLATE, kubectl: str = 'kubectl', dry_run: bool = False):
+        self.namespace = namespace
+        self.image = image
+        self.template = template
+        self.kubectl = kubectl
+        self.dry_run = dry_run
+        self.job_name = None
+
+    def render(self, backfill_id: str, shards: int, parallelism: int, job_name: str = None) -> str:
+        with open(self.template) as f:
+            manifest = string.Template(f.read())
+        return manifest.substitute(
+            JOB_NAME=job_name or f"dealerflow-backfill-{backfill_id}", NAMESPACE=self.namespace, BACKFILL_ID=backfill_id,
+            SHARDS=shards, PARALLELISM=min(parallelism, shards), IMAGE=self.image,
+        )
+
+    def start(self, backfill_id: str, shards: int, parallelism: int):
+        self.job_name = f"dealerflow-backfill-{backfill_id}-{int(time.time())}"
+        manifest = self.render(backfill_id, shards, parallelism, self.job_name)
+        if self.dry_run:
+            print(manifest)
+            return
+        subprocess.run([self.kubectl, 'apply', '-f', '-'], input=manifest, text=True, check=True)
+        print(f"Started job/{self.job_name} in {self.namespace}: {shards} shards, {min(parallelism, shards)} at a time")
+
+    def job_state(self) -> Optional[str]:
+        """
+        'complete' or 'failed' once the Job has finished, else None.
+        """
+        proc = subprocess.run([self.kubectl, 'get', 'job', self.job_name, '-n', self.namespace, '-o', 'json'],
+                              capture_output=True, text=True, check=True)
+        for condition in json.loads(proc.stdout).get('status', {}).get('conditions') or []:
+            if condition.get('status') == 'True' and condition.get('type') in ('Complete', 'Failed'):
+                return condition['type'].lower()
+        return None
+
+    def wait(self, timeout_s: float = None) -> bool:
+        if self.dry_run:
+            return True
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        while True:
+            state = self.job_state()
+            if state is not None:
+                if state == 'failed':
+                    print(f"job/{self.job_name} failed (backoff limit reached)")
+                return state == 'complete'
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"Timed out waiting for job/{self.job_name}")
+                return False
+            time.sleep(K8S_POLL_S)
+
+
+def get_executor(name: str = BACKFILL_EXECUTOR, **kwargs) -> ShardExecutor:
+    if name == 'local':
+        return LocalExecutor()
+    if name == 'k8s':
+        return KubernetesJobExecutor(**kwargs)
+    raise ValueError(f"Unknown backfill executor: {name}")
@@ -0,0 +1,167 @@
+import os
+import asyncio
+from datetime import date
+from src.shared.markets import FUTURES_OPTIONS
+from src.pipeline.dag import Pipeline, Stage
+
+# Stage functions import their modules lazily: a run that only renders
+# reports never loads the Databento / Alpha Vantage clients.
+
+# Index chains ingested and featurised per date
+PIPELINE_INDEX_UNDERLYINGS = [u.strip() for u in os.getenv('PIPELINE_INDEX_UNDERLYINGS', 'SPX').split(',') if u.strip()]
+PIPELINE_OUTPUT_DIR = os.getenv(
+    'PIPELINE_OUTPUT_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'reports'))
+)
+
+MACRO_TABLES = {'features_rates_spreads': 0, 'features_reflexivity_jp': 0, 'features_crossborder_fx_equity': 0}
+
+
+def require_rows(count, what):
+    # An empty fetch (e.g. run before the vendor publishes) must not count as done
+    if not count:
+        raise RuntimeError(f"no {what} ingested")
+
+
+def ingest_index_options_stage(as_of: date):
+    from src.ingestion.ingest_index_options import ingest_index_options
+    require_rows(sum(ingest_index_options(u, as_of) or 0 for u in PIPELINE_INDEX_UNDERLYINGS), 'index options')
+
+
+def ingest_futures_options_stage(as_of: date):
+    # Also writes features_futures_options for each market
+    from src.ingestion.ingest_futures_options import ingest_futures_options
+    require_rows(sum(ingest_futures_options(u, as_of) or 0 for u in FUTURES_OPTIONS), 'futures options')
+
+
+def ingest_futures_stage(as_of: date):
+    from src.ingestion.ingest_futures import ingest_all
+    require_rows(ingest_all(as_of), 'futures bars')
+
+
+def ingest_cot_stage():
+    from src.ingestion.ingest_cot import ingest_cot
+    ingest_cot()
+
+
+def ingest_fx_stage():
+    from src.ingestion.ingest_fx import ingest_fx
+    ingest_fx()
+
+
+def ingest_gold_stage():
+    from src.ingestion.ingest_gold import ingest_gold
+    ingest_gold()
+
+
+def index_features_stage(as_of: date):
+    from src.features.spx_features import compute_index_features
+    for underlying in PIPELINE_INDEX_UNDERLYINGS:
+        compute_index_features(underlying, as_of)
+
+
+def commodity_features_stage(as_of: date):
+    from src.features.commodity_features import compute_commodity_features
+    compute_commodity_features(as_of, 'GOLD')
+
+
+def fx_features_stage(as_of: date):
+    from src.features.fx_features import compute_fx_features
+    compute_fx_features(as_of, 'AUDUSD')
+
+
+def macro_features_stage(as_of: date):
+    from src.features.macro_features import compute_macro_features
+    compute_macro_features(as_of)
+
+
+def scores_stage(as_of: date):
+    from src.scoring.scoring_engine import compute_asset_scores
+    compute_asset_scores(as_of)
+
+
+def macro_note_stage(as_of: date):
+    from src.llm.client import get_llm_client
+    from src.llm.macro_note import generate_notes
+
+    async def run():
+        client = get_llm_client()
+        try:
+            await generate_notes([as_of], client, 1, PIPELINE_OUTPUT_DIR)
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def dashboard_stage(as_of: date):
+    from src.reporting.dashboard import generate_dashboard
+    generate_dashboard(as_of)
+
+
+def report_stage(as_of: date):
+    from src.reporting.report_generator import generate_report, save_report
+    report = generate_report(as_of)
+    if report is None:
+        raise RuntimeError(f"no scores for {as_of}")
+    save_report(report, as_of, PIPELINE_OUTPUT_DIR)
+
+
+STAGES = [
+    # Ingestion: external inputs, so each runs once per date (once per run
+    # for the full-history downloads) unless forced
+    Stage('ingest_index_options', ingest_index_options_stage, group='ingest'),
+    Stage('ingest_futures_options', ingest_futures_options_stage, group='ingest'),
+    Stage('ingest_futures', ingest_futures_stage, group='ingest'),
+    Stage('ingest_cot', ingest_cot_stage, group='ingest', per_date=False),
+    Stage('ingest_fx', ingest_fx_stage, group='ingest', per_date=False),
+    Stage('ingest_gold', ingest_gold_stage, group='ingest', per_date=False),
+
+    Stage('index_features', index_features_stage, ('ingest_index_options',), {'raw_options': 0}),
+    Stage('commodity_features', commodity_features_stage, ('ingest_futures', 'ingest_gold', 'ingest_cot'),
+          {'raw_futures': 0, 'raw_cot': 31}),
+    Stage('fx_features', fx_features_stage, ('ingest_fx', 'ingest_cot'), {'raw_fx': 60, 'raw_cot': 31}),
+    Stage('macro_features', macro_features_stage),
+
+    Stage('scores', scores_stage, ('index_features', 'ingest_futures_options', 'commodity_features', 'fx_features'),
+          {'features_equity': 0, 'features_hedge_flow': 0, 'features_futures_options': 0,
+           'features_commodity': 0, 'features_fx': 0}, group='scores'),
+
+    Stage('macro_note', macro_note_stage, ('scores', 'macro_features'),
+          {'asset_scores': 0, **MACRO_TABLES}, group='reports'),
+    Stage('dashboard', dashboard_stage, ('scores', 'macro_features'),
+          {'asset_scores': 0, **MACRO_TABLES}, group='reports'),
+    # The report embeds the day's macro note
+    Stage('report', report_stage, ('scores', 'macro_note'),
+          {'asset_scores': 0, 'features_equity': 0, 'features_commodity': 0, 'features_fx': 0,
+           'features_gamma_term': 0, **MACRO_TABLES}, group='reports'),
+]
+
+
+def default_pipeline() -> Pipeline:
+    return Pipeline(STAGES)
+
+
+def feature_assets() -> list:
+    """
+    Assets with their own feature work per date (backfill work units).
+    """
+    return PIPELINE_INDEX_UNDERLYINGS + ['GOLD', 'AUDUSD']
+
+
+def asset_features_stage(asset: str, as_of: date):
+    """
+    One asset's features for one date; the per-asset slice of
+    index_features / commodity_features / fx_features.
+    """
+    if asset in PIPELINE_INDEX_UNDERLYINGS:
+        from src.features.spx_features import compute_index_features
+        compute_index_features(asset, as_of)
+    elif asset == 'GOLD':
+        from src.features.commodity_features import compute_commodity_features
+        compute_commodity_features(as_of, 'GOLD')
+    elif asset == 'AUDUSD':
+        from src.features.fx_features import compute_fx_features
+        compute_fx_features(as_of, 'AUDUSD')
+    else:
+        raise ValueError(f"No feature work for asset {asset}")
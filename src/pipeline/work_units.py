@@ -0,0 +1,250 @@
+import os
+import time
+import socket
+import hashlib
+import traceback
+from datetime import date
+from typing import Optional
+from psycopg2.extras import RealDictCursor
+from src.shared.db import execute_query, copy_frame, get_db_connection, enable_connection_reuse, disable_connection_reuse
+from src.pipeline.backfill import start_checkpoints, finish_checkpoints, throughput
+from src.pipeline.stages import default_pipeline, feature_assets, asset_features_stage
+
+# Horizontally scaled backfills: the range is split into date x asset work
+# units in backfill_units (migration 005) and any number of workers claim
+# them from the database. Each date gets one unit per asset (its features)
+# plus a '*' unit for the cross-asset stages (macro features, scores, ...)
+# that becomes claimable once the date's asset units are done.
+#
+# Dates are assigned to shards in contiguous blocks. A worker started for
+# shard i (the completion index of an indexed Job, see executors.py) works
+# its own dates first, then steals from the other shards until nothing is
+# left to claim.
+
+# Cross-asset stages run by each date's '*' unit
+DATE_STAGES = ('macro_features', 'scores')
+DATE_UNIT = '*'
+
+# A claim older than this is assumed lost (pod evicted) and taken over
+BACKFILL_CLAIM_TIMEOUT_S = int(os.getenv('BACKFILL_CLAIM_TIMEOUT_S', '1800'))
+# Failed units are retried until they have been attempted this often
+BACKFILL_MAX_ATTEMPTS = int(os.getenv('BACKFILL_MAX_ATTEMPTS', '3'))
+# Wait between claims while other workers still hold units this one depends on
+BACKFILL_POLL_S = float(os.getenv('BACKFILL_POLL_S', '5'))
+
+# The pick is a materialized CTE: as a FROM subquery the planner may rescan
+# it per row, and each SKIP LOCKED rescan claims another unit
+CLAIM_SQL = """
+WITH next_unit AS MATERIALIZED (
+    SELECT c.as_of, c.asset FROM backfill_units c
+    WHERE c.backfill_id = %(backfill_id)s
+      AND (c.status = 'pending'
+           OR (c.status = 'failed' AND c.attempts < %(max_attempts)s)
+           OR (c.status = 'claimed' AND c.claimed_at < CURRENT_TIMESTAMP - make_interval(secs => %(timeout_s)s)))
+      AND (c.asset <> '*' OR NOT EXISTS (
+           SELECT 1 FROM backfill_units a
+           WHERE a.backfill_id = c.backfill_id AND a.as_of = c.as_of AND a.asset <> '*' AND a.status <> 'done'))
+      AND (NOT %(sequential)s OR c.asset <> '*' OR NOT EXISTS (
+           SELECT 1 FROM backfill_units p
+           WHERE p.backfill_id = c.backfill_id AND p.as_of < c.as_of AND p.asset = '*' AND p.status <> 'done'))
+    ORDER BY (c.shard = %(shard)s) DESC, c.as_of, c.asset
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE backfill_units u
+SET status = 'claimed', claimed_by = %(worker)s, claimed_at = CURRENT_TIMESTAMP, attempts = u.attempts + 1
+FROM next_unit
+WHERE u.backfill_id = %(backfill_id)s AND u.as_of = next_unit.as_of AND u.asset = next_unit.asset
+RETURNING u.as_of, u.asset
+"""
+
+
+def units_backfill_id(assets: list, stages: list, start: date, end: date) -> str:
+    """
+    Same assets, cross-asset stages and range -> same id, so replanning resumes.
+    """
+    key = f"units|{','.join(sorted(assets))}|{','.join(stages)}|{start}|{end}"
+    return hashlib.md5(key.encode()).hexdigest()[:16]
+
+
+def plan_units(dates: list, assets: list, shards: int, date_stages: bool = True) -> list:
+    """
+    [(as_of, asset, shard)] with dates split into `shards` contiguous blocks.
+    """
+    dates = sorted(dates)
+    shards = max(1, min(shards, len(dates)))
+    units = []
+    for i, as_of in enumerate(dates):
+        shard = i * shards // len(dates)
+        units += [(as_of, asset, shard) for asset in assets]
+        if date_stages:
+            units.append((as_of, DATE_UNIT, shard))
+    return units
+
+
+def create_backfill(dates: list, shards: int, assets: list = None, stages: list = DATE_STAGES,
+                    restart: bool = False, backfill_id: str = None) -> str:
+    """
+    Records the backfill and its work units (kept as they are when the same
+    backfill already exists, so workers resume it). Returns the backfill id.
+    """
+    import pandas as pd
+
+    assets = feature_assets() if assets is None else list(assets)
+    stages = list(stages)
+    dates = sorted(dates)
+    backfill_id = backfill_id or units_backfill_id(assets, stages, dates[0], dates[-1])
+    start_checkpoints(backfill_id, stages, dates[0], dates[-1], len(dates), restart)
+    existing = execute_query("SELECT count(*) AS n FROM backfill_units WHERE backfill_id = %s", (backfill_id,), fetch=True)[0]['n']
+    if existing:
+        print(f"Backfill {backfill_id}: resuming {existing} existing work units")
+        return backfill_id
+
+    units = plan_units(dates, assets, shards, date_stages=bool(stages))
+    frame = pd.DataFrame(units, columns=['as_of', 'asset', 'shard']).assign(backfill_id=backfill_id)
+    copy_frame(frame, 'backfill_units', columns=['backfill_id', 'as_of', 'asset', 'shard'])
+    print(f"Backfill {backfill_id}: {len(units)} work units ({len(dates)} dates x {len(assets)} assets"
+          f"{' + cross-asset stages' if stages else ''}) in {max(1, min(shards, len(dates)))} shards")
+    return backfill_id
+
+
+def load_stages(backfill_id: str) -> list:
+    rows = execute_query("SELECT stages FROM backfill_runs WHERE backfill_id = %s", (backfill_id,), fetch=True)
+    if not rows:
+        raise ValueError(f"Unknown backfill {backfill_id}")
+    return [s for s in rows[0]['stages'].split(',') if s]
+
+
+def claim_unit(backfill_id: str, shard: int, worker: str, sequential: bool = False) -> Optional[tuple]:
+    """
+    Claims the next runnable unit, own shard first. (as_of, asset) or None.
+    """
+    params = {
+        'backfill_id': backfill_id, 'shard': shard, 'worker': worker, 'sequential': sequential,
+        'max_attempts': BACKFILL_MAX_ATTEMPTS, 'timeout_s': BACKFILL_CLAIM_TIMEOUT_S,
+    }
+    # execute_query does not commit fetches; the claim must be committed to hold
+    with get_db_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(CLAIM_SQL, params)
+        rows = cur.fetchall()
+        conn.commit()
+    return (rows[0]['as_of'], rows[0]['asset']) if rows else None
+
+
+def finish_unit(backfill_id: str, as_of: date, asset: str, worker: str, status: str, seconds: float, error: str = None) -> bool:
+    """
+    Records a unit's outcome while `worker` still holds the claim. False when
+    the claim timed out and another worker took the unit over.
+    """
+    with get_db_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+        UPDATE backfill_units SET status = %s, duration_s = %s, error = %s, finished_at = CURRENT_TIMESTAMP
+        WHERE backfill_id = %s AND as_of = %s AND asset = %s AND claimed_by = %s AND status = 'claimed'
+        """, (status, seconds, error, backfill_id, as_of, asset, worker))
+        updated = cur.rowcount
+        conn.commit()
+    return updated > 0
+
+
+def units_in_flight(backfill_id: str) -> int:
+    """
+    Units other workers hold (live claims), which may unblock more work.
+    """
+    return execute_query("""
+    SELECT count(*) AS n FROM backfill_units
+    WHERE backfill_id = %s AND status = 'claimed'
+      AND claimed_at >= CURRENT_TIMESTAMP - make_interval(secs => %s)
+    """, (backfill_id, BACKFILL_CLAIM_TIMEOUT_S), fetch=True)[0]['n']
+
+
+def run_unit(as_of: date, asset: str, date_pipeline) -> Optional[str]:
+    """
+    Runs one unit; returns None on success, else the error.
+    """
+    if asset == DATE_UNIT:
+        failed = [r for r in date_pipeline.run([as_of], workers=1) if r.status in ('failed', 'blocked')]
+        return '; '.join(f"{r.stage}: {r.error or r.status}" for r in failed) or None
+    try:
+        asset_features_stage(asset, as_of)
+        return None
+    except Exception as e:
+        print(f"{asset} features failed for {as_of}: {e}")
+        traceback.print_exc()
+        return str(e) or type(e).__name__
+
+
+def work(backfill_id: str, shard: int = 0, worker: str = None, poll_s: float = None) -> dict:
+    """
+    Claims and runs units until none are left. One pooled connection per
+    worker. Returns counts of units done / failed.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    poll_s = BACKFILL_POLL_S if poll_s is None else poll_s
+    counts = {'done': 0, 'failed': 0}
+    enable_connection_reuse()
+    try:
+        stages = load_stages(backfill_id)
+        date_pipeline = default_pipeline().select(stages) if stages else None
+        sequential = bool(date_pipeline) and any(s.sequential for s in date_pipeline.stages.values())
+        t0 = time.perf_counter()
+        while True:
+            unit = claim_unit(backfill_id, shard, worker, sequential)
+            if unit is None:
+                if not units_in_flight(backfill_id):
+                    break
+                time.sleep(poll_s)
+                continue
+            as_of, asset = unit
+            start = time.perf_counter()
+            error = run_unit(as_of, asset, date_pipeline)
+            status = 'failed' if error else 'done'
+            if finish_unit(backfill_id, as_of, asset, worker, status, time.perf_counter() - start, error):
+                counts[status] += 1
+            else:
+                print(f"Claim on {asset} {as_of} was taken over by another worker; result not recorded")
+        print(f"Worker {worker} (shard {shard}): {counts['done']} units done, {counts['failed']} failed "
+              f"in {time.perf_counter() - t0:.1f}s")
+        return counts
+    finally:
+        disable_connection_reuse()
+
+
+def backfill_status(backfill_id: str) -> dict:
+    """
+    Units per status, dates fully done and dates per minute so far.
+    """
+    units = {row['status']: row['n'] for row in execute_query(
+        "SELECT status, count(*) AS n FROM backfill_units WHERE backfill_id = %s GROUP BY status",
+        (backfill_id,), fetch=True
+    )}
+    row = execute_query("""
+    SELECT count(*) AS dates_total,
+           count(*) FILTER (WHERE done) AS dates_done,
+           extract(epoch FROM max(finished_at) - min(started_at)) AS seconds
+    FROM (
+        SELECT as_of, bool_and(status = 'done') AS done, max(finished_at) AS finished_at, min(claimed_at) AS started_at
+        FROM backfill_units WHERE backfill_id = %s GROUP BY as_of
+    ) dates
+    """, (backfill_id,), fetch=True)[0]
+    seconds = float(row['seconds'] or 0)
+    return {
+        'backfill_id': backfill_id, 'units': units,
+        'dates_total': row['dates_total'], 'dates_done': row['dates_done'],
+        'dates_per_minute': throughput(row['dates_done'], seconds),
+    }
+
+
+def format_status(status: dict) -> str:
+    units = ', '.join(f"{n} {s}" for s, n in sorted(status['units'].items())) or 'no units'
+    return (f"Backfill {status['backfill_id']}: {status['dates_done']}/{status['dates_total']} dates done "
+            f"({status['dates_per_minute']:.1f} dates/min); units: {units}")
+
+
+def finish_backfill(backfill_id: str) -> dict:
+    """
+    Marks the run done / failed from its units and returns backfill_status().
+    """
+    status = backfill_status(backfill_id)
+    complete = status['dates_done'] == status['dates_total']
+    finish_checkpoints(backfill_id, 'done' if complete else 'failed', status['dates_per_minute'])
+    return status
@@ -1,6 +1,30 @@
-import pandas as pd
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from src.shared.db import get_db_connection
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader
+from src.shared.db import execute_query
+from src.shared.tracing import traced
+
+def format_level(value):
+    """
+    Formats a strike level (e.g. a gamma wall), tolerating missing values.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "N/A"
+    return f"{value:,.0f}"
+
+def format_top_expiry(term_row):
+    """
+    Formats the expiry carrying the largest absolute net GEX from features_gamma_term.
+    """
+    expiries = term_row.get('expiries') if len(term_row) else None
+    if not expiries:
+        return "N/A"
+    gex = term_row.get('expiry_net_gex')
+    i = max(range(len(gex)), key=lambda j: abs(gex[j]))
+    return f"{expiries[i]} ({gex[i]:,.0f})"
 
 def generate_spx_commentary(score_row, feature_row):
     """
@@ -62,8 +86,8 @@ def generate_fx_commentary(score_row, feature_row):
     regime = score_row.get('regime', 'FRAGILE')
     pressure = score_row.get('pressure_direction', 'NEUTRAL')
     
-    carry = float(feature_row.get('carry_attractiveness', 0))
-    vol = float(feature_row.get('fx_vol_level', 0))
+    carry = feature_row.get('carry_attractiveness', 0)
+    vol = feature_row.get('fx_vol_level', 0)
     
     # Safe access to pct_oi inside JSONB
     pct_oi = 0.0
@@ -96,132 +120,166 @@ def generate_fx_commentary(score_row, feature_row):
         
     return f"{intro} {detail}"
 
-def generate_report(as_of: date):
-    """
-    Generates the full markdown report for a given date.
-    """
-    print(f"Generating report for {as_of}...")
-    
-    with get_db_connection() as conn:
-        # Fetch Scores
-        scores_df = pd.read_sql("SELECT * FROM asset_scores WHERE as_of = %s", conn, params=(as_of,))
-        # Fetch Features
-        equity_df = pd.read_sql("SELECT * FROM features_equity WHERE as_of = %s", conn, params=(as_of,))
-        comm_df = pd.read_sql("SELECT * FROM features_commodity WHERE as_of = %s", conn, params=(as_of,))
-        fx_df = pd.read_sql("SELECT * FROM features_fx WHERE as_of = %s", conn, params=(as_of,))
-        
-    if scores_df.empty:
-        print(f"No scores found for {as_of}")
-        return None
-        
-    # Prepare Data
-    spx_score = scores_df[scores_df['symbol'] == 'SPX'].iloc[0] if not scores_df[scores_df['symbol'] == 'SPX'].empty else {}
-    gold_score = scores_df[scores_df['symbol'] == 'GOLD'].iloc[0] if not scores_df[scores_df['symbol'] == 'GOLD'].empty else {}
-    aud_score = scores_df[scores_df['symbol'] == 'AUDUSD'].iloc[0] if not scores_df[scores_df['symbol'] == 'AUDUSD'].empty else {}
-    
-    spx_features = equity_df.iloc[0] if not equity_df.empty else {}
-    gold_features = comm_df.iloc[0] if not comm_df.empty else {}
-    fx_features = fx_df.iloc[0] if not fx_df.empty else {}
-    
-    # Generate Commentary
-    spx_commentary = generate_spx_commentary(spx_score, spx_features)
-    gold_commentary = generate_gold_commentary(gold_score, gold_features) if gold_score.get('symbol') else "Data pending."
-    aud_commentary = generate_fx_commentary(aud_score, fx_features) if aud_score.get('symbol') else "Data pending."
-    
-    # Extract FX metrics for display
-    aud_carry = float(fx_features.get('carry_attractiveness', 0))
-    aud_vol = float(fx_features.get('fx_vol_level', 0))
-    aud_net_spec = float(fx_features.get('cot_net_spec', 0))
-
-    # Fill Template
-    report_base = f"""# DealerFlow Weekly Macro Flow Report
-**Date:** {as_of}
-
-## 1. Global Flow Map (Summary)
-
-| Asset | Instability | Regime | Pressure |
-|-------|-------------|--------|----------|
-| **SPX** | {spx_score.get('instability_index', 'N/A')} | **{spx_score.get('regime', 'N/A')}** | {spx_score.get('pressure_direction', 'N/A')} |
-| **GOLD** | {gold_score.get('instability_index', 'N/A')} | **{gold_score.get('regime', 'N/A')}** | {gold_score.get('pressure_direction', 'N/A')} |
-| **AUDUSD** | {aud_score.get('instability_index', 'N/A')} | **{aud_score.get('regime', 'N/A')}** | {aud_score.get('pressure_direction', 'N/A')} |
-
----
-
-## 2. Equity Flow Snapshot (SPX)
-
-**🧠 Structural Signals**
-*   **Net Gamma:** {float(spx_features.get('net_gamma', 0)):.2f}
-*   **Gamma Slope:** {float(spx_features.get('gamma_slope', 0)):.4f}
-*   **Net Delta:** {float(spx_features.get('net_delta', 0)):.2f}
+# One row per report date: each asset's score / feature row as JSON (float
+# numbers, no Decimal). Large arrays (gex_ladder, roll-off grid) are left out.
+REPORT_DATA_QUERY = """
+WITH dates AS (
+    SELECT DISTINCT as_of FROM asset_scores
+    WHERE as_of BETWEEN %(start)s AND %(end)s
+)
+SELECT
+    d.as_of,
+    to_jsonb(spx) AS spx_score,
+    to_jsonb(gold) AS gold_score,
+    to_jsonb(aud) AS aud_score,
+    to_jsonb(eq) - 'gex_ladder' AS spx_features,
+    to_jsonb(cm) AS gold_features,
+    to_jsonb(fx) AS fx_features,
+    CASE WHEN gt.as_of IS NULL THEN NULL ELSE jsonb_build_object(
+        'unclench_date', gt.unclench_date,
+        'expiries', gt.expiries,
+        'expiry_net_gex', gt.expiry_net_gex
+    ) END AS spx_term
+FROM dates d
+LEFT JOIN asset_scores spx ON spx.as_of = d.as_of AND spx.symbol = 'SPX'
+LEFT JOIN asset_scores gold ON gold.as_of = d.as_of AND gold.symbol = 'GOLD'
+LEFT JOIN asset_scores aud ON aud.as_of = d.as_of AND aud.symbol = 'AUDUSD'
+LEFT JOIN features_equity eq ON eq.as_of = d.as_of AND eq.underlying = 'SPX'
+LEFT JOIN features_commodity cm ON cm.as_of = d.as_of AND cm.underlying = 'GOLD'
+LEFT JOIN features_fx fx ON fx.as_of = d.as_of AND fx.pair = 'AUDUSD'
+LEFT JOIN features_gamma_term gt ON gt.as_of = d.as_of AND gt.underlying = 'SPX'
+ORDER BY d.as_of
+"""
 
-**📌 Interpretation**
-{spx_commentary}
+REPORT_SECTIONS = ('spx_score', 'gold_score', 'aud_score', 'spx_features', 'gold_features', 'fx_features', 'spx_term')
 
----
+# Numeric fields rendered with a format spec; missing values show as 0
+REPORT_NUMERIC_DEFAULTS = {
+    'spx_features': ('net_gamma', 'gamma_slope', 'net_delta', 'gamma_above_spot', 'gamma_below_spot'),
+    'gold_features': ('backwardation_pct', 'spec_net_position'),
+    'fx_features': ('carry_attractiveness', 'fx_vol_level', 'cot_net_spec'),
+}
 
-## 3. Commodity Flow Snapshot (GOLD)
+TEMPLATES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'templates'))
+REPORTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'reports'))
 
-**🧠 Structural Signals**
-*   **Backwardation:** {float(gold_features.get('backwardation_pct', 0) * 100):.2f}%
-*   **Spec Net Pos:** {float(gold_features.get('spec_net_position', 0)):,.0f} contracts
+@lru_cache(maxsize=None)
+def get_report_template(name='report.md.j2'):
+    """
+    Compiles the report template once per process.
+    """
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), keep_trailing_newline=True)
+    return env.get_template(name)
 
-**📌 Interpretation**
-{gold_commentary}
+@traced('report')
+def load_report_data(start: date, end: date) -> list:
+    """
+    Loads scores and features for every scored date in [start, end] with one
+    joined query. Returns one dict per date with a dict per section
+    (empty when that asset has no row).
+    """
+    rows = execute_query(REPORT_DATA_QUERY, {'start': start, 'end': end}, fetch=True)
+    data = []
+    for row in rows:
+        item = {'as_of': row['as_of']}
+        for section in REPORT_SECTIONS:
+            values = dict(row[section] or {})
+            if section.endswith('_score'):
+                # NUMERIC scores come back from JSON as int when whole; keep them float
+                values = {k: float(v) if type(v) is int and k != 'id' else v for k, v in values.items()}
+            for key in REPORT_NUMERIC_DEFAULTS.get(section, ()):
+                if values.get(key) is None:
+                    values[key] = 0
+            item[section] = values
+        data.append(item)
+    return data
 
----
+def load_macro_note(as_of):
+    """
+    Body of reports/macro_note_{as_of}.md from its first ## header, or None.
+    """
+    macro_note_path = os.path.join(REPORTS_DIR, f'macro_note_{as_of}.md')
+    if not os.path.exists(macro_note_path):
+        return None
+    with open(macro_note_path, 'r', encoding='utf-8') as f:
+        # Skip title/date from note as we already have header
+        lines = f.readlines()
+    # Simple heuristic: start from first ## header
+    start_idx = 0
+    for i, line in enumerate(lines):
+        if line.startswith("##"):
+            start_idx = i
+            break
+    return "".join(lines[start_idx:])
 
-## 4. FX Flow Snapshot (AUDUSD)
+@traced('report')
+def render_report(data: dict) -> str:
+    """
+    Renders one date's report from a load_report_data() entry.
+    """
+    spx_score, gold_score, aud_score = data['spx_score'], data['gold_score'], data['aud_score']
+    spx_features, spx_term = data['spx_features'], data['spx_term']
 
-**🧠 Structural Signals**
-*   **Carry:** {aud_carry:.2f}% annualised
-*   **Realised Vol (20d):** {aud_vol:.2f}%
-*   **COT Net Spec:** {aud_net_spec:,.0f} contracts
+    context = dict(data)
+    context.update({
+        'spx_commentary': generate_spx_commentary(spx_score, spx_features),
+        'gold_commentary': generate_gold_commentary(gold_score, data['gold_features']) if gold_score.get('symbol') else "Data pending.",
+        'aud_commentary': generate_fx_commentary(aud_score, data['fx_features']) if aud_score.get('symbol') else "Data pending.",
+        'call_wall': format_level(spx_features.get('call_wall')),
+        'put_wall': format_level(spx_features.get('put_wall')),
+        'top_expiry': format_top_expiry(spx_term),
+        'macro_note': load_macro_note(data['as_of']),
+    })
+    return get_report_template().render(**context)
 
-**📌 Interpretation**
-{aud_commentary}
+@traced('report')
+def generate_report(as_of: date):
+    """
+    Generates the full markdown report for a given date.
+    """
+    print(f"Generating report for {as_of}...")
+    
+    data = load_report_data(as_of, as_of)
+    if not data:
+        print(f"No scores found for {as_of}")
+        return None
+        
+    return render_report(data[0])
 
----
-"""
+def select_report_dates(data: list, frequency: str = 'daily') -> list:
+    """
+    Keeps every date ('daily') or the last scored date of each ISO week ('weekly').
+    """
+    if frequency == 'daily':
+        return data
+    last_by_week = {}
+    for item in data:
+        last_by_week[item['as_of'].isocalendar()[:2]] = item
+    return list(last_by_week.values())
 
-    # Try to load Macro Note (Deep Dive Narrative)
-    import os
-    macro_note_path = os.path.join(os.path.dirname(__file__), '..', '..', 'reports', f'macro_note_{as_of}.md')
-    macro_content = ""
-    
-    if os.path.exists(macro_note_path):
-        with open(macro_note_path, 'r', encoding='utf-8') as f:
-            # Skip title/date from note as we already have header
-            lines = f.readlines()
-            # Simple heuristic: start from first ## header
-            start_idx = 0
-            for i, line in enumerate(lines):
-                if line.startswith("##"):
-                    start_idx = i
-                    break
-            macro_content = "".join(lines[start_idx:])
-            
-        # Replace Section 5 with Macro Note
-        report_base += f"\n{macro_content}\n"
-    else:
-        # Fallback
-        report_base += """
-## 5. Cross-Asset Themes
-*   Equity instability suggests a cautious approach to risk assets.
-*   FX and Commodity signals provide context on capital flows and scarcity.
-"""
+@traced('report')
+def generate_reports(start: date, end: date, frequency: str = 'daily', output_dir: str = '.', max_workers: int = None) -> list:
+    """
+    Batch mode: one data load for the whole range, one compiled template,
+    reports rendered per date and written in parallel. Returns the paths written.
+    """
+    data = select_report_dates(load_report_data(start, end), frequency)
+    if not data:
+        print(f"No scores found between {start} and {end}")
+        return []
 
-    report_base += """
----
+    os.makedirs(output_dir, exist_ok=True)
+    rendered = [(item['as_of'], render_report(item)) for item in data]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        paths = list(pool.map(lambda r: save_report(r[1], r[0], output_dir, verbose=False), rendered))
 
-## Disclaimer
-This report is an automated structural-flow viewpoint generated by the DealerFlow engine.
-It is not trading advice — purely a technical research signal.
-"""
-    
-    return report_base
+    print(f"Saved {len(paths)} reports ({start} -> {end}, {frequency}) to {os.path.abspath(output_dir)}")
+    return paths
 
-def save_report(report_content, as_of):
-    filename = f"report_{as_of}.md"
+def save_report(report_content, as_of, output_dir='.', verbose=True):
+    filename = os.path.join(output_dir, f"report_{as_of}.md")
     with open(filename, "w", encoding="utf-8") as f:
         f.write(report_content)
-    print(f"Report saved to {filename}")
+    if verbose:
+        print(f"Report saved to {filename}")
+    return filename
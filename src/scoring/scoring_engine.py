@@ -1,8 +1,42 @@
+import json
 import pandas as pd
 import numpy as np
 from datetime import date
-from src.shared.db import get_db_connection, execute_query
+from src.shared.db import get_db_connection, read_frame, execute_query
+from src.features.hedge_flow import summarize_hedge_flow
+from src.shared.tracing import traced
 
+def legacy_flow_scores(net_gamma, net_delta):
+    """
+    Sign-based flow risk and raw net delta pressure, used when no hedge-flow
+    matrix is available for the date.
+    """
+    # Negative Net Gamma => High Instability
+    flow_risk = 50
+    if net_gamma < 0:
+        flow_risk += 30 # Penalty for negative gamma
+    else:
+        flow_risk -= 20 # Reward for positive gamma
+    
+    # Simplified "Pressure Direction" from the sign of dealer net delta
+    pressure_direction = "NEUTRAL"
+    if net_delta < -1000: 
+        pressure_direction = "DOWN" # Dealers short delta -> want market down? (Simplication)
+    elif net_delta > 1000:
+        pressure_direction = "UP"
+    
+    return flow_risk, pressure_direction
+
+def options_gamma_adjustment(net_gamma):
+    """
+    Instability adjustment from futures options dealer gamma (Black-76 GEX).
+    Short gamma dealers amplify moves; long gamma dealers dampen them.
+    """
+    if net_gamma is None or pd.isna(net_gamma):
+        return 0
+    return 10 if net_gamma < 0 else -5
+
+@traced('scoring')
 def compute_asset_scores(as_of: date):
     """
     Computes Instability Index and Regimes for all assets on a given date.
@@ -16,8 +50,33 @@ def compute_asset_scores(as_of: date):
     WHERE as_of = %s
     """
     
+    # Dealer hedge-flow matrices (optional, from compute_spx_features)
+    query_flows = """
+    SELECT underlying, spot_shocks, vol_shifts, hedge_notional FROM features_hedge_flow
+    WHERE as_of = %s
+    """
+    
+    # Futures options dealer gamma (optional; only the GOLD and AUDUSD scores use it)
+    query_fut_opts = """
+    SELECT underlying, net_gamma FROM features_futures_options
+    WHERE as_of = %s
+    """
+    
     with get_db_connection() as conn:
-        df_equity = pd.read_sql(query, conn, params=(as_of,))
+        df_equity = read_frame(query, (as_of,), conn)
+        df_flows = read_frame(query_flows, (as_of,), conn)
+        df_fut_opts = read_frame(query_fut_opts, (as_of,), conn)
+    
+    futures_gamma = dict(zip(df_fut_opts['underlying'], df_fut_opts['net_gamma']))
+    
+    hedge_flows = {}
+    for _, flow_row in df_flows.iterrows():
+        # Use the unshifted-vol row of the scenario matrix
+        shifts = np.asarray(flow_row['vol_shifts'], dtype=float)
+        notional = np.asarray(flow_row['hedge_notional'], dtype=float)
+        hedge_flows[flow_row['underlying']] = summarize_hedge_flow(
+            flow_row['spot_shocks'], notional[np.argmin(np.abs(shifts))]
+        )
 
     if df_equity.empty:
         print(f"No feature data found for {as_of}")
@@ -25,54 +84,33 @@ def compute_asset_scores(as_of: date):
 
     # 2. Compute Scores for SPX
     # We iterate, but currently it's likely just one row per asset
+    df_equity = df_equity.fillna({'net_gamma': 0, 'gamma_slope': 0, 'net_delta': 0})
     for _, row in df_equity.iterrows():
         symbol = row['underlying']
-        net_gamma = row['net_gamma'] or 0
-        gamma_slope = row['gamma_slope'] or 0
-        net_delta = row['net_delta'] or 0
-        
-        # --- SCORING LOGIC (Heuristic v1) ---
+        net_gamma = row['net_gamma']
+        gamma_slope = row['gamma_slope']
+        net_delta = row['net_delta']
         
-        # Component 1: Flow Risk (Gamma)
-        # Negative Net Gamma => High Instability
-        # Normalize: Assume -5B to +5B is the typical range for Net Gamma $ Notional
-        # (Our mock data might be small, so we scale relative to values seen)
+        # --- SCORING LOGIC ---
         
-        # For this mock/MVP, let's normalize arbitrarily:
-        # If Net Gamma is negative, add to instability.
+        # Component 1: Flow Risk + Component 3: Directional Pressure
         # Score 0-100 where 100 is max instability.
+        flow = hedge_flows.get(symbol)
+        meta = {}
         
-        # Term: Gamma Risk
-        # If net_gamma < 0: High risk. 
-        # Let's map -1e9 (1B) to Score 80?
-        # For mock data, values are small. Let's just use sign for now.
-        
-        flow_risk = 50
-        if net_gamma < 0:
-            flow_risk += 30 # Penalty for negative gamma
+        if flow is not None:
+            # Flow-based scoring: dealer re-hedge notional under +/-1%..5% shocks.
+            # Chasing flows (buying rallies / selling dips) push flow_risk above 50
+            # and set the pressure direction to the dominant chase side.
+            flow_risk = flow['flow_risk']
+            pressure_direction = flow['pressure_direction']
+            meta['hedge_chase_per_pct'] = flow['chase_per_pct']
         else:
-            flow_risk -= 20 # Reward for positive gamma
+            flow_risk, pressure_direction = legacy_flow_scores(net_gamma, net_delta)
             
         # Component 2: Vol/Sensitivity Risk (Gamma Slope)
         # High absolute slope means dealer hedging changes fast -> Instability
         vol_risk = min(abs(gamma_slope) * 100, 100) # Cap at 100
-        
-        # Component 3: Directional Pressure
-        # If Net Delta is Negative (Dealers Short), they must BUY as market goes UP (Stabilizing?)
-        # Wait. Dealer Short Call (-Delta). Market UP -> Delta becomes MORE Short (-0.5 -> -0.7). 
-        # Dealer must SELL to hedge?
-        # Dealer Short Put (+Delta). Market UP -> Delta becomes LESS Long (+0.5 -> +0.2). 
-        # Dealer must SELL to hedge?
-        
-        # Let's stick to simplified "Pressure Direction":
-        # If Dealers are Short Delta (Total Delta < 0), they benefit from down moves?
-        # Pressure is usually defined by where the hedging flows push.
-        
-        pressure_direction = "NEUTRAL"
-        if net_delta < -1000: 
-            pressure_direction = "DOWN" # Dealers short delta -> want market down? (Simplication)
-        elif net_delta > 1000:
-            pressure_direction = "UP"
             
         # --- UNIFIED INSTABILITY INDEX ---
         # Weighted average of risks
@@ -91,14 +129,16 @@ def compute_asset_scores(as_of: date):
         # 3. Upsert into asset_scores
         sql = """
         INSERT INTO asset_scores 
-        (as_of, asset_type, symbol, instability_index, regime, pressure_direction, flow_risk, vol_risk, global_flow_score)
-        VALUES (%(as_of)s, %(asset_type)s, %(symbol)s, %(instability)s, %(regime)s, %(pressure)s, %(flow_risk)s, %(vol_risk)s, %(global_score)s)
+        (as_of, asset_type, symbol, instability_index, regime, pressure_direction, flow_risk, vol_risk, global_flow_score, meta)
+        VALUES (%(as_of)s, %(asset_type)s, %(symbol)s, %(instability)s, %(regime)s, %(pressure)s, %(flow_risk)s, %(vol_risk)s, %(global_score)s, %(meta)s)
         ON CONFLICT (as_of, symbol) DO UPDATE SET
         instability_index = EXCLUDED.instability_index,
         regime = EXCLUDED.regime,
         pressure_direction = EXCLUDED.pressure_direction,
         flow_risk = EXCLUDED.flow_risk,
-        global_flow_score = EXCLUDED.global_flow_score;
+        vol_risk = EXCLUDED.vol_risk,
+        global_flow_score = EXCLUDED.global_flow_score,
+        meta = EXCLUDED.meta;
         """
         
         params = {
@@ -110,7 +150,8 @@ def compute_asset_scores(as_of: date):
             'pressure': pressure_direction,
             'flow_risk': flow_risk / 100.0, # Normalize 0-1
             'vol_risk': vol_risk / 100.0,
-            'global_score': instability_index # For now equal
+            'global_score': instability_index, # For now equal
+            'meta': json.dumps(meta)
         }
         
         execute_query(sql, params)
@@ -121,13 +162,13 @@ def compute_asset_scores(as_of: date):
     WHERE as_of = %s AND underlying = 'GOLD'
     """
     with get_db_connection() as conn:
-        df_gold = pd.read_sql(query_gold, conn, params=(as_of,))
+        df_gold = read_frame(query_gold, (as_of,), conn)
         
     if not df_gold.empty:
-        row = df_gold.iloc[0]
+        row = df_gold.fillna({'backwardation_pct': 0, 'spec_net_position': 0}).iloc[0]
         symbol = 'GOLD'
-        back_pct = float(row['backwardation_pct'] or 0)
-        spec_net = float(row['spec_net_position'] or 0)
+        back_pct = row['backwardation_pct']
+        spec_net = row['spec_net_position']
         
         # Logic:
         # 1. Structure Risk: High backwardation is bullish but "stressful" (shortage).
@@ -153,6 +194,9 @@ def compute_asset_scores(as_of: date):
         elif spec_net < 50000:
             instability += 10 # Speculators fled?
             
+        # Options Dealer Gamma (OG options on GC futures)
+        instability += options_gamma_adjustment(futures_gamma.get(symbol))
+            
         instability = max(0, min(100, instability))
         
         regime = "FRAGILE"
@@ -191,16 +235,15 @@ def compute_asset_scores(as_of: date):
     WHERE as_of = %s AND pair = 'AUDUSD'
     """
     with get_db_connection() as conn:
-        df_fx = pd.read_sql(query_fx, conn, params=(as_of,))
+        df_fx = read_frame(query_fx, (as_of,), conn)
         
     if not df_fx.empty:
-        import json
-        row = df_fx.iloc[0]
+        row = df_fx.fillna({'carry_attractiveness': 0, 'fx_vol_level': 0, 'cot_net_position': 0}).iloc[0]
         symbol = 'AUDUSD'
         
-        carry = float(row['carry_attractiveness'] or 0)
-        vol = float(row['fx_vol_level'] or 0)
-        net_spec = float(row['cot_net_position'] or 0)
+        carry = row['carry_attractiveness']
+        vol = row['fx_vol_level']
+        net_spec = row['cot_net_position']
         
         # Extract pct_oi from feature_vector if available
         pct_oi = 0.0
@@ -234,6 +277,9 @@ def compute_asset_scores(as_of: date):
         
         # Weighted Avg
         instability = (0.5 * vol_score) + (0.25 * carry_score) + (0.25 * pos_score)
+        
+        # Options Dealer Gamma (ADU options on 6A futures)
+        instability += options_gamma_adjustment(futures_gamma.get(symbol))
         instability = max(0, min(100, instability))
         
         # 2. Regime
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from src.shared.files import write_json_atomic
+
+# Where run_benchmarks.py keeps one JSON file per run
+BENCHMARK_RESULTS_DIR = os.getenv(
+    'BENCHMARK_RESULTS_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'benchmarks'))
+)
+# A case counts as regressed when its median slows by more than this fraction
+REGRESSION_THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', '0.2'))
+
+
+def time_case(fn: Callable, repeat: int = 5, warmup: int = 1, setup: Callable = None) -> list:
+    """
+    Wall-clock seconds for `repeat` calls of fn(). `setup()` runs untimed
+    before every call (e.g. to delete what the previous call inserted).
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(name: str, timings: list, items: Optional[int] = None, unit: str = 'rows') -> dict:
+    median = statistics.median(timings)
+    result = {
+        'name': name,
+        'repeat': len(timings),
+        'min_s': min(timings),
+        'median_s': median,
+        'mean_s': statistics.fmean(timings),
+        'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+    if items:
+        result['items'] = items
+        result['unit'] = unit
+        result['per_s'] = items / median if median > 0 else None
+    return result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    import numpy
+    import pandas
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+    }
+
+
+def save_results(results: list, config: dict, results_dir: str = None) -> str:
+    results_dir = results_dir or BENCHMARK_RESULTS_DIR
+    os.makedirs(results_dir, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    payload = {
+        'timestamp': now.isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'environment': environment(),
+        'config': config,
+        'results': results,
+    }
+    path = os.path.join(results_dir, f"bench_{now.strftime('%Y%m%dT%H%M%S')}.json")
+    return write_json_atomic(path, payload, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest_results(results_dir: str = None, exclude: str = None) -> Optional[str]:
+    results_dir = results_dir or BENCHMARK_RESULTS_DIR
+    if not os.path.isdir(results_dir):
+        return None
+    runs = sorted(
+        os.path.join(results_dir, name) for name in os.listdir(results_dir)
+        if name.startswith('bench_') and name.endswith('.json')
+    )
+    runs = [p for p in runs if exclude is None or os.path.abspath(p) != os.path.abspath(exclude)]
+    return runs[-1] if runs else None
+
+
+def compare_results(current: list, baseline: list, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Median-to-median change for every case present in both runs:
+    [{'name', 'baseline_s', 'current_s', 'change', 'regressed'}].
+    """
+    previous = {r['name']: r for r in baseline}
+    rows = []
+    for r in current:
+        if r['name'] not in previous:
+            continue
+        base = previous[r['name']]['median_s']
+        change = (r['median_s'] - base) / base if base > 0 else 0.0
+        rows.append({
+            'name': r['name'],
+            'baseline_s': base,
+            'current_s': r['median_s'],
+            'change': change,
+            'regressed': change > threshold,
+        })
+    return rows
+
+
+def format_results(results: list) -> str:
+    lines = [f"{'Case':<28}{'Median ms':>11}{'Min ms':>10}{'Stdev ms':>10}{'Throughput':>24}"]
+    for r in results:
+        throughput = f"{r['per_s']:,.0f} {r['unit']}/s" if r.get('per_s') else ''
+        lines.append(
+            f"{r['name']:<28}{r['median_s'] * 1e3:>11.2f}{r['min_s'] * 1e3:>10.2f}"
+            f"{r['stdev_s'] * 1e3:>10.2f}{throughput:>24}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list) -> str:
+    lines = [f"{'Case':<28}{'Before ms':>11}{'After ms':>10}{'Change':>9}"]
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        lines.append(
+            f"{row['name']:<28}{row['baseline_s'] * 1e3:>11.2f}{row['current_s'] * 1e3:>10.2f}"
+            f"{row['change']:>+9.1%}{flag}"
+        )
+    return "\n".join(lines)
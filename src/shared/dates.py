@@ -0,0 +1,10 @@
+import numpy as np
+from datetime import date
+
+
+def business_days(start: date, end: date) -> list:
+    """
+    Weekdays in [start, end] as dates (no holiday calendar).
+    """
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    return days[np.is_busday(days)].astype(object).tolist()
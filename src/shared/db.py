@@ -1,12 +1,48 @@
 import os
+import threading
+import numpy as np
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from dotenv import load_dotenv
+from src.shared.tracing import span
+from src.shared.query_stats import QueryStatsConnection
+from src.shared.metrics import DB_CONNECTIONS_IN_USE, DB_CONNECT_SECONDS, ROWS_WRITTEN
+from src.shared.memory import chunk_rows
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Decode NUMERIC (and NUMERIC[]) straight to float instead of Decimal
+NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, 'NUMERIC_AS_FLOAT',
+    lambda value, cur: float(value) if value is not None else None
+)
+NUMERIC_ARRAY_AS_FLOAT = psycopg2.extensions.new_array_type((1231,), 'NUMERIC_ARRAY_AS_FLOAT', NUMERIC_AS_FLOAT)
+
+# Let NumPy scalars (e.g. np.float64 from float64 frames) be passed as query
+# params; NumPy 2 reprs them as "np.float64(...)", which is not valid SQL
+psycopg2.extensions.register_adapter(np.float64, lambda v: psycopg2.extensions.Float(float(v)))
+psycopg2.extensions.register_adapter(np.float32, lambda v: psycopg2.extensions.Float(float(v)))
+psycopg2.extensions.register_adapter(np.int64, lambda v: psycopg2.extensions.AsIs(int(v)))
+psycopg2.extensions.register_adapter(np.int32, lambda v: psycopg2.extensions.AsIs(int(v)))
+psycopg2.extensions.register_adapter(np.bool_, lambda v: psycopg2.extensions.AsIs(bool(v)))
+
+# Column type OIDs returned as float64 even when empty / all NULL (float4, float8, numeric)
+FLOAT_TYPE_OIDS = (700, 701, 1700)
+
+# Rows serialised per COPY chunk in copy_frame (bounds the CSV buffer)
+COPY_CHUNK_ROWS = 250_000
+
+# With connection reuse on (backfill workers), get_db_connection hands out one
+# long-lived connection per process instead of connecting per call; a nested
+# or concurrent caller gets a fresh connection as before
+_reuse_enabled = False
+_pooled = None
+_pooled_busy = False
+_pooled_lock = threading.Lock()
+
 def get_connection_string():
     """
     Retrieves the database connection string from environment variables.
@@ -25,17 +61,79 @@ def get_connection_string():
     
     return f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
 
+def enable_connection_reuse():
+    global _reuse_enabled
+    _reuse_enabled = True
+
+
+def disable_connection_reuse():
+    """
+    Turns reuse off and closes the pooled connection.
+    """
+    global _reuse_enabled, _pooled
+    _reuse_enabled = False
+    with _pooled_lock:
+        conn, _pooled = _pooled, None
+    if conn is not None and not conn.closed:
+        conn.close()
+
+
+def connection_reuse_enabled() -> bool:
+    return _reuse_enabled
+
+
+def _connect():
+    # Cursors report to src.shared.query_stats when it is enabled
+    with DB_CONNECT_SECONDS.time(layer='psycopg2'):
+        return psycopg2.connect(get_connection_string(), connection_factory=QueryStatsConnection)
+
+
+@contextmanager
+def _pooled_connection():
+    global _pooled, _pooled_busy
+    try:
+        if _pooled is None or _pooled.closed:
+            _pooled = _connect()
+        with DB_CONNECTIONS_IN_USE.track(layer='psycopg2'):
+            yield _pooled
+    except psycopg2.Error as e:
+        print(f"Error connecting to database: {e}")
+        raise
+    finally:
+        try:
+            # Leave nothing uncommitted behind, as closing a connection would
+            if _pooled is not None and not _pooled.closed and _pooled.status != psycopg2.extensions.STATUS_READY:
+                _pooled.rollback()
+        except psycopg2.Error as e:
+            # A connection that cannot roll back is not handed out again
+            print(f"Dropping pooled connection: {e}")
+            conn, _pooled = _pooled, None
+            conn.close()
+        finally:
+            with _pooled_lock:
+                _pooled_busy = False
+
+
 @contextmanager
 def get_db_connection():
     """
     Context manager for database connections.
     Yields a connection object.
     """
-    conn_string = get_connection_string()
+    global _pooled_busy
+    if _reuse_enabled:
+        with _pooled_lock:
+            reuse, _pooled_busy = not _pooled_busy, True
+        if reuse:
+            with _pooled_connection() as conn:
+                yield conn
+            return
+
     conn = None
     try:
-        conn = psycopg2.connect(conn_string)
-        yield conn
+        conn = _connect()
+        with DB_CONNECTIONS_IN_USE.track(layer='psycopg2'):
+            yield conn
     except psycopg2.Error as e:
         print(f"Error connecting to database: {e}")
         raise
@@ -48,18 +146,88 @@ def execute_query(query, params=None, fetch=False):
     Executes a single query.
     If fetch is True, returns the result as a list of dictionaries.
     """
-    with get_db_connection() as conn:
+    with span('execute_query', 'db') as s, get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             try:
                 cur.execute(query, params)
                 if fetch:
-                    return cur.fetchall()
+                    rows = cur.fetchall()
+                    s.add(rows_in=len(rows))
+                    return rows
+                s.add(rows_out=max(cur.rowcount, 0))
                 conn.commit()
             except psycopg2.Error as e:
                 conn.rollback()
                 print(f"Error executing query: {e}")
                 raise
 
+def read_frame(query, params=None, conn=None):
+    """
+    Runs a SELECT and returns a DataFrame with NumPy dtypes.
+
+    NUMERIC columns are decoded to float by the driver (no Decimal objects)
+    and every float / NUMERIC column comes back as float64 (NULL -> NaN, also
+    for empty results), so callers can use fillna / .values directly. Pass `conn` to reuse an open connection.
+    """
+    # pandas is imported here so commands that never build frames skip it
+    import pandas as pd
+
+    if conn is None:
+        with get_db_connection() as conn:
+            return read_frame(query, params, conn)
+
+    with span('read_frame', 'db') as s, conn.cursor() as cur:
+        psycopg2.extensions.register_type(NUMERIC_AS_FLOAT, cur)
+        psycopg2.extensions.register_type(NUMERIC_ARRAY_AS_FLOAT, cur)
+        cur.execute(query, params)
+        columns = [col.name for col in cur.description]
+        float_columns = [col.name for col in cur.description if col.type_code in FLOAT_TYPE_OIDS]
+        rows = cur.fetchall()
+
+        df = pd.DataFrame.from_records(rows, columns=columns).astype({c: 'float64' for c in float_columns})
+        s.add(rows_in=len(df), bytes_in=int(df.memory_usage(index=False).sum()))
+    return df
+
+def copy_frame(df, table, conn=None, columns=None):
+    """
+    Bulk-loads a DataFrame with COPY ... FROM STDIN, orders of magnitude
+    faster than row-by-row INSERTs. The frame is serialised to CSV by
+    pyarrow in chunks of up to COPY_CHUNK_ROWS rows (fewer under a memory
+    budget); NaN / None become NULL. `columns` defaults to the frame's
+    columns. Commits unless an open `conn` is passed (the caller owns the
+    transaction). Returns the number of rows loaded.
+    """
+    import io
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    if conn is None:
+        with get_db_connection() as conn:
+            count = copy_frame(df, table, conn, columns)
+            conn.commit()
+            return count
+
+    columns = list(columns or df.columns)
+    if df.empty:
+        return 0
+
+    frame = df[columns]
+    # Arrow table + CSV text of a chunk, roughly 3x its in-memory size
+    rows = chunk_rows(COPY_CHUNK_ROWS, lambda: 3 * frame.memory_usage(index=False, deep=True).sum() / len(frame), f'copy {table}')
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    with span(f'copy {table}', 'db', rows_out=len(df)) as s, conn.cursor() as cur:
+        for start in range(0, len(frame), rows):
+            sink = pa.BufferOutputStream()
+            pa_csv.write_csv(
+                pa.Table.from_pandas(frame.iloc[start:start + rows], preserve_index=False), sink,
+                pa_csv.WriteOptions(include_header=False)
+            )
+            payload = sink.getvalue().to_pybytes()
+            s.add(bytes_out=len(payload))
+            cur.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)", io.BytesIO(payload))
+    ROWS_WRITTEN.inc(len(df), table=table)
+    return len(df)
+
 def init_db(schema_path='src/shared/schema.sql'):
     """
     Initializes the database by applying the schema.sql file.
@@ -0,0 +1,14 @@
+import os
+import json
+
+
+def write_json_atomic(path: str, payload, indent: int = None) -> str:
+    """
+    Writes `payload` as JSON through a temporary file renamed over `path`,
+    so readers never see a half-written report.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=indent, default=str)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,166 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import date
+from typing import Optional, Sequence
+from dotenv import load_dotenv
+from src.shared.db import read_frame
+
+load_dotenv()
+
+# Columnar landing zone for raw market data:
+#   {LANDING_ROOT}/{source}/as_of=YYYY-MM-DD/{key}.parquet
+# Sources: options (chains), futures (daily bars), cot (reports), aemo (intervals).
+LANDING_ROOT = os.getenv(
+    'LANDING_ROOT',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'landing'))
+)
+
+# Where raw data lives: 'postgres' (row tables), 'parquet' (landing zone only,
+# Postgres keeps features / scores) or 'both' while migrating.
+RAW_STORE = os.getenv('RAW_STORE', 'postgres').lower()
+
+COMPRESSION = 'zstd'
+# Rows per row group; small enough that strike / expiry stats prune usefully
+ROW_GROUP_SIZE = 64 * 1024
+
+# Columns the option feature modules project from raw chains
+OPTION_COLUMNS = (
+    'type', 'strike', 'expiry', 'open_interest',
+    'gamma', 'delta', 'underlying_price', 'implied_volatility',
+)
+
+PARTITIONING = ds.partitioning(pa.schema([('as_of', pa.date32())]), flavor='hive')
+
+
+def landing_enabled() -> bool:
+    return RAW_STORE in ('parquet', 'both')
+
+
+def postgres_enabled() -> bool:
+    return RAW_STORE in ('postgres', 'both')
+
+
+def partition_path(source: str, as_of: date, key: str, root: str = None) -> str:
+    return os.path.join(root or LANDING_ROOT, source, f"as_of={as_of:%Y-%m-%d}", f"{key}.parquet")
+
+
+def write_landing(df: pd.DataFrame, source: str, key: str, sort_by: Sequence[str] = (), root: str = None) -> list:
+    """
+    Writes one Parquet file per as_of day for `source` / `key` (e.g.
+    options / SPX), replacing that day's file so re-ingestion is idempotent.
+
+    as_of lives in the directory name (hive partitioning), not in the file.
+    Rows are sorted by `sort_by` first so row-group min/max statistics on
+    those columns can prune reads. Returns the paths written.
+    """
+    if df.empty:
+        print(f"Skipping landing write for {source}/{key}: DataFrame is empty.")
+        return []
+
+    paths = []
+    days = pd.to_datetime(df['as_of']).dt.date
+    for as_of, day in df.groupby(days.values, sort=True):
+        day = day.drop(columns=['as_of'])
+        if sort_by:
+            day = day.sort_values(list(sort_by), kind='stable')
+
+        path = partition_path(source, as_of, key, root)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        pq.write_table(
+            pa.Table.from_pandas(day, preserve_index=False), tmp,
+            compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE, write_statistics=True,
+        )
+        os.replace(tmp, path)
+        paths.append(path)
+
+    print(f"Landed {len(df)} {source}/{key} rows in {len(paths)} partition(s).")
+    return paths
+
+
+def read_landing(
+    source: str,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    filters: Optional[dict] = None,
+    root: str = None,
+    key: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Reads `source` from the landing zone as one DataFrame.
+
+    Only the requested columns are decoded. The as_of range prunes whole
+    directories, and `filters` ({column: value or list of values}) are pushed
+    down to skip row groups by their statistics. as_of is always returned.
+
+    A single day (start == end) opens only that day's directory, or just the
+    `key` file in it, instead of discovering every file under `source`.
+    """
+    path = os.path.join(root or LANDING_ROOT, source)
+    empty = pd.DataFrame(columns=['as_of'] + list(columns or []))
+    if not os.path.isdir(path):
+        return empty
+
+    if start is not None and start == end:
+        if key is not None:
+            files = [partition_path(source, start, key, root)]
+        else:
+            day = os.path.dirname(partition_path(source, start, '', root))
+            names = sorted(os.listdir(day)) if os.path.isdir(day) else []
+            files = [os.path.join(day, name) for name in names if name.endswith('.parquet')]
+        files = [f for f in files if os.path.exists(f)]
+        if not files:
+            return empty
+        # The base dir lets the file paths still yield as_of
+        dataset = ds.dataset(files, format='parquet', partitioning=PARTITIONING, partition_base_dir=path)
+    else:
+        dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+
+    expr = None
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field('as_of') >= pa.scalar(start, pa.date32()))
+    if end is not None:
+        conditions.append(ds.field('as_of') <= pa.scalar(end, pa.date32()))
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set, np.ndarray)):
+            conditions.append(ds.field(column).isin(list(value)))
+        else:
+            conditions.append(ds.field(column) == value)
+    for condition in conditions:
+        expr = condition if expr is None else expr & condition
+
+    projection = None
+    if columns is not None:
+        projection = ['as_of'] + [c for c in columns if c != 'as_of']
+
+    table = dataset.to_table(columns=projection, filter=expr)
+    return table.to_pandas(date_as_object=True)
+
+
+def read_option_chain(as_of: date, underlying: str, columns: Sequence[str] = OPTION_COLUMNS, root: str = None) -> pd.DataFrame:
+    """
+    One day's chain for `underlying` from the landing zone.
+    """
+    return read_landing('options', columns, start=as_of, end=as_of, root=root, key=underlying)
+
+
+def read_raw_options(as_of: date, underlying: str, columns: Sequence[str] = OPTION_COLUMNS) -> pd.DataFrame:
+    """
+    One day's raw chain from whichever store RAW_STORE points at. The
+    Postgres projection is served by the covering raw_options index.
+    """
+    if landing_enabled():
+        return read_option_chain(as_of, underlying, columns).drop(columns=['as_of'])
+
+    query = f"""
+    SELECT {', '.join(columns)}
+    FROM raw_options
+    WHERE as_of = %s AND underlying = %s
+    """
+    return read_frame(query, (as_of, underlying))
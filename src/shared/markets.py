@@ -0,0 +1,24 @@
+# Options markets handled by the pipeline. Kept free of connector imports so
+# features / scoring can read contract specs without loading databento.
+
+# Index options (features_equity).
+# parent: Databento options parent symbol, multiplier: contract multiplier,
+# futures: True for options on futures (priced with Black-76).
+INDEX_OPTIONS = {
+    'SPX': {'parent': 'SPX', 'dataset': 'OPRA.PILLAR', 'multiplier': 100, 'futures': False},
+    'NDX': {'parent': 'NDX', 'dataset': 'OPRA.PILLAR', 'multiplier': 100, 'futures': False},
+    'RUT': {'parent': 'RUT', 'dataset': 'OPRA.PILLAR', 'multiplier': 100, 'futures': False},
+    'ES':  {'parent': 'ES',  'dataset': 'GLBX.MDP3',   'multiplier': 50,  'futures': True},
+}
+
+# Default spot levels used for Greeks when none is supplied
+DEFAULT_SPOTS = {'SPX': 6000.0, 'NDX': 21000.0, 'RUT': 2300.0, 'ES': 6000.0}
+
+# CME futures options on GLBX.MDP3 (features_futures_options)
+# parent: Databento options parent symbol, future: front-month continuous contract,
+# multiplier: contract size (GEX = Gamma * OI * multiplier * F)
+FUTURES_OPTIONS = {
+    'GOLD':   {'parent': 'OG',  'future': 'GC.n.0', 'multiplier': 100},     # 100 troy oz
+    'WTI':    {'parent': 'LO',  'future': 'CL.n.0', 'multiplier': 1000},    # 1,000 bbl
+    'AUDUSD': {'parent': 'ADU', 'future': '6A.n.0', 'multiplier': 100000},  # AUD 100,000
+}
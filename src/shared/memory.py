@@ -0,0 +1,376 @@
+import os
+import time
+import threading
+import functools
+import tracemalloc
+import datetime
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional, Union
+from src.shared.files import write_json_atomic
+from src.shared.tracing import (
+    rss_bytes, enable_tracing, add_span_hook, remove_span_hook, current_span,
+)
+
+# Memory profiling and a memory budget for large ingestion / feature runs.
+#
+# Profiling (`python -m src --profile-memory ...`, MEMORY_PROFILE=1 or
+# enable_memory_profiling()) follows the tracing spans of the categories in
+# MEMORY_CATEGORIES: a sampler thread records each span's RSS peak and
+# tracemalloc peak, and snapshots the top allocating call sites whenever a
+# span's traced memory grows past its last snapshot.
+#
+# The budget (MEMORY_BUDGET_MB, else MEMORY_BUDGET_FRACTION of the cgroup
+# limit) makes chunked loops shrink their chunks instead of running out:
+#
+#   rows = chunk_rows(CHUNK_SIZE, row_bytes=8 * n_scenarios * 8, name='hedge_flow')
+MEMORY_PROFILE = os.getenv('MEMORY_PROFILE', '').lower() in ('1', 'true', 'yes')
+MEMORY_BUDGET_MB = float(os.getenv('MEMORY_BUDGET_MB', '0'))
+# Budget as a share of the container limit when MEMORY_BUDGET_MB is not set
+MEMORY_BUDGET_FRACTION = float(os.getenv('MEMORY_BUDGET_FRACTION', '0.8'))
+# Share of the remaining budget one chunk's working set may take
+CHUNK_HEADROOM_SHARE = 0.5
+MIN_CHUNK_ROWS = 256
+
+# Frames kept per allocation: deep enough to get from pandas / NumPy
+# internals back to project code; each extra frame slows allocation-heavy code
+TRACEMALLOC_FRAMES = int(os.getenv('TRACEMALLOC_FRAMES', '12'))
+SAMPLE_INTERVAL_S = float(os.getenv('MEMORY_SAMPLE_INTERVAL', '0.02'))
+# Spans that get their own memory record ('db' spans are too many to snapshot)
+MEMORY_CATEGORIES = ('stage', 'ingest', 'connector', 'features', 'scoring', 'report')
+# New snapshot once a span's traced memory is this much above its last one
+SNAPSHOT_GROWTH = 1.25
+SNAPSHOT_MIN_BYTES = 1 << 20
+SNAPSHOT_MIN_INTERVAL_S = 0.5
+TOP_SITES = 10
+IMPORTS_SITE = '(module imports)'
+# Blocks below this size are totalled instead of grouped by call site
+SITE_MIN_BYTES = 1024
+SMALL_BLOCKS_SITE = f'(blocks < {SITE_MIN_BYTES} B)'
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+CGROUP_LIMIT_FILES = ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes')
+
+# Private, but returns raw (domain, size, frames, ...) tuples without building
+# a Trace object per block; same layout on CPython 3.10 - 3.13. Without it
+# top_call_sites falls back to the public tracemalloc.take_snapshot().
+_get_traces = getattr(tracemalloc, '_get_traces', None)
+
+_lock = threading.Lock()
+_open = {}
+_finished = []
+_stop = threading.Event()
+_sampler = None
+_process_peak = {'rss': 0, 'traced': 0}
+_budget_override = None
+_shrunk = set()
+_last_snapshot = [0.0]
+
+
+@dataclass
+class StageMemory:
+    name: str
+    category: str
+    span_id: int
+    rss_start: int
+    traced_start: int
+    rss_peak: int = 0
+    traced_peak: int = 0
+    traced_end: int = 0
+    snapshot_level: int = 0
+    top_sites: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# --- Budget -----------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def cgroup_memory_limit() -> Optional[int]:
+    """
+    The container's memory limit in bytes (cgroup v2 or v1), None when unlimited.
+    """
+    for path in CGROUP_LIMIT_FILES:
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value == 'max':
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            return None
+        # v1 reports "unlimited" as a huge page-aligned number
+        return limit if limit < 1 << 60 else None
+    return None
+
+
+def set_memory_budget(mb: Optional[float]):
+    """
+    Overrides the configured budget (0 = no budget, None = back to the config).
+    """
+    global _budget_override
+    _budget_override = None if mb is None else int(mb * 2 ** 20)
+
+
+def memory_budget() -> Optional[int]:
+    """
+    Budget in bytes, or None when no budget applies.
+    """
+    if _budget_override is not None:
+        return _budget_override or None
+    if MEMORY_BUDGET_MB > 0:
+        return int(MEMORY_BUDGET_MB * 2 ** 20)
+    limit = cgroup_memory_limit()
+    return int(limit * MEMORY_BUDGET_FRACTION) if limit else None
+
+
+def chunk_rows(default: int, row_bytes: Union[float, Callable[[], float]], name: str = 'chunk') -> int:
+    """
+    Rows per chunk: `default`, shrunk so one chunk's working set
+    (`row_bytes` per row, or a callable estimating it) fits in
+    CHUNK_HEADROOM_SHARE of what is left of the budget. Never below MIN_CHUNK_ROWS.
+    """
+    budget = memory_budget()
+    if budget is None or default <= MIN_CHUNK_ROWS:
+        return default
+    per_row = row_bytes() if callable(row_bytes) else row_bytes
+    headroom = max(budget - rss_bytes(), 0) * CHUNK_HEADROOM_SHARE
+    rows = max(MIN_CHUNK_ROWS, int(headroom // max(per_row, 1)))
+    if rows >= default:
+        return default
+
+    current_span().set(chunk_rows=rows)
+    if name not in _shrunk:
+        _shrunk.add(name)
+        print(f"Memory budget {budget / 2 ** 20:.0f} MB: {name} chunks shrunk from {default} to {rows} rows")
+    return rows
+
+
+# --- Profiling ---------------------------------------------------------------
+
+def project_site(frames) -> str:
+    """
+    file:line of the innermost project frame of an allocation
+    ((filename, lineno) pairs, innermost first); allocations made while
+    importing modules are grouped as one site.
+    """
+    fallback = None
+    for filename, lineno in frames:
+        if filename.startswith('<frozen importlib'):
+            return IMPORTS_SITE
+        if filename.startswith(PROJECT_ROOT) and filename != __file__:
+            return f"{os.path.relpath(filename, PROJECT_ROOT)}:{lineno}"
+        if fallback is None and not filename.startswith('<'):
+            fallback = f"{os.path.basename(filename)}:{lineno}"
+    return fallback or '<unknown>'
+
+
+def _raw_traces() -> list:
+    """
+    Live traces as (domain, size, frames, ...) tuples.
+    """
+    if _get_traces is not None:
+        return _get_traces()
+    return [(trace.domain, trace.size, trace.traceback) for trace in tracemalloc.take_snapshot().traces]
+
+
+def _frames(frames):
+    """
+    (filename, lineno) pairs, innermost first, from raw frames or a Traceback.
+    """
+    if isinstance(frames, tracemalloc.Traceback):
+        # Tracebacks list the oldest frame first
+        return [(frame.filename, frame.lineno) for frame in reversed(frames)]
+    return frames
+
+
+def top_call_sites(limit: int = TOP_SITES) -> list:
+    """
+    Live traced allocations of SITE_MIN_BYTES or more (arrays, frame
+    blocks, buffers) grouped by project call site, largest first; smaller
+    blocks are reported as one SMALL_BLOCKS_SITE total.
+    """
+    # Snapshot.statistics() takes about a minute on a pandas / SQLAlchemy
+    # process, and every object this loop creates is itself traced, so only
+    # the (few) large blocks are grouped in Python.
+    traces = _raw_traces()
+    large = [trace for trace in traces if trace[1] >= SITE_MIN_BYTES]
+    small_size = sum(trace[1] for trace in traces) - sum(trace[1] for trace in large)
+    small_count = len(traces) - len(large)
+    del traces
+
+    sites = {}
+    for trace in large:
+        totals = sites.setdefault(project_site(_frames(trace[2])), [0, 0])
+        totals[0] += trace[1]
+        totals[1] += 1
+    if small_count:
+        sites[SMALL_BLOCKS_SITE] = [small_size, small_count]
+    ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+    return [{'site': name, 'size': size, 'count': count} for name, (size, count) in ranked]
+
+
+def _sample(final: StageMemory = None):
+    """
+    Folds RSS and the tracemalloc peak since the last sample into every open
+    stage (and `final`, which is closing), snapshotting stages that grew.
+    """
+    rss = rss_bytes()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    with _lock:
+        stages = list(_open.values()) + ([final] if final else [])
+        _process_peak['rss'] = max(_process_peak['rss'], rss)
+        _process_peak['traced'] = max(_process_peak['traced'], peak)
+        grown = []
+        for st in stages:
+            st.rss_peak = max(st.rss_peak, rss)
+            st.traced_peak = max(st.traced_peak, peak)
+            if current - st.traced_start >= SNAPSHOT_MIN_BYTES and current >= st.snapshot_level * SNAPSHOT_GROWTH:
+                grown.append(st)
+    # A closing stage always gets its sites; the sampler is rate-limited
+    if grown and (any(st is final for st in grown) or time.monotonic() - _last_snapshot[0] >= SNAPSHOT_MIN_INTERVAL_S):
+        _last_snapshot[0] = time.monotonic()
+        sites = top_call_sites()
+        with _lock:
+            for st in grown:
+                st.top_sites = sites
+                st.snapshot_level = current
+    return current
+
+
+def _sampler_loop():
+    while not _stop.wait(SAMPLE_INTERVAL_S):
+        try:
+            _sample()
+        except Exception as e:
+            print(f"Memory sampler error: {e}")
+
+
+def _on_span_start(span):
+    if span.category not in MEMORY_CATEGORIES:
+        return
+    current, _ = tracemalloc.get_traced_memory()
+    st = StageMemory(span.name, span.category, span.span_id, span.rss_start, current, span.rss_start, current,
+                     snapshot_level=current)
+    with _lock:
+        _open[span.span_id] = st
+
+
+def _on_span_end(span):
+    with _lock:
+        st = _open.pop(span.span_id, None)
+    if st is None:
+        return
+    st.traced_end = _sample(final=st)
+    # Sampled peak of this span, not the process-lifetime ru_maxrss
+    span.peak_rss = max(st.rss_peak, span.rss_end)
+    span.set(traced_peak=st.traced_peak)
+    with _lock:
+        _finished.append(st)
+
+
+def enable_memory_profiling(frames: int = TRACEMALLOC_FRAMES):
+    """
+    Starts tracemalloc and the RSS sampler and records memory per span
+    (turns tracing on, since stages are spans).
+    """
+    global _sampler
+    enable_tracing()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    if _sampler is None:
+        add_span_hook(_on_span_start, _on_span_end)
+        _stop.clear()
+        _sampler = threading.Thread(target=_sampler_loop, name='memory-sampler', daemon=True)
+        _sampler.start()
+
+
+def disable_memory_profiling():
+    global _sampler
+    if _sampler is None:
+        return
+    _stop.set()
+    _sampler.join()
+    _sampler = None
+    remove_span_hook(_on_span_start, _on_span_end)
+    tracemalloc.stop()
+
+
+def memory_profiling_enabled() -> bool:
+    return _sampler is not None
+
+
+def reset_memory_stats():
+    with _lock:
+        _finished.clear()
+        _process_peak.update(rss=0, traced=0)
+
+
+def finished_stages() -> list:
+    with _lock:
+        return list(_finished)
+
+
+def memory_summary(stages: list = None) -> list:
+    """
+    Per (category, name) peaks, largest traced peak first; call sites are
+    those of the call with the largest peak.
+    """
+    stages = finished_stages() if stages is None else stages
+    table = {}
+    for st in stages:
+        row = table.get((st.category, st.name))
+        if row is None:
+            row = table[(st.category, st.name)] = {
+                'category': st.category, 'name': st.name, 'calls': 0,
+                'traced_peak': 0, 'traced_growth': 0, 'rss_peak': 0, 'rss_growth': 0, 'top_sites': [],
+            }
+        row['calls'] += 1
+        row['traced_growth'] = max(row['traced_growth'], st.traced_peak - st.traced_start)
+        row['rss_peak'] = max(row['rss_peak'], st.rss_peak)
+        row['rss_growth'] = max(row['rss_growth'], st.rss_peak - st.rss_start)
+        if st.traced_peak >= row['traced_peak']:
+            row['traced_peak'] = st.traced_peak
+            row['top_sites'] = st.top_sites or row['top_sites']
+    return sorted(table.values(), key=lambda r: r['traced_peak'], reverse=True)
+
+
+def format_memory_report(stages: list = None, top: int = 20, site_stages: int = 3, sites: int = 5) -> str:
+    mb = 2 ** 20
+    summary = memory_summary(stages)
+    budget = memory_budget()
+    lines = [
+        f"Memory: peak RSS {_process_peak['rss'] / mb:.0f} MB, peak traced {_process_peak['traced'] / mb:.0f} MB"
+        f", budget {f'{budget / mb:.0f} MB' if budget else 'none'}",
+        f"{'Stage':<40}{'Cat':<10}{'Calls':>6}{'Traced MB':>11}{'Traced +MB':>12}{'RSS MB':>9}{'RSS +MB':>9}",
+    ]
+    for r in summary[:top]:
+        lines.append(
+            f"{r['name'][:39]:<40}{r['category'][:9]:<10}{r['calls']:>6}"
+            f"{r['traced_peak'] / mb:>11.1f}{r['traced_growth'] / mb:>12.1f}{r['rss_peak'] / mb:>9.0f}{r['rss_growth'] / mb:>9.1f}"
+        )
+    for r in [r for r in summary if r['top_sites']][:site_stages]:
+        lines += ["", f"Top allocations at the peak of {r['name']}:"]
+        for site in r['top_sites'][:sites]:
+            lines.append(f"{site['size'] / mb:>10.1f} MB{site['count']:>10} blocks  {site['site']}")
+    return "\n".join(lines)
+
+
+def save_memory_report(path: str, stages: list = None) -> str:
+    budget = memory_budget()
+    payload = {
+        'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'peak_rss': _process_peak['rss'],
+        'peak_traced': _process_peak['traced'],
+        'budget': budget,
+        'stages': memory_summary(stages),
+    }
+    return write_json_atomic(path, payload, indent=2)
+
+
+if MEMORY_PROFILE:
+    enable_memory_profiling()
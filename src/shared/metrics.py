@@ -0,0 +1,247 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+
+# Prometheus metrics for the GPU worker, pipeline, ingestion and the DB layer,
+# rendered in the text exposition format (no client library needed):
+#
+#   JOB_DURATION.observe(12.5, task='regime_clustering', status='success')
+#   with JOBS_IN_FLIGHT.track(task='regime_clustering'): ...
+#
+# Long-running processes serve them with start_metrics_server() (worker,
+# watch_changes, run_pipeline --metrics-port) or the API's /metrics route.
+# Counters live in the process that records them; pool workers are not summed.
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, for waits and jobs that run from seconds to an hour
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+_registry = {}
+_registry_lock = threading.Lock()
+_process_start = time.time()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = None) -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            if name in _registry:
+                raise ValueError(f"Duplicate metric {name}")
+            _registry[name] = self
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> list:
+        """
+        [(suffix, label values, extra label, value)] for render().
+        """
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """
+        +1 while the block runs (jobs / connections in flight).
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels)) or ([0], 0.0)
+            return sum(counts)
+
+    def samples(self) -> list:
+        out = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    out.append(('_bucket', key, f'le="{_format_value(bound)}"', cumulative))
+                out.append(('_sum', key, None, total))
+                out.append(('_count', key, None, cumulative))
+        return out
+
+
+def render() -> str:
+    """
+    Every registered metric (plus process RSS / start time) in the Prometheus text format.
+    """
+    from src.shared.tracing import rss_bytes
+
+    lines = [
+        '# HELP process_resident_memory_bytes Resident memory size in bytes.',
+        '# TYPE process_resident_memory_bytes gauge',
+        f'process_resident_memory_bytes {rss_bytes()}',
+        '# HELP process_start_time_seconds Start time of the process since unix epoch in seconds.',
+        '# TYPE process_start_time_seconds gauge',
+        f'process_start_time_seconds {_format_value(round(_process_start, 3))}',
+    ]
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for suffix, key, extra, value in metric.samples():
+            lines.append(f'{metric.name}{suffix}{_format_labels(metric.labelnames, key, extra)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the worker log
+        pass
+
+
+def start_metrics_server(port: int = None, host: str = '0.0.0.0') -> Optional[ThreadingHTTPServer]:
+    """
+    Serves /metrics from a daemon thread. Port 0 / unset (METRICS_PORT)
+    means off and returns None.
+    """
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    print(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+# --- DealerFlow metrics -------------------------------------------------------
+
+QUEUE_WAIT = Histogram(
+    'dealerflow_queue_wait_seconds', "Time a job spent on the queue before a worker picked it up.",
+    ['queue', 'task'],
+)
+JOB_DURATION = Histogram(
+    'dealerflow_job_duration_seconds', "Worker job run time.", ['task', 'status'],
+)
+JOBS_IN_FLIGHT = Gauge(
+    'dealerflow_jobs_in_flight', "Jobs currently running in this worker.", ['task'],
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    'dealerflow_db_connections_in_use', "Open psycopg2 connections / checked-out SQLAlchemy pool connections.", ['layer'],
+)
+DB_CONNECT_SECONDS = Histogram(
+    'dealerflow_db_connect_seconds', "Time to open a database connection.", ['layer'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+ROWS_INGESTED = Counter(
+    'dealerflow_rows_ingested_total', "Rows stored by the ingestion entry points.", ['source', 'underlying'],
+)
+ROWS_WRITTEN = Counter(
+    'dealerflow_rows_written_total', "Rows bulk-written (COPY / to_sql) per table.", ['table'],
+)
+STAGE_DURATION = Histogram(
+    'dealerflow_pipeline_stage_seconds', "Pipeline stage run time (skipped stages excluded).", ['stage', 'status'],
+)
+STAGE_LAST_SUCCESS = Gauge(
+    'dealerflow_pipeline_stage_last_success_timestamp_seconds', "Unix time a stage last succeeded.", ['stage'],
+)
@@ -0,0 +1,163 @@
+import os
+import re
+from datetime import date
+from src.shared.db import get_db_connection
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'sql', 'migrations'))
+
+# Files are applied in version order: NNN_description.sql
+MIGRATION_PATTERN = re.compile(r'^(\d{3,})_(.+)\.sql$')
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """
+    Returns [(version, name, path)] sorted by version.
+    """
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    return sorted(migrations)
+
+def applied_versions(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        cur.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    return versions
+
+def apply_migrations(migrations_dir=MIGRATIONS_DIR, target=None):
+    """
+    Applies pending migrations in order, each in its own transaction.
+    Stops at `target` version if given. Returns the versions applied.
+    """
+    applied = []
+    with get_db_connection() as conn:
+        done = applied_versions(conn)
+        for version, name, path in list_migrations(migrations_dir):
+            if version in done or (target is not None and version > target):
+                continue
+
+            with open(path, 'r') as f:
+                sql = f.read()
+
+            print(f"Applying migration {version:03d}_{name}...")
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name)
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(version)
+
+    if not applied:
+        print("Schema is up to date.")
+    return applied
+
+# --- Partition management (monthly RANGE partitions on as_of) ---
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+def next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+def is_partitioned(conn, table: str) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT relkind FROM pg_class WHERE relname = %s", (table,))
+        row = cur.fetchone()
+    return bool(row) and row[0] == 'p'
+
+def attached_partitions(conn, table: str) -> set:
+    with conn.cursor() as cur:
+        cur.execute("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = %s
+        """, (table,))
+        return {row[0] for row in cur.fetchall()}
+
+def ensure_monthly_partitions(start: date, end: date, table: str = 'raw_options'):
+    """
+    Creates (and attaches) one partition per month in [start, end].
+
+    Rows already sitting in the DEFAULT partition for a month are moved into
+    the new partition in the same transaction, since Postgres refuses to
+    attach a range the default partition still holds. No-op when the table
+    is not partitioned (migration 001 not applied yet). Safe to call from
+    concurrent ingests: each month is created under an advisory lock on the
+    table, after re-checking that no other caller attached it meanwhile.
+    """
+    created = []
+    with get_db_connection() as conn:
+        if not is_partitioned(conn, table):
+            return created
+
+        existing = attached_partitions(conn, table)
+        month = month_start(start)
+        while month <= end:
+            name = partition_name(table, month)
+            upper = next_month(month)
+            if name not in existing:
+                with conn.cursor() as cur:
+                    # Held until the commit; another caller may have attached the month meanwhile
+                    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (table,))
+                existing = attached_partitions(conn, table)
+                if name not in existing:
+                    with conn.cursor() as cur:
+                        cur.execute(f'CREATE TABLE IF NOT EXISTS "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+                        cur.execute(f"""
+                        WITH moved AS (
+                            DELETE FROM "{table}_default" WHERE as_of >= %s AND as_of < %s RETURNING *
+                        )
+                        INSERT INTO "{name}" SELECT * FROM moved
+                        """, (month, upper))
+                        cur.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', (month, upper))
+                    created.append(name)
+                conn.commit()
+            month = upper
+
+    return created
+
+def detach_partition(month: date, table: str = 'raw_options') -> str:
+    """
+    Detaches a month for archiving; the partition stays as a standalone table
+    (dump / move it, then drop). Plain DETACH: CONCURRENTLY is not allowed
+    while the table has a DEFAULT partition.
+    """
+    name = partition_name(table, month_start(month))
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+        conn.commit()
+    print(f"Detached {name}")
+    return name
+
+def attach_partition(month: date, table: str = 'raw_options') -> str:
+    """
+    Re-attaches an archived month (e.g. restored from a dump).
+    """
+    month = month_start(month)
+    name = partition_name(table, month)
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', (month, next_month(month)))
+        conn.commit()
+    print(f"Attached {name}")
+    return name
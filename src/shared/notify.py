@@ -0,0 +1,167 @@
+import json
+import select
+import threading
+import psycopg2
+import psycopg2.extensions
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, Optional
+from src.shared.db import get_connection_string
+
+# Channel the migration 002 triggers publish on
+CHANGE_CHANNEL = 'dealerflow_changes'
+
+# Tables a rendered report reads; a change to any of them stales the report
+REPORT_TABLES = ('asset_scores', 'features_equity', 'features_commodity', 'features_fx', 'features_gamma_term')
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    table: str
+    op: str
+    as_of: Optional[date]
+    key: Optional[str]
+
+
+def parse_change(payload: str) -> ChangeEvent:
+    """
+    Decodes a NOTIFY payload from notify_dealerflow_change().
+    """
+    data = json.loads(payload)
+    as_of = data.get('as_of')
+    return ChangeEvent(
+        table=data['table'],
+        op=data['op'],
+        as_of=date.fromisoformat(as_of) if as_of else None,
+        key=data.get('key'),
+    )
+
+
+class ChangeSubscriber:
+    """
+    LISTENs on CHANGE_CHANNEL and fans score / feature change events out to
+    registered callbacks (cache eviction, report regeneration, job enqueue).
+
+    Callbacks run on the listener thread, in registration order; one that
+    raises is reported and does not stop the others. The listener reconnects
+    after connection errors; events sent while disconnected are lost, so
+    consumers should treat a reconnect as "anything may have changed"
+    (callbacks registered with on_reconnect are called then).
+    """
+
+    def __init__(self, channel: str = CHANGE_CHANNEL, conn_string: str = None, reconnect_delay: float = 5.0):
+        self.channel = channel
+        self.conn_string = conn_string
+        self.reconnect_delay = reconnect_delay
+        self._callbacks = []
+        self._reconnect_callbacks = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None], tables: Iterable[str] = None):
+        """
+        Registers `callback` for events on `tables` (all tables when None).
+        """
+        self._callbacks.append((callback, frozenset(tables) if tables is not None else None))
+        return callback
+
+    def on_reconnect(self, callback: Callable[[], None]):
+        self._reconnect_callbacks.append(callback)
+        return callback
+
+    def dispatch(self, event: ChangeEvent):
+        for callback, tables in self._callbacks:
+            if tables is not None and event.table not in tables:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in change callback {getattr(callback, '__name__', callback)}: {e}")
+
+    def connect(self):
+        conn = psycopg2.connect(self.conn_string or get_connection_string())
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+        return conn
+
+    def listen(self, poll_timeout: float = 1.0):
+        """
+        Blocks, dispatching events until stop() is called.
+        """
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                conn = self.connect()
+            except psycopg2.Error as e:
+                print(f"Change listener could not connect: {e}")
+                self._stop.wait(self.reconnect_delay)
+                continue
+
+            if connected_before:
+                for callback in self._reconnect_callbacks:
+                    callback()
+            connected_before = True
+
+            try:
+                while not self._stop.is_set():
+                    # Wake on socket activity, or every poll_timeout to check stop()
+                    if select.select([conn], [], [], poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            event = parse_change(notify.payload)
+                        except (ValueError, KeyError) as e:
+                            print(f"Ignoring malformed change payload {notify.payload!r}: {e}")
+                            continue
+                        self.dispatch(event)
+            except psycopg2.Error as e:
+                print(f"Change listener connection lost: {e}")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                conn.close()
+
+    def start(self):
+        """
+        Runs listen() on a daemon thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.listen, name='change-listener', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def debounce(callback: Callable[[list], None], delay: float = 2.0) -> Callable[[ChangeEvent], None]:
+    """
+    Wraps `callback(events)` so it runs once, with all events received, after
+    `delay` seconds without a new one. A scoring run writing a row per asset
+    then triggers one report regeneration instead of one per row.
+    """
+    lock = threading.Lock()
+    state = {'events': [], 'timer': None}
+
+    def flush():
+        with lock:
+            events, state['events'], state['timer'] = state['events'], [], None
+        if events:
+            callback(events)
+
+    def on_event(event: ChangeEvent):
+        with lock:
+            state['events'].append(event)
+            if state['timer'] is not None:
+                state['timer'].cancel()
+            state['timer'] = threading.Timer(delay, flush)
+            state['timer'].daemon = True
+            state['timer'].start()
+
+    on_event.__name__ = getattr(callback, '__name__', 'debounced')
+    return on_event
+
@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Optional
+
+
+def default_workers(n_items: int) -> int:
+    """
+    One process per item, capped at the number of CPUs.
+    """
+    return max(1, min(n_items, os.cpu_count() or 1))
+
+
+def run_in_processes(fn: Callable, items: Iterable, *args, max_workers: Optional[int] = None, **kwargs) -> dict:
+    """
+    Runs fn(item, *args, **kwargs) for every item in a process pool.
+
+    Each worker opens its own DB connections, so per-item pipelines
+    (fetch -> Greeks -> write) run fully in parallel. Returns {item: result};
+    failures are printed and stored as the raised exception instead of
+    aborting the other items.
+    """
+    items = list(items)
+    if not items:
+        return {}
+
+    workers = max_workers or default_workers(len(items))
+    results = {}
+
+    # A single item gains nothing from a pool; run inline
+    if workers == 1:
+        for item in items:
+            try:
+                results[item] = fn(item, *args, **kwargs)
+            except Exception as e:
+                print(f"{item} failed: {e}")
+                results[item] = e
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, item, *args, **kwargs): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                results[item] = future.result()
+            except Exception as e:
+                print(f"{item} failed: {e}")
+                results[item] = e
+
+    return results
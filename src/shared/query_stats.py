@@ -0,0 +1,319 @@
+import os
+import re
+import sys
+import json
+import time
+import logging
+import datetime
+import threading
+from typing import Optional
+import psycopg2
+import psycopg2.extensions
+from src.shared.files import write_json_atomic
+
+# Counts and times every statement by call site: raw psycopg2 cursors (and
+# pandas / RealDictCursor on top of them) through QueryStatsConnection, and
+# SQLAlchemy engines through cursor events. Off by default; enable with
+# QUERY_STATS=1, `python -m src --query-stats ...` or enable_query_stats().
+QUERY_STATS_ENABLED = os.getenv('QUERY_STATS', '').lower() in ('1', 'true', 'yes')
+# Statements slower than this are logged (parameters redacted)
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+# EXPLAIN (ANALYZE, BUFFERS) the N slowest statements at the end of a run (0 = off)
+EXPLAIN_TOP_N = int(os.getenv('EXPLAIN_TOP_N', '0'))
+# Same statement from the same call site this many times in one run looks like N+1
+N_PLUS_ONE_CALLS = int(os.getenv('N_PLUS_ONE_CALLS', '50'))
+
+EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Frames skipped when looking for the caller of a statement
+DB_LAYER_FILES = {
+    os.path.join(PROJECT_ROOT, 'src', 'shared', 'db.py'),
+    os.path.join(PROJECT_ROOT, 'src', 'shared', 'query_stats.py'),
+    os.path.join(PROJECT_ROOT, 'src', 'shared', 'tracing.py'),
+    os.path.join(PROJECT_ROOT, 'src', 'db.py'),
+}
+
+logger = logging.getLogger('dealerflow.sql')
+
+_lock = threading.Lock()
+_stats = {}
+_slowest = []
+_enabled = False
+_sqlalchemy_hooked = False
+
+_WHITESPACE = re.compile(r'\s+')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize(statement) -> str:
+    """
+    One-line statement with literals replaced by '?', so call sites group.
+    """
+    if isinstance(statement, bytes):
+        statement = statement.decode(errors='replace')
+    return _LITERALS.sub('?', _WHITESPACE.sub(' ', str(statement)).strip())
+
+
+def redact(params) -> Optional[str]:
+    """
+    Parameter types (and sizes) only, never values.
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return '{' + ', '.join(f"{k}: {type(v).__name__}" for k, v in params.items()) + '}'
+    if isinstance(params, (list, tuple)):
+        if params and isinstance(params[0], (list, tuple, dict)):
+            return f"[{len(params)} rows]"
+        return '(' + ', '.join(type(v).__name__ for v in params) + ')'
+    return type(params).__name__
+
+
+def call_site() -> str:
+    """
+    file:line (function) of the first project frame outside the DB layer.
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(PROJECT_ROOT) and filename not in DB_LAYER_FILES:
+            return f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        if fallback is None and filename not in DB_LAYER_FILES:
+            fallback = f"{os.path.basename(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return fallback or '<unknown>'
+
+
+def observe(statement, params, seconds: float, rows: int = -1, many: bool = False):
+    """
+    Records one executed statement. Called by the psycopg2 cursor wrapper and
+    the SQLAlchemy event hooks.
+    """
+    site = call_site()
+    sql = normalize(statement)
+    with _lock:
+        entry = _stats.setdefault((site, sql), {
+            'call_site': site, 'statement': sql, 'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'rows': 0,
+        })
+        entry['calls'] += 1
+        entry['total_s'] += seconds
+        entry['max_s'] = max(entry['max_s'], seconds)
+        entry['rows'] += max(rows, 0)
+        if EXPLAIN_TOP_N and not many:
+            _slowest.append((seconds, statement, params, site))
+            _slowest.sort(key=lambda item: item[0], reverse=True)
+            # Keep headroom so distinct statements survive duplicates of one slow query
+            del _slowest[EXPLAIN_TOP_N * 10:]
+
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            'event': 'slow_query', 'ms': round(seconds * 1000, 1), 'call_site': site,
+            'statement': sql[:2000], 'params': redact(params), 'rows': rows,
+        }))
+
+
+class QueryStatsCursorMixin:
+    """
+    Times execute / executemany / copy_expert when query stats are enabled.
+    """
+
+    def _timed(self, method, statement, params, many=False):
+        if not _enabled:
+            return method(statement, params)
+        start = time.perf_counter()
+        try:
+            return method(statement, params)
+        finally:
+            observe(statement, params, time.perf_counter() - start, self.rowcount, many)
+
+    def execute(self, query, vars=None):
+        return self._timed(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(super().executemany, query, vars_list, many=True)
+
+    def copy_expert(self, sql, file, size=8192):
+        if not _enabled:
+            return super().copy_expert(sql, file, size)
+        start = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            observe(sql, None, time.perf_counter() - start, self.rowcount, many=True)
+
+
+_cursor_classes = {}
+
+
+def instrumented_cursor(cursor_factory):
+    """
+    Subclass of `cursor_factory` (cursor, RealDictCursor, ...) with timing.
+    """
+    cls = _cursor_classes.get(cursor_factory)
+    if cls is None:
+        cls = type(f"QueryStats{cursor_factory.__name__}", (QueryStatsCursorMixin, cursor_factory), {})
+        _cursor_classes[cursor_factory] = cls
+    return cls
+
+
+class QueryStatsConnection(psycopg2.extensions.connection):
+    """
+    psycopg2 connection whose cursors (any cursor_factory) are instrumented.
+    Pass as connection_factory to psycopg2.connect.
+    """
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = instrumented_cursor(factory)
+        return super().cursor(*args, **kwargs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_stats_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info['query_stats_start'].pop()
+    # Raw psycopg2 cursors created by SQLAlchemy are not instrumented, so no double count
+    observe(statement, parameters, time.perf_counter() - start, cursor.rowcount, executemany)
+
+
+def hook_sqlalchemy():
+    """
+    Times statements from every SQLAlchemy engine (src/db.py creates a new engine per call).
+    """
+    global _sqlalchemy_hooked
+    if _sqlalchemy_hooked:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+    except ImportError:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _sqlalchemy_hooked = True
+
+
+def unhook_sqlalchemy():
+    global _sqlalchemy_hooked
+    if not _sqlalchemy_hooked:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    event.remove(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.remove(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _sqlalchemy_hooked = False
+
+
+def enable_query_stats():
+    global _enabled
+    _enabled = True
+    hook_sqlalchemy()
+
+
+def disable_query_stats():
+    global _enabled
+    _enabled = False
+    unhook_sqlalchemy()
+
+
+def query_stats_enabled() -> bool:
+    return _enabled
+
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
+        _slowest.clear()
+
+
+def query_stats() -> list:
+    """
+    Per (call site, statement) counters, most total time first.
+    """
+    with _lock:
+        rows = [dict(entry) for entry in _stats.values()]
+    for row in rows:
+        row['mean_s'] = row['total_s'] / row['calls']
+        row['n_plus_one'] = row['calls'] >= N_PLUS_ONE_CALLS
+    return sorted(rows, key=lambda r: r['total_s'], reverse=True)
+
+
+def explain_slowest(top_n: int = None, conn_string: str = None) -> list:
+    """
+    Re-runs the slowest distinct statements under EXPLAIN (ANALYZE, BUFFERS)
+    inside a transaction that is rolled back, so DML changes nothing.
+    """
+    from src.shared.db import get_connection_string
+
+    top_n = EXPLAIN_TOP_N if top_n is None else top_n
+    with _lock:
+        candidates = list(_slowest)
+    chosen, seen = [], set()
+    for seconds, statement, params, site in candidates:
+        sql = normalize(statement)
+        if sql in seen or not sql.lower().startswith(EXPLAINABLE):
+            continue
+        seen.add(sql)
+        chosen.append((seconds, statement, params, site))
+        if len(chosen) >= top_n:
+            break
+
+    plans = []
+    if not chosen:
+        return plans
+    # Plain connection: EXPLAIN runs are not counted
+    conn = psycopg2.connect(conn_string or get_connection_string())
+    try:
+        for seconds, statement, params, site in chosen:
+            if isinstance(statement, bytes):
+                statement = statement.decode()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", params)
+                    plan = "\n".join(row[0] for row in cur.fetchall())
+            except psycopg2.Error as e:
+                plan = f"EXPLAIN failed: {e}".strip()
+            finally:
+                conn.rollback()
+            plans.append({'call_site': site, 'statement': normalize(statement), 'seconds': seconds, 'plan': plan})
+    finally:
+        conn.close()
+    return plans
+
+
+def format_query_report(stats: list = None, plans: list = None, top: int = 20) -> str:
+    stats = query_stats() if stats is None else stats
+    total_calls = sum(r['calls'] for r in stats)
+    total_s = sum(r['total_s'] for r in stats)
+    lines = [
+        f"Queries: {total_calls} statements from {len({r['call_site'] for r in stats})} call sites, {total_s:.3f}s in the database",
+        f"{'Calls':>7}{'Total s':>9}{'Mean ms':>9}{'Max ms':>9}{'Rows':>9}  call site / statement",
+    ]
+    for r in stats[:top]:
+        flag = '  << N+1?' if r['n_plus_one'] else ''
+        lines.append(
+            f"{r['calls']:>7}{r['total_s']:>9.3f}{r['mean_s'] * 1e3:>9.2f}{r['max_s'] * 1e3:>9.2f}{r['rows']:>9}"
+            f"  {r['call_site']}{flag}"
+        )
+        lines.append(f"{'':>43}  {r['statement'][:100]}")
+    for p in plans or []:
+        lines += ["", f"EXPLAIN {p['call_site']} ({p['seconds'] * 1e3:.1f} ms): {p['statement'][:100]}", p['plan']]
+    return "\n".join(lines)
+
+
+def save_query_report(path: str, stats: list = None, plans: list = None) -> str:
+    payload = {
+        'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'slow_query_ms': SLOW_QUERY_MS,
+        'statements': query_stats() if stats is None else stats,
+        'explain': plans or [],
+    }
+    return write_json_atomic(path, payload, indent=2)
+
+
+if QUERY_STATS_ENABLED:
+    enable_query_stats()
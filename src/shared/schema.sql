@@ -1,5 +1,8 @@
 -- 1. Raw Data Tables
 
+-- raw_options is converted to monthly RANGE partitions (float8 columns,
+-- covering index) by sql/migrations/001_partition_raw_options.sql.
+-- New DDL goes into numbered migrations, see scripts/migrate.py.
 CREATE TABLE IF NOT EXISTS raw_options (
     id SERIAL PRIMARY KEY,
     as_of DATE NOT NULL,
@@ -101,12 +104,69 @@ CREATE TABLE IF NOT EXISTS features_equity (
     put_call_oi_ratio NUMERIC,
     net_delta NUMERIC,
     gamma_flip_level NUMERIC,
+    call_wall NUMERIC,
+    put_wall NUMERIC,
+    gex_ladder REAL[], -- 2-D: rows (strike, call_gex, put_gex, call_oi, put_oi, dealer_delta) x strikes
     feature_vector JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_features_equity_unique ON features_equity(as_of, underlying);
 
+-- Strike ladder columns (for databases created before they existed)
+ALTER TABLE features_equity ADD COLUMN IF NOT EXISTS call_wall NUMERIC;
+ALTER TABLE features_equity ADD COLUMN IF NOT EXISTS put_wall NUMERIC;
+ALTER TABLE features_equity ADD COLUMN IF NOT EXISTS gex_ladder REAL[];
+
+
+CREATE TABLE IF NOT EXISTS features_gamma_term (
+    id SERIAL PRIMARY KEY,
+    as_of DATE NOT NULL,
+    underlying VARCHAR(20) NOT NULL,
+    expiries DATE[], -- per-expiry term structure
+    expiry_net_gex REAL[],
+    sessions DATE[], -- projection horizon (sessions[1] == as_of)
+    spot_grid REAL[],
+    rolloff_gex REAL[], -- 2-D: spot_grid x sessions, projected net GEX
+    unclench_date DATE, -- first session where net gamma at spot releases
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_features_gamma_term_unique ON features_gamma_term(as_of, underlying);
+
+
+CREATE TABLE IF NOT EXISTS features_hedge_flow (
+    id SERIAL PRIMARY KEY,
+    as_of DATE NOT NULL,
+    underlying VARCHAR(20) NOT NULL,
+    spot_shocks REAL[], -- e.g. -0.05 .. 0.05
+    vol_shifts REAL[], -- absolute IV shifts
+    hedge_notional DOUBLE PRECISION[], -- 2-D: vol_shifts x spot_shocks, $ (+ = dealers buy)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_features_hedge_flow_unique ON features_hedge_flow(as_of, underlying);
+
+
+CREATE TABLE IF NOT EXISTS features_futures_options (
+    id SERIAL PRIMARY KEY,
+    as_of DATE NOT NULL,
+    underlying VARCHAR(20) NOT NULL, -- e.g., 'GOLD', 'WTI', 'AUDUSD'
+    futures_price NUMERIC,
+    net_gamma NUMERIC, -- Black-76 GEX, $ notional
+    gamma_below_spot NUMERIC,
+    gamma_above_spot NUMERIC,
+    put_call_oi_ratio NUMERIC,
+    net_delta NUMERIC,
+    call_wall NUMERIC,
+    put_wall NUMERIC,
+    gex_ladder REAL[], -- same layout as features_equity.gex_ladder
+    feature_vector JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_features_futures_options_unique ON features_futures_options(as_of, underlying);
+
 
 CREATE TABLE IF NOT EXISTS features_commodity (
     id SERIAL PRIMARY KEY,
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from typing import Iterator, Sequence
+from src.features.black_scholes import bs_delta, bs_gamma, black76_price, RISK_FREE_RATE
+from src.shared.dates import business_days
+
+# Seeded, vectorised generators of realistic-looking raw market data for
+# benchmarks and local databases. Output frames match the raw_* tables
+# (minus id / created_at). Each day's chain is seeded by (seed, date), so a
+# day is identical whichever range it was generated in.
+
+DEFAULT_SEED = 7
+MONTH_CODES = 'FGHJKMNQUVXZ'
+
+
+def price_path(n: int, s0: float, annual_vol: float, rng: np.random.Generator, drift: float = 0.05) -> np.ndarray:
+    """
+    Daily geometric Brownian motion with fat-ish tails (Student-t shocks).
+    """
+    dt = 1.0 / 252
+    shocks = rng.standard_t(5, size=n) / np.sqrt(5 / 3)
+    log_returns = (drift - 0.5 * annual_vol ** 2) * dt + annual_vol * np.sqrt(dt) * shocks
+    log_returns[0] = 0.0
+    return s0 * np.exp(np.cumsum(log_returns))
+
+
+def third_friday(year: int, month: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(4 - first.weekday()) % 7 + 14)
+
+
+def spx_expiries(as_of: date, daily: int = 10, weekly_days: int = 90, monthly_years: float = 2.0, quarterly_years: float = 5.0) -> np.ndarray:
+    """
+    SPX-style expiry calendar: the next `daily` sessions, Fridays out to
+    `weekly_days`, third Fridays out to `monthly_years` and quarterly third
+    Fridays out to `quarterly_years`.
+    """
+    start = np.datetime64(as_of, 'D')
+    sessions = np.arange(start, start + 3 * daily + 7)
+    expiries = set(sessions[np.is_busday(sessions)][:daily].astype(object))
+
+    fridays = np.arange(start, start + weekly_days)
+    expiries.update(d for d in fridays.astype(object) if d.weekday() == 4)
+
+    horizon = as_of + timedelta(days=int(365 * quarterly_years))
+    monthly_horizon = as_of + timedelta(days=int(365 * monthly_years))
+    year, month = as_of.year, as_of.month
+    while True:
+        expiry = third_friday(year, month)
+        if expiry > horizon:
+            break
+        if expiry >= as_of and (expiry <= monthly_horizon or month % 3 == 0):
+            expiries.add(expiry)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return np.array(sorted(expiries), dtype='datetime64[D]')
+
+
+def synthetic_option_chain(
+    as_of: date,
+    spot: float,
+    underlying: str = 'SPX',
+    seed: int = DEFAULT_SEED,
+    atm_vol: float = 0.16,
+    strike_step: float = 5.0,
+    width_sd: float = 4.0,
+    max_strikes: int = 400,
+    horizon_years: float = 5.0,
+    r: float = RISK_FREE_RATE,
+) -> pd.DataFrame:
+    """
+    One day's chain: SPX-style expiries, strikes every `strike_step` out to
+    `width_sd` standard deviations (at most `max_strikes` per expiry), a
+    skewed smile with an upward-sloping term structure, OI concentrated near
+    the money / on round strikes / on monthlies, and Black-Scholes Greeks and
+    prices from that surface. About 35k contracts for SPX defaults; a wider
+    `strike_step` / shorter `horizon_years` gives lighter chains.
+    """
+    rng = np.random.default_rng([seed, as_of.toordinal()])
+    spot = round(spot, 2)
+    expiries = spx_expiries(as_of, monthly_years=min(2.0, horizon_years), quarterly_years=horizon_years)
+    days = (expiries - np.datetime64(as_of, 'D')).astype(np.int64)
+    T = np.maximum(days, 1) / 365.0
+
+    # Strike grid per expiry, widening with sqrt(T)
+    half_width = np.minimum(np.ceil(spot * atm_vol * width_sd * np.sqrt(T) / strike_step), max_strikes // 2).astype(np.int64)
+    counts = 2 * half_width + 1
+    expiry_idx = np.repeat(np.arange(len(expiries)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) - half_width[expiry_idx]
+    atm = np.round(spot / strike_step) * strike_step
+    strike = atm + offsets * strike_step
+    strike = strike[strike > 0]
+    expiry_idx = expiry_idx[atm + offsets * strike_step > 0]
+
+    # Both sides of every strike
+    n = len(strike)
+    strike = np.concatenate([strike, strike])
+    expiry_idx = np.concatenate([expiry_idx, expiry_idx])
+    is_call = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+    t = T[expiry_idx]
+
+    # Smile: skew and curvature in standardised moneyness, term structure in T
+    m = np.log(strike / spot) / np.sqrt(t)
+    term_vol = atm_vol * (0.85 + 0.3 * (1 - np.exp(-t / 0.5)))
+    iv = term_vol * (1 - 0.9 * m * atm_vol + 0.6 * (m * atm_vol) ** 2) * np.exp(rng.normal(0, 0.01, 2 * n))
+    iv = np.clip(iv, 0.05, 1.5)
+
+    # Open interest: near the money, on round strikes and monthly expiries, puts heavier below spot
+    sd = np.abs(np.log(strike / spot)) / (atm_vol * np.sqrt(t))
+    round_bonus = np.where(strike % 100 == 0, 3.0, np.where(strike % 25 == 0, 1.5, 1.0))
+    expiry_list = expiries.astype(object)
+    monthly = np.array([d.weekday() == 4 and 15 <= d.day <= 21 for d in expiry_list])[expiry_idx]
+    side = np.where(is_call, np.where(strike >= spot, 1.0, 0.4), np.where(strike <= spot, 1.6, 0.4))
+    oi = 2500 * np.exp(-0.5 * (sd / 1.2) ** 2) * round_bonus * np.where(monthly, 3.0, 1.0) * side
+    open_interest = np.floor(oi * rng.lognormal(0, 0.6, 2 * n))
+
+    gamma = bs_gamma(spot, strike, t, iv, r)
+    delta = bs_delta(spot, strike, t, iv, is_call, r)
+    price = black76_price(spot * np.exp(r * t), strike, t, iv, is_call, r)
+    spread = np.maximum(0.05, price * 0.02)
+
+    # OCC-style symbols: root + yymmdd + C/P + strike * 1000, built per expiry / side then joined
+    root = 'SPXW' if underlying == 'SPX' else underlying
+    prefixes = np.array([f"{root}{d.strftime('%y%m%d')}{cp}" for cp in 'PC' for d in expiry_list])
+    strike_codes = np.char.zfill((strike * 1000).astype(np.int64).astype(str), 8)
+    option_symbol = np.char.add(prefixes[is_call * len(expiries) + expiry_idx], strike_codes)
+
+    return pd.DataFrame({
+        'as_of': as_of,
+        'underlying': underlying,
+        'option_symbol': option_symbol,
+        'type': np.where(is_call, 'call', 'put'),
+        'strike': strike,
+        'expiry': expiry_list[expiry_idx],
+        'underlying_price': spot,
+        'bid': np.maximum(price - spread / 2, 0.0).round(2),
+        'ask': (price + spread / 2).round(2),
+        'last': price.round(2),
+        'open_interest': open_interest,
+        # Vendor precision; also keeps bulk loads small
+        'implied_volatility': iv.round(5),
+        'delta': delta.round(5),
+        'gamma': gamma.round(8),
+    })
+
+
+def iter_option_chains(
+    start: date,
+    end: date,
+    underlying: str = 'SPX',
+    s0: float = 5000.0,
+    annual_vol: float = 0.16,
+    seed: int = DEFAULT_SEED,
+    **chain_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields one chain per business day in [start, end] along a seeded spot path.
+    """
+    days = business_days(start, end)
+    spots = price_path(len(days), s0, annual_vol, np.random.default_rng([seed, 0]))
+    for as_of, spot in zip(days, spots):
+        yield synthetic_option_chain(as_of, float(spot), underlying, seed, atm_vol=annual_vol, **chain_kwargs)
+
+
+def synthetic_futures_history(days: Sequence[date], underlying: str = 'GOLD', root: str = 'GC', s0: float = 2000.0, annual_vol: float = 0.15, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Front / back month settles per day. The front-back spread drifts between
+    contango and backwardation episodes.
+    """
+    rng = np.random.default_rng([seed, 1])
+    n = len(days)
+    front = price_path(n, s0, annual_vol, rng)
+    carry = 0.004 * np.sin(np.arange(n) / 40.0) + rng.normal(0, 0.001, n)
+    back = front * (1 + carry)
+
+    rows = []
+    for i, as_of in enumerate(days):
+        # Front = next even month's contract, back = the one after
+        month = as_of.month + (2 - as_of.month % 2)
+        year = as_of.year + (month - 1) // 12
+        month = (month - 1) % 12 + 1
+        for price, oi, volume, k in ((front[i], 150000, 20000, 0), (back[i], 50000, 5000, 2)):
+            m = (month - 1 + k) % 12 + 1
+            y = year + (month - 1 + k) // 12
+            rows.append((as_of, underlying, f"{root}{MONTH_CODES[m - 1]}{y % 10}", date(y, m, 26), price,
+                         oi * rng.uniform(0.9, 1.1), volume * rng.uniform(0.5, 1.5)))
+
+    return pd.DataFrame(rows, columns=['as_of', 'underlying', 'contract_symbol', 'expiry', 'settle_price', 'open_interest', 'volume'])
+
+
+def synthetic_cot_history(days: Sequence[date], markets: Sequence[str] = ('GOLD', 'AUD'), seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Weekly (Tuesday) COT reports with mean-reverting speculative positioning.
+    """
+    rng = np.random.default_rng([seed, 2])
+    tuesdays = [d for d in days if d.weekday() == 1] or list(days[:1])
+    frames = []
+    for market in markets:
+        scale = 200000 if market == 'GOLD' else 80000
+        net = np.empty(len(tuesdays))
+        net[0] = scale * 0.5
+        for i in range(1, len(tuesdays)):
+            net[i] = 0.92 * net[i - 1] + 0.08 * scale * 0.3 + rng.normal(0, scale * 0.08)
+        spec_short = scale * 0.3 * rng.uniform(0.9, 1.1, len(tuesdays))
+        spec_long = spec_short + net
+        frames.append(pd.DataFrame({
+            'as_of': tuesdays,
+            'market': market,
+            'hedger_long': (scale * 0.5 + spec_short).round(),
+            'hedger_short': (scale * 0.5 + spec_long).round(),
+            'spec_long': spec_long.round(),
+            'spec_short': spec_short.round(),
+            'small_long': (scale * 0.05 * rng.uniform(0.8, 1.2, len(tuesdays))).round(),
+            'small_short': (scale * 0.05 * rng.uniform(0.8, 1.2, len(tuesdays))).round(),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def synthetic_fx_history(days: Sequence[date], pair: str = 'AUDUSD', s0: float = 0.65, annual_vol: float = 0.09, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Daily spot, slowly drifting policy rates and 1m / 3m implied vols.
+    """
+    rng = np.random.default_rng([seed, 3])
+    n = len(days)
+    spot = price_path(n, s0, annual_vol, rng, drift=0.0)
+    base = 4.35 + np.cumsum(rng.normal(0, 0.01, n))
+    quote = 5.50 + np.cumsum(rng.normal(0, 0.01, n))
+    iv_1m = annual_vol * 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)) * 0.5)
+    return pd.DataFrame({
+        'as_of': list(days),
+        'pair': pair,
+        'spot_price': spot,
+        'short_rate_base': base.round(4),
+        'short_rate_quote': quote.round(4),
+        'implied_vol_1m': iv_1m.round(3),
+        'implied_vol_3m': (iv_1m * 1.05).round(3),
+    })
@@ -0,0 +1,310 @@
+import os
+import sys
+import json
+import time
+import logging
+import resource
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional
+from src.shared.files import write_json_atomic
+
+# Lightweight spans around connectors, DB reads / writes, Greeks, features,
+# scoring and reporting. Off by default (a flag check per call); enable with
+# DEALERFLOW_TRACE=1, `python -m src --trace ...` or enable_tracing().
+#
+#   with span('load chain', 'db') as s:
+#       df = read_frame(...)
+#       s.add(rows_out=len(df))
+#
+#   @traced('features')
+#   def compute_spx_features(as_of, underlying='SPX'): ...
+#
+# The last TRACE_MAX_SPANS finished spans are kept in memory for
+# summary_table() / export_chrome_trace() and, when TRACE_LOG is set ('-' for
+# stderr), every span is written as one JSON line.
+TRACE_ENABLED = os.getenv('DEALERFLOW_TRACE', '').lower() in ('1', 'true', 'yes')
+TRACE_LOG = os.getenv('TRACE_LOG')
+TRACE_MAX_SPANS = int(os.getenv('TRACE_MAX_SPANS', '100000'))
+
+COUNTERS = ('rows_in', 'rows_out', 'bytes_in', 'bytes_out')
+
+logger = logging.getLogger('dealerflow.trace')
+
+_current = contextvars.ContextVar('dealerflow_span', default=None)
+_lock = threading.Lock()
+_spans = deque(maxlen=TRACE_MAX_SPANS)
+# Spans pushed out of _spans since the last reset
+_dropped = [0]
+_ids = iter(range(1, sys.maxsize))
+_epoch = time.perf_counter()
+_enabled = False
+# (on_start, on_end) callables run for every span, e.g. src.shared.memory
+_hooks = []
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size (Linux /proc), else the peak from getrusage.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    thread: int
+    start_s: float
+    duration_s: float = 0.0
+    rss_start: int = 0
+    rss_end: int = 0
+    peak_rss: int = 0
+    status: str = 'ok'
+    attrs: dict = field(default_factory=dict)
+
+    def add(self, **counters):
+        """
+        Accumulates counters (rows_in / rows_out / bytes_in / bytes_out or any other number).
+        """
+        for key, value in counters.items():
+            if value is not None:
+                self.attrs[key] = self.attrs.get(key, 0) + value
+        return self
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _NullSpan:
+    """Stand-in yielded while tracing is off."""
+
+    def add(self, **counters):
+        return self
+
+    def set(self, **attrs):
+        return self
+
+
+NULL_SPAN = _NullSpan()
+
+
+def enable_tracing(log_path: str = None):
+    """
+    Turns tracing on. `log_path` ('-' for stderr) adds a JSON-lines handler.
+    """
+    global _enabled
+    _enabled = True
+    log_path = log_path or TRACE_LOG
+    if log_path and not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr) if log_path == '-' else logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def disable_tracing():
+    global _enabled
+    _enabled = False
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def add_span_hook(on_start: Callable, on_end: Callable):
+    """
+    Calls on_start(span) when a span opens and on_end(span) when it closes,
+    before it is recorded (so on_end may add attrs).
+    """
+    _hooks.append((on_start, on_end))
+
+
+def remove_span_hook(on_start: Callable, on_end: Callable):
+    if (on_start, on_end) in _hooks:
+        _hooks.remove((on_start, on_end))
+
+
+def reset_spans():
+    with _lock:
+        _spans.clear()
+        _dropped[0] = 0
+
+
+def dropped_spans() -> int:
+    return _dropped[0]
+
+
+def finished_spans() -> list:
+    with _lock:
+        return list(_spans)
+
+
+def current_span():
+    """
+    The innermost open span in this thread / task (NULL_SPAN when none or tracing is off).
+    """
+    return (_current.get() if _enabled else None) or NULL_SPAN
+
+
+def record(**counters):
+    """
+    Adds counters to the current span, e.g. record(bytes_in=len(resp.content)).
+    """
+    current_span().add(**counters)
+
+
+@contextmanager
+def span(name: str, category: str = 'app', **attrs):
+    if not _enabled:
+        yield NULL_SPAN
+        return
+
+    parent = _current.get()
+    s = Span(
+        name=name, category=category, span_id=next(_ids),
+        parent_id=parent.span_id if parent else None, thread=threading.get_ident(),
+        start_s=time.perf_counter() - _epoch, rss_start=rss_bytes(),
+    )
+    s.set(**attrs)
+    for on_start, _ in _hooks:
+        on_start(s)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = 'error'
+        s.attrs['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        s.duration_s = time.perf_counter() - _epoch - s.start_s
+        s.rss_end = rss_bytes()
+        # RSS seen at either end; the memory profiler's sampler raises it to
+        # the peak while the span was open (ru_maxrss is process-lifetime)
+        s.peak_rss = max(s.rss_start, s.rss_end)
+        for _, on_end in _hooks:
+            on_end(s)
+        with _lock:
+            if len(_spans) == _spans.maxlen:
+                _dropped[0] += 1
+            _spans.append(s)
+        if logger.handlers:
+            logger.info(json.dumps({'event': 'span', **s.to_dict()}, default=str))
+
+
+def result_rows(value) -> Optional[int]:
+    """
+    Row count of a return value: ints (ingest counts), frames, lists.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if hasattr(value, '__len__') and not isinstance(value, (str, bytes, dict)):
+        return len(value)
+    return None
+
+
+def traced(category: str = 'app', name: str = None, rows: Callable = result_rows):
+    """
+    Decorator: runs the function inside a span named after it and records
+    rows_out from the return value via `rows` (None to skip).
+    """
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(label, category) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    s.add(rows_out=rows(result))
+                return result
+        return wrapper
+    return decorate
+
+
+if TRACE_ENABLED:
+    enable_tracing()
+
+
+def summary_table(spans: list = None) -> list:
+    """
+    Per (category, name) aggregates, slowest total first.
+    """
+    spans = finished_spans() if spans is None else spans
+    table = {}
+    for s in spans:
+        row = table.setdefault((s.category, s.name), {
+            'category': s.category, 'name': s.name, 'calls': 0, 'errors': 0,
+            'total_s': 0.0, 'max_s': 0.0, 'rss_delta': 0, 'peak_rss': 0,
+            **{c: 0 for c in COUNTERS},
+        })
+        row['calls'] += 1
+        row['errors'] += s.status == 'error'
+        row['total_s'] += s.duration_s
+        row['max_s'] = max(row['max_s'], s.duration_s)
+        row['rss_delta'] = max(row['rss_delta'], s.rss_end - s.rss_start)
+        row['peak_rss'] = max(row['peak_rss'], s.peak_rss)
+        for c in COUNTERS:
+            row[c] += s.attrs.get(c, 0)
+    return sorted(table.values(), key=lambda r: r['total_s'], reverse=True)
+
+
+def format_trace_summary(spans: list = None, top: int = 30) -> str:
+    mb = 1024 * 1024
+    lines = [
+        f"{'Span':<40}{'Cat':<10}{'Calls':>6}{'Total s':>9}{'Max s':>8}"
+        f"{'Rows in':>10}{'Rows out':>10}{'MB in':>8}{'RSS +MB':>9}{'Peak MB':>9}"
+    ]
+    for r in summary_table(spans)[:top]:
+        lines.append(
+            f"{r['name'][:39]:<40}{r['category'][:9]:<10}{r['calls']:>6}{r['total_s']:>9.3f}{r['max_s']:>8.3f}"
+            f"{r['rows_in']:>10}{r['rows_out']:>10}{r['bytes_in'] / mb:>8.2f}"
+            f"{r['rss_delta'] / mb:>9.1f}{r['peak_rss'] / mb:>9.0f}"
+        )
+    if spans is None and dropped_spans():
+        lines.append(f"({dropped_spans()} older spans dropped, see TRACE_MAX_SPANS)")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path: str, spans: list = None) -> str:
+    """
+    Writes spans in Chrome trace-event format (open in chrome://tracing or Perfetto).
+    """
+    spans = finished_spans() if spans is None else spans
+    pid = os.getpid()
+    threads = {}
+    events = []
+    for s in spans:
+        tid = threads.setdefault(s.thread, len(threads) + 1)
+        events.append({
+            'name': s.name, 'cat': s.category, 'ph': 'X', 'pid': pid, 'tid': tid,
+            'ts': round(s.start_s * 1e6, 1), 'dur': round(s.duration_s * 1e6, 1),
+            'args': {**s.attrs, 'rss_mb': round(s.rss_end / 2 ** 20, 1), 'status': s.status},
+        })
+    return write_json_atomic(path, {'traceEvents': events, 'displayTimeUnit': 'ms'})
@@ -0,0 +1,95 @@
+import gzip
+import asyncio
+from datetime import date
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from src.api.cache import ResponseCache, accepts_gzip, strong_etag
+from src.api.server import DealerFlowAPI
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put('/a', b'a', 'application/json', ['asset_scores'])
+    cache.put('/b', b'b', 'application/json', ['features_fx'])
+    cache.get('/a')
+    cache.put('/c', b'c', 'application/json', ['features_fx'])
+    assert cache.get('/b') is None
+    assert cache.get('/a').etag == strong_etag(b'a')
+
+
+def test_invalidate_by_table_and_stale_generation():
+    cache = ResponseCache()
+    cache.put('/scores', b'[]', 'application/json', ['asset_scores'])
+    cache.put('/features/fx', b'[]', 'application/json', ['features_fx'])
+    generation = cache.generation
+    assert cache.invalidate(['asset_scores']) == 1
+    assert cache.get('/scores') is None and cache.get('/features/fx') is not None
+
+    # A load that started before the invalidation is not cached
+    cache.put('/scores', b'[1]', 'application/json', ['asset_scores'], generation)
+    assert cache.get('/scores') is None
+
+
+def test_gzip_body_only_for_large_responses():
+    cache = ResponseCache()
+    assert cache.put('/small', b'{}', 'application/json', []).gzip_body() is None
+    body = b'[' + b'1,' * 1000 + b'1]'
+    assert gzip.decompress(cache.put('/large', body, 'application/json', []).gzip_body()) == body
+
+
+def test_invalidate_by_date_keeps_other_ranges():
+    cache = ResponseCache()
+    cache.put('/scores?date=2024-01-05', b'[]', 'application/json', ['asset_scores'], dates=(date(2024, 1, 5), date(2024, 1, 5)))
+    cache.put('/scores?start=2024-01-01&end=2024-01-31', b'[]', 'application/json', ['asset_scores'], dates=(date(2024, 1, 1), date(2024, 1, 31)))
+    cache.put('/scores?date=2024-01-08', b'[]', 'application/json', ['asset_scores'], dates=(date(2024, 1, 8), date(2024, 1, 8)))
+    assert cache.invalidate(['asset_scores'], date(2024, 1, 5)) == 2
+    assert cache.get('/scores?date=2024-01-08') is not None
+
+
+def test_accepts_gzip_honours_q_values():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('br;q=1.0, gzip;q=0.5')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('identity, *;q=0')
+    assert not accepts_gzip('br')
+    assert not accepts_gzip(None)
+
+
+def test_conditional_requests_per_encoding_and_missing_reports():
+    api = DealerFlowAPI(invalidation='poll')
+    body = b'{"score": 1}' * 100
+    loads = []
+
+    def load(found):
+        loads.append(found)
+        return body if found else None
+
+    async def handler(request):
+        found = request.match_info['name'] == 'found'
+        response = await api.respond(request, ('asset_scores',), None, 'application/json', load, found)
+        if response is None:
+            raise web.HTTPNotFound()
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/{name}', handler)
+        async with TestClient(TestServer(app)) as client:
+            plain = await client.get('/found', headers={'Accept-Encoding': 'identity'})
+            zipped = await client.get('/found', headers={'Accept-Encoding': 'gzip'}, auto_decompress=False)
+            refused = await client.get('/found', headers={'Accept-Encoding': 'gzip;q=0'})
+            plain_etag, gzip_etag = plain.headers['ETag'], zipped.headers['ETag']
+            # A validator only matches the representation it was served with
+            same = await client.get('/found', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+            other = await client.get('/found', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain_etag})
+            missing = [(await client.get('/missing', headers={'If-None-Match': '*'})).status for _ in range(2)]
+            return (plain_etag, gzip_etag, zipped.headers.get('Content-Encoding'), refused.headers.get('Content-Encoding'),
+                    same.status, other.status, missing)
+
+    plain_etag, gzip_etag, zipped_encoding, refused_encoding, same, other, missing = asyncio.run(run())
+    assert plain_etag == strong_etag(body) and gzip_etag != plain_etag
+    assert zipped_encoding == 'gzip' and refused_encoding is None
+    assert (same, other) == (304, 200)
+    # Empty results are a 404 every time, never cached or answered with a 304
+    assert missing == [404, 404] and loads.count(False) == 2
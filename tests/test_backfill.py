@@ -0,0 +1,107 @@
+from datetime import date
+
+import psycopg2
+import pytest
+
+from src.shared.dates import business_days
+from src.pipeline import backfill
+from src.pipeline.backfill import backfill_id, plan_shards, run_backfill, split_phases, throughput
+from src.pipeline.dag import Pipeline, Stage
+from src.shared import db
+
+
+def test_phases_and_shards():
+    noop = lambda *a: None
+    pipeline = Pipeline([
+        Stage('cot', noop, per_date=False),
+        Stage('features', noop, ('cot',)),
+        Stage('regime', noop, ('features',), sequential=True),
+        Stage('report', noop, ('regime',)),
+        Stage('fx', noop),
+    ])
+    assert split_phases(pipeline) == {'once': ['cot'], 'dates': ['features', 'fx'], 'sequential': ['regime', 'report']}
+    assert backfill_id(pipeline, date(2020, 1, 1), date(2020, 12, 31)) == backfill_id(pipeline.select(['cot', 'features', 'regime', 'report', 'fx']), date(2020, 1, 1), date(2020, 12, 31))
+
+    dates = business_days(date(2024, 1, 1), date(2024, 3, 29))
+    shards = plan_shards(reversed(dates), workers=4, shard_days=20)
+    assert [d for shard in shards for d in shard] == dates
+    assert [len(s) for s in shards] == [17, 17, 17, 14]
+    assert len(plan_shards(dates, workers=2, shard_days=5)) == 13
+    assert throughput(30, 90.0) == 20.0
+
+
+
+class FakeConnection:
+    def __init__(self, fail_rollback=False):
+        self.closed = False
+        self.status = psycopg2.extensions.STATUS_READY
+        self.fail_rollback = fail_rollback
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise psycopg2.OperationalError("server closed the connection")
+        self.status = psycopg2.extensions.STATUS_READY
+
+    def close(self):
+        self.closed = True
+
+
+def test_reused_connection_is_not_shared_with_nested_callers(monkeypatch):
+    connections = []
+    monkeypatch.setattr(db, '_connect', lambda: connections.append(FakeConnection()) or connections[-1])
+    db.enable_connection_reuse()
+    try:
+        with db.get_db_connection() as outer:
+            with db.get_db_connection() as inner:
+                assert inner is not outer
+            assert inner.closed and not outer.closed
+        with db.get_db_connection() as again:
+            assert again is outer
+
+        # A pooled connection that cannot roll back is dropped, not reused
+        outer.fail_rollback = True
+        with db.get_db_connection() as conn:
+            conn.status = psycopg2.extensions.STATUS_IN_TRANSACTION
+        assert outer.closed
+        with db.get_db_connection() as fresh:
+            assert fresh is not outer and not fresh.closed
+    finally:
+        db.disable_connection_reuse()
+    assert len(connections) == 3
+
+
+class Interrupted(BaseException):
+    """Stands in for Ctrl-C / a killed process: not caught as a stage failure."""
+
+
+def test_rerun_skips_checkpointed_dates(monkeypatch):
+    checkpoints = {}
+    monkeypatch.setattr(backfill, 'start_checkpoints', lambda *a, **k: None)
+    monkeypatch.setattr(backfill, 'finish_checkpoints', lambda *a, **k: None)
+    monkeypatch.setattr(backfill, 'completed_dates', lambda run_id, phase: {
+        as_of for (r, p, as_of), status in checkpoints.items() if (r, p) == (run_id, phase) and status == 'done'
+    })
+    monkeypatch.setattr(backfill, 'checkpoint', lambda run_id, phase, as_of, status, *a, **k:
+                        checkpoints.__setitem__((run_id, phase, as_of), status))
+    # Every stage runs: no pipeline_runs fingerprints
+    monkeypatch.setattr(Pipeline, 'fingerprint', lambda self, stage, as_of: None)
+    monkeypatch.setattr(Pipeline, 'last_fingerprint', lambda self, stage, as_of: 'never')
+    monkeypatch.setattr(Pipeline, 'record', lambda *a, **k: None)
+
+    dates = business_days(date(2024, 1, 1), date(2024, 1, 5))
+    calls, interrupted = [], []
+
+    def features(as_of):
+        if as_of == dates[3] and not interrupted:
+            interrupted.append(as_of)
+            raise Interrupted
+        calls.append(as_of)
+
+    pipeline = Pipeline([Stage('features', features)])
+    with pytest.raises(Interrupted):
+        run_backfill(pipeline, dates, workers=1)
+    assert calls == dates[:3]
+
+    summary = run_backfill(pipeline, dates, workers=1)
+    assert calls == dates
+    assert (summary['done'], summary['failed']) == (2, 0)
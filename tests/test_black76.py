@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.features.black_scholes import (
+    black76_delta,
+    black76_gamma,
+    black76_implied_vol,
+    black76_price,
+)
+
+
+def test_black76_reference_values():
+    # F=100, K=100, T=0.25, r=0.045, sigma=0.2
+    assert np.isclose(black76_price(100.0, 100.0, 0.25, 0.2, True), 3.943150, atol=1e-6)
+    assert np.isclose(black76_delta(100.0, 90.0, 0.5, 0.35, False), -0.284861, atol=1e-6)
+    assert np.isclose(black76_gamma(100.0, 90.0, 0.5, 0.35), 0.0135527, atol=1e-7)
+
+
+def test_put_call_parity():
+    F, K, T, r = 2050.0, 2000.0, 0.3, 0.045
+    call = black76_price(F, K, T, 0.18, True, r)
+    put = black76_price(F, K, T, 0.18, False, r)
+    assert np.isclose(call - put, np.exp(-r * T) * (F - K))
+
+
+def test_implied_vol_roundtrip_across_markets():
+    # Gold, WTI and AUD-style chains in one vectorised solve
+    F = np.array([2050.0, 2050.0, 75.0, 75.0, 0.66, 0.66])
+    K = np.array([2000.0, 2200.0, 60.0, 80.0, 0.64, 0.70])
+    T = np.array([0.1, 0.5, 0.05, 0.8, 0.25, 1.0])
+    is_call = np.array([True, False, True, False, True, False])
+    sigma = np.array([0.15, 0.22, 0.45, 0.35, 0.09, 0.11])
+
+    price = black76_price(F, K, T, sigma, is_call)
+    assert np.allclose(black76_implied_vol(price, F, K, T, is_call), sigma, atol=1e-8)
+
+
+def test_implied_vol_unsolvable_rows_are_nan():
+    # Below intrinsic, expired
+    iv = black76_implied_vol(np.array([1.0, 5.0]), 100.0, np.array([80.0, 100.0]), np.array([0.5, 0.0]), True)
+    assert np.isnan(iv).all()
@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.features import chain_cache
+
+
+def _raw_chain(as_of, underlying, columns=None):
+    return pd.DataFrame({
+        'type': ['call', 'put', 'call'],
+        'strike': [4500.0, 4400.0, 4600.0],
+        'expiry': [date(2025, 3, 21)] * 3,
+        'open_interest': [100.0, None, 50.0],
+        'gamma': [0.01, 0.02, 0.005],
+        'delta': [0.5, -0.3, 0.2],
+        'underlying_price': [4510.0] * 3,
+        'implied_volatility': [0.15, 0.2, 0.14],
+    })
+
+
+def test_chain_cache_round_trip_is_memory_mapped(tmp_path, monkeypatch):
+    monkeypatch.setattr(chain_cache, 'read_raw_options', _raw_chain)
+    cache_dir = str(tmp_path)
+
+    assert chain_cache.load_chain(date(2025, 3, 3), 'SPX', cache_dir, materialize=False) is None
+    chain = chain_cache.load_chain(date(2025, 3, 3), 'SPX', cache_dir)
+
+    assert isinstance(chain.strike, np.memmap)
+    assert chain.strike.dtype == np.float32
+    assert chain.is_call.tolist() == [1, 0, 1]
+    assert chain.open_interest.tolist() == [100.0, 0.0, 50.0]
+    assert chain.expiry_days.tolist() == [18, 18, 18]
+    assert len(chain) == 3 and chain.spot == 4510.0
+
+    # Weekend days are skipped; cached days load without touching the raw store
+    monkeypatch.setattr(chain_cache, 'read_raw_options', lambda *a: pd.DataFrame())
+    days = [c.as_of for c in chain_cache.iter_chains(date(2025, 3, 1), date(2025, 3, 4), 'SPX', cache_dir)]
+    assert days == [date(2025, 3, 3)]
+
+
+def test_concurrent_rebuilds_swap_whole_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(chain_cache, 'read_raw_options', _raw_chain)
+    cache_dir = str(tmp_path)
+    as_of = date(2025, 3, 3)
+    chain_cache.materialize_chain(as_of, 'SPX', cache_dir)
+
+    def rebuild_or_read(i):
+        if i % 2:
+            return len(chain_cache.load_chain(as_of, 'SPX', cache_dir, materialize=False))
+        return chain_cache.materialize_chain(as_of, 'SPX', cache_dir, force=True)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(rebuild_or_read, range(40)))
+
+    # Readers always find a complete entry while it is being replaced
+    assert set(results[1::2]) == {3}
+    assert set(results[::2]) == {chain_cache.chain_path(as_of, 'SPX', cache_dir)}
+    # The entry links to the last version; replaced versions are removed
+    entry = tmp_path / 'SPX' / '2025-03-03'
+    assert os.path.islink(entry)
+    assert sorted(os.listdir(tmp_path / 'SPX')) == sorted(['2025-03-03', '.2025-03-03.lock', os.readlink(entry)])
+    assert chain_cache.load_chain(as_of, 'SPX', cache_dir, materialize=False).strike.tolist() == [4500.0, 4400.0, 4600.0]
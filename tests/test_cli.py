@@ -0,0 +1,24 @@
+import importlib.util
+from src.cli import COMMANDS, main, parse_import_times
+
+
+def test_every_command_points_at_a_script():
+    for module, _ in COMMANDS.values():
+        assert importlib.util.find_spec(module) is not None, module
+
+
+def test_unknown_command_exits_with_usage(capsys):
+    assert main(['no-such-command']) == 2
+    assert "usage: python -m src" in capsys.readouterr().err
+
+
+def test_parse_import_times():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     jinja2.utils",
+        "import time:       300 |        420 |   jinja2",
+        "Report saved to report.md",
+    ])
+    entries, other = parse_import_times(stderr)
+    assert entries == [(120, 120, 2, 'jinja2.utils'), (420, 300, 1, 'jinja2')]
+    assert other == ["Report saved to report.md"]
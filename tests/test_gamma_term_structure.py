@@ -0,0 +1,55 @@
+import numpy as np
+from datetime import date
+
+from src.features.black_scholes import bs_delta, bs_gamma
+from src.features.gamma_term_structure import (
+    build_gamma_term_structure,
+    expiry_term_structure,
+    find_unclench_date,
+)
+
+
+def test_bs_greeks_reference_values():
+    # S=100, K=100, T=1, r=0.045, sigma=0.2
+    assert np.isclose(bs_gamma(100.0, 100.0, 1.0, 0.2), 0.0189210, atol=1e-6)
+    assert np.isclose(bs_delta(100.0, 100.0, 1.0, 0.2, True), 0.627409, atol=1e-6)
+    assert np.isclose(bs_delta(100.0, 100.0, 1.0, 0.2, False), 0.627409 - 1, atol=1e-6)
+    # Expired contracts: zero gamma, intrinsic delta
+    assert bs_gamma(100.0, 90.0, 0.0, 0.2) == 0
+    assert bs_delta(100.0, 90.0, 0.0, 0.2, True) == 1.0
+    assert bs_delta(100.0, 110.0, -0.1, 0.2, False) == -1.0
+
+
+def test_expiry_term_structure_nets_calls_and_puts():
+    expiry = np.array(['2024-01-12', '2024-01-05', '2024-01-12'], dtype='datetime64[D]')
+    expiries, net = expiry_term_structure(expiry, np.array([True, True, False]), np.array([5.0, 2.0, 3.0]))
+    assert expiries.astype(str).tolist() == ['2024-01-05', '2024-01-12']
+    assert net.tolist() == [2.0, 2.0]
+
+
+def test_rolloff_grid_drops_expiring_gamma():
+    as_of = date(2024, 1, 5)  # Friday
+    strike = np.array([4500.0, 4500.0])
+    expiry = np.array(['2024-01-08', '2024-03-15'], dtype='datetime64[D]')
+    iv = np.array([0.15, 0.15])
+    is_call = np.array([True, True])
+    oi = np.array([1000.0, 1000.0])
+    gamma = bs_gamma(4500.0, strike, np.array([3.0, 70.0]) / 365.0, iv)
+
+    ts = build_gamma_term_structure(as_of, strike, expiry, iv, is_call, oi, gamma, 4500.0, sessions=5)
+
+    assert ts.sessions[0] == np.datetime64('2024-01-05')
+    assert ts.sessions[1] == np.datetime64('2024-01-08')
+    assert ts.rolloff_gex.shape == (11, 6)
+    at_spot = ts.net_gex_at_spot()
+    # Session 0 reprices today's chain
+    assert np.isclose(at_spot[0], (gamma * oi * 100 * 4500.0).sum())
+    # The near contract expires on session 1, so most of the gamma disappears
+    assert at_spot[1] < 0.5 * at_spot[0]
+    assert ts.unclench_date == date(2024, 1, 8)
+
+
+def test_find_unclench_date_none_when_stable():
+    sessions = np.array(['2024-01-05', '2024-01-08', '2024-01-09'], dtype='datetime64[D]')
+    assert find_unclench_date(sessions, np.array([10.0, 9.0, 8.0])) is None
+    assert find_unclench_date(sessions, np.array([10.0, 9.0, -1.0])) == date(2024, 1, 9)
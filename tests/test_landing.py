@@ -0,0 +1,69 @@
+from datetime import date
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.shared.landing import read_landing, read_option_chain, write_landing
+
+
+def _chain(as_of, underlying, n=4):
+    return pd.DataFrame({
+        'as_of': [as_of] * n,
+        'underlying': [underlying] * n,
+        'option_symbol': [f"{underlying}{i}" for i in range(n)],
+        'type': ['call', 'put'] * (n // 2),
+        'strike': [4600.0, 4400.0, 4500.0, 4550.0][:n],
+        'expiry': [date(2025, 3, 21)] * n,
+        'gamma': [0.01] * n,
+    })
+
+
+def test_landing_round_trip_with_projection_and_pruning(tmp_path):
+    root = str(tmp_path)
+    write_landing(_chain(date(2025, 3, 3), 'SPX'), 'options', 'SPX', sort_by=('expiry', 'strike'), root=root)
+    write_landing(_chain(date(2025, 3, 3), 'NDX'), 'options', 'NDX', root=root)
+    paths = write_landing(_chain(date(2025, 3, 4), 'SPX'), 'options', 'SPX', root=root)
+
+    meta = pq.ParquetFile(paths[0]).metadata
+    assert meta.row_group(0).column(0).compression == 'ZSTD'
+    assert meta.row_group(0).column(0).statistics is not None
+
+    df = read_option_chain(date(2025, 3, 3), 'SPX', columns=('strike', 'type'), root=root)
+    assert list(df.columns) == ['as_of', 'strike', 'type']
+    assert df['strike'].tolist() == [4400.0, 4500.0, 4550.0, 4600.0]
+    assert set(df['as_of']) == {date(2025, 3, 3)}
+
+    assert len(read_landing('options', start=date(2025, 3, 3), root=root)) == 12
+    assert read_landing('cot', root=root).empty
+
+    # Single-day reads open only that day's directory (or one key's file)
+    day = read_landing('options', ('strike',), start=date(2025, 3, 4), end=date(2025, 3, 4), root=root)
+    assert set(day['as_of']) == {date(2025, 3, 4)} and len(day) == 4
+    assert len(read_landing('options', start=date(2025, 3, 3), end=date(2025, 3, 3), root=root)) == 8
+    ndx = read_landing('options', ('strike',), start=date(2025, 3, 3), end=date(2025, 3, 3), root=root, key='NDX')
+    assert list(ndx.columns) == ['as_of', 'strike'] and len(ndx) == 4
+    assert read_option_chain(date(2025, 3, 5), 'SPX', root=root).empty
+
+
+def test_landing_rewrite_replaces_day(tmp_path):
+    root = str(tmp_path)
+    write_landing(_chain(date(2025, 3, 3), 'SPX'), 'options', 'SPX', root=root)
+    write_landing(_chain(date(2025, 3, 3), 'SPX', n=2), 'options', 'SPX', root=root)
+    assert len(read_option_chain(date(2025, 3, 3), 'SPX', columns=('strike',), root=root)) == 2
+
+
+def test_csv_ingest_lands_chain_in_parquet_mode(tmp_path, monkeypatch):
+    from src.shared import landing
+    from src.ingestion.ingest_spx_csv import RAW_OPTION_COLUMNS, ingest_spx_from_csv
+
+    monkeypatch.setattr(landing, 'RAW_STORE', 'parquet')
+    monkeypatch.setattr(landing, 'LANDING_ROOT', str(tmp_path))
+    chain = _chain(date(2025, 3, 3), 'SPX').drop(columns=['as_of', 'underlying'])
+    for column in set(RAW_OPTION_COLUMNS) - set(chain.columns):
+        chain[column] = 1.0
+    chain[RAW_OPTION_COLUMNS].to_csv(tmp_path / 'chain.csv', index=False)
+
+    # No Postgres needed: the chain only goes to the landing zone
+    assert ingest_spx_from_csv(str(tmp_path / 'chain.csv'), date(2025, 3, 3)) == 4
+    landed = read_option_chain(date(2025, 3, 3), 'SPX', columns=('strike', 'expiry'), root=str(tmp_path))
+    assert landed['strike'].tolist() == [4400.0, 4500.0, 4550.0, 4600.0]
@@ -0,0 +1,44 @@
+import asyncio
+from aiohttp.test_utils import TestServer
+from src.llm.client import HTTPLLMClient
+from src.llm.macro_note import generate_note_for_state, note_cache_key
+from src.llm.macro_state import MacroState
+from src.llm.stub_server import CALLS, create_stub_app
+
+
+def macro_state(as_of, spx_instability=48.0):
+    return MacroState(
+        as_of=as_of, spx_instability=spx_instability, spx_regime='FRAGILE', audusd_instability=30.0,
+        audusd_regime='STABLE', jpy_instability=60.0, dxy_ret_20d=2.5, wti_instability=58.0,
+        nem_instability=65.0, us10y=4.05, jp10y=0.6, spread_usjp_10y=3.45,
+        reflexive_loop_active=True, fx_equity_stress='WARNING',
+    )
+
+
+def test_note_cache_key_tracks_prompt_state_and_model():
+    ms = macro_state('2024-01-05')
+    key = note_cache_key('prompt', ms, 'm')
+    assert key == note_cache_key('prompt', macro_state('2024-01-05'), 'm')
+    assert key != note_cache_key('prompt v2', ms, 'm')
+    assert key != note_cache_key('prompt', macro_state('2024-01-05', 70.0), 'm')
+    assert key != note_cache_key('prompt', ms, 'other')
+
+
+def test_unchanged_days_cost_no_llm_calls(tmp_path):
+    async def run():
+        app = create_stub_app()
+        async with TestServer(app) as server:
+            client = HTTPLLMClient(base_url=str(server.make_url('/v1')), model='stub')
+            states = [macro_state(d) for d in ('2024-01-04', '2024-01-05')]
+            try:
+                first = [await generate_note_for_state(ms, client, 'prompt', str(tmp_path)) for ms in states]
+                second = [await generate_note_for_state(ms, client, 'prompt', str(tmp_path)) for ms in states]
+            finally:
+                await client.close()
+            return app[CALLS]['count'], first, second
+
+    calls, first, second = asyncio.run(run())
+    assert calls == 2
+    assert [cached for _, cached in first] == [False, False]
+    assert [cached for _, cached in second] == [True, True]
+    assert "Date: 2024-01-05" in second[1][0]
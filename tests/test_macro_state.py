@@ -0,0 +1,19 @@
+from datetime import date
+from src.llm.macro_state import macro_state_from_row, load_cached_state, save_cached_state
+
+
+def test_macro_state_cache_is_keyed_by_fingerprint(tmp_path):
+    row = {
+        'spx_instability': 71.5, 'spx_regime': 'EXPLOSIVE',
+        'audusd_instability': None, 'audusd_regime': None,
+        'us10y': 4.05, 'jp10y': 0.6, 'spread_usjp_10y': 3.45,
+        'reflexive_loop_active': True, 'fx_equity_stress': None, 'dxy_ret_20d': 2.5,
+    }
+    ms = macro_state_from_row(date(2001, 1, 5), row)
+    assert ms.audusd_regime == "PENDING" and ms.audusd_instability == 0.0
+    assert ms.fx_equity_stress == "NORMAL"
+
+    save_cached_state(ms, 'abc', str(tmp_path))
+    assert load_cached_state(date(2001, 1, 5), 'abc', str(tmp_path)) == ms
+    assert load_cached_state(date(2001, 1, 5), 'changed', str(tmp_path)) is None
+    assert load_cached_state(date(2001, 1, 8), 'abc', str(tmp_path)) is None
@@ -0,0 +1,27 @@
+from datetime import date
+
+import pytest
+
+from src.features.spx_features import compute_spx_features
+from src.ingestion.ingest_index_options import parse_spots
+from src.shared.markets import DEFAULT_SPOTS, INDEX_OPTIONS
+
+
+def test_index_options_table():
+    assert set(INDEX_OPTIONS) == set(DEFAULT_SPOTS)
+    for underlying, spec in INDEX_OPTIONS.items():
+        assert spec['multiplier'] > 0
+        # Options on futures come from CME Globex, index options from OPRA
+        assert spec['dataset'] == ('GLBX.MDP3' if spec['futures'] else 'OPRA.PILLAR')
+    assert INDEX_OPTIONS['ES']['multiplier'] == 50
+
+
+def test_parse_spots():
+    assert parse_spots(None, ['SPX', 'NDX']) == {'SPX': DEFAULT_SPOTS['SPX'], 'NDX': DEFAULT_SPOTS['NDX']}
+    assert parse_spots('5000', ['SPX', 'RUT']) == {'SPX': 5000.0, 'RUT': 5000.0}
+    assert parse_spots('spx=5100, es=5110', ['SPX', 'ES', 'RUT']) == {'SPX': 5100.0, 'ES': 5110.0, 'RUT': DEFAULT_SPOTS['RUT']}
+
+
+def test_unknown_underlying_is_rejected():
+    with pytest.raises(ValueError, match='DAX'):
+        compute_spx_features(date(2024, 1, 5), 'DAX')
@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.shared import memory, tracing
+from src.shared.memory import chunk_rows, project_site, set_memory_budget, MIN_CHUNK_ROWS, IMPORTS_SITE
+from src.shared.tracing import span, rss_bytes
+
+
+def teardown_function():
+    set_memory_budget(None)
+    memory.disable_memory_profiling()
+    memory.reset_memory_stats()
+    tracing.disable_tracing()
+    tracing.reset_spans()
+
+
+def test_chunk_rows_shrinks_to_the_remaining_budget():
+    set_memory_budget(0)
+    assert chunk_rows(8192, 1e9) == 8192
+
+    rss_mb = rss_bytes() / 2 ** 20
+    set_memory_budget(rss_mb + 64)
+    assert chunk_rows(8192, 1024) == 8192
+    assert 1000 < chunk_rows(100_000, 1024, 'test') < 40_000
+    # Already over budget: slow but never zero
+    set_memory_budget(rss_mb / 2)
+    assert chunk_rows(8192, 1024) == MIN_CHUNK_ROWS
+
+
+def test_project_site_prefers_project_frames_and_groups_imports():
+    root = memory.PROJECT_ROOT
+    assert project_site([('/usr/lib/numpy/core.py', 10), (f'{root}/src/features/hedge_flow.py', 80)]) == 'src/features/hedge_flow.py:80'
+    assert project_site([('/usr/lib/scipy/stats.py', 3), ('<frozen importlib._bootstrap>', 241), (f'{root}/src/cli.py', 9)]) == IMPORTS_SITE
+    assert project_site([('/usr/lib/numpy/core.py', 10)]) == 'core.py:10'
+
+
+def test_profiling_records_stage_peaks_and_call_sites():
+    memory.enable_memory_profiling()
+    with span('load', 'features'):
+        block = np.ones(4 * 2 ** 20 // 8)
+        with span('query', 'db'):
+            pass
+    del block
+
+    stages = {r['name']: r for r in memory.memory_summary()}
+    assert 'query' not in stages
+    load = stages['load']
+    assert load['traced_growth'] >= 4 * 2 ** 20
+    assert load['top_sites'][0]['site'].startswith('tests/test_memory.py:')
+    assert 'load' in memory.format_memory_report()
+
+
+def test_top_call_sites_without_the_private_traces_call(monkeypatch):
+    memory.enable_memory_profiling()
+    block = np.ones(2 ** 20 // 8)
+    private = memory.top_call_sites()
+    # Public snapshot fallback for interpreters without tracemalloc._get_traces
+    monkeypatch.setattr(memory, '_get_traces', None)
+    public = memory.top_call_sites()
+    del block
+
+    assert public[0]['site'] == private[0]['site']
+    assert public[0]['site'].startswith('tests/test_memory.py:')
+    assert public[0]['size'] >= 2 ** 20
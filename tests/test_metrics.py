@@ -0,0 +1,60 @@
+import json
+import socket
+import urllib.request
+from types import SimpleNamespace
+
+from src.shared import metrics
+from src.shared.metrics import Counter, Histogram, render, start_metrics_server
+
+
+def test_render_counters_and_cumulative_histogram_buckets():
+    rows = Counter('test_rows_total', "Rows.", ['table'])
+    latency = Histogram('test_latency_seconds', "Latency.", ['stage'], buckets=(0.1, 1))
+    rows.inc(3, table='raw_"fx"')
+    latency.observe(0.05, stage='scores')
+    latency.observe(0.5, stage='scores')
+    latency.observe(5, stage='scores')
+
+    text = render()
+    assert '# TYPE test_rows_total counter' in text
+    assert 'test_rows_total{table="raw_\\"fx\\""} 3' in text
+    assert 'test_latency_seconds_bucket{stage="scores",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="scores",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="scores",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="scores"} 3' in text
+    assert 'test_latency_seconds_sum{stage="scores"} 5.55' in text
+
+
+def test_worker_records_queue_wait_duration_and_in_flight():
+    from src.gpu_worker import worker
+
+    class Queue:
+        deleted = []
+
+        def delete_message(self, msg):
+            self.deleted.append(msg)
+
+    seen_in_flight = []
+    msg = SimpleNamespace(content=json.dumps({'task': 'test_job', 'date': '2026-10-16', 'enqueued_at': 1.0}))
+    worker.process_message(Queue(), msg, lambda job: seen_in_flight.append(metrics.JOBS_IN_FLIGHT.value(task='test_job')))
+
+    assert Queue.deleted == [msg]
+    assert seen_in_flight == [1.0]
+    assert metrics.JOBS_IN_FLIGHT.value(task='test_job') == 0
+    assert metrics.QUEUE_WAIT.count(queue=worker.JOB_QUEUE_NAME, task='test_job') == 1
+    assert metrics.JOB_DURATION.count(task='test_job', status='success') == 1
+
+
+def test_metrics_server_serves_text_format():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    server = start_metrics_server(port, host='127.0.0.1')
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+            assert resp.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert b'# TYPE dealerflow_jobs_in_flight gauge' in resp.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert start_metrics_server(0) is None
@@ -0,0 +1,41 @@
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.shared.db import execute_query, get_db_connection
+from src.shared.migrations import (
+    detach_partition, ensure_monthly_partitions, is_partitioned, list_migrations, next_month, partition_name,
+)
+
+
+def test_migrations_are_ordered_and_versioned():
+    versions = [version for version, _, _ in list_migrations()]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+
+def test_monthly_partition_bounds():
+    assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+    assert next_month(date(2025, 1, 1)) == date(2025, 2, 1)
+    assert partition_name('raw_options', date(2025, 3, 1)) == 'raw_options_2025_03'
+
+
+def test_concurrent_partition_creation():
+    try:
+        with get_db_connection() as conn:
+            partitioned = is_partitioned(conn, 'raw_options')
+    except Exception:
+        pytest.skip("needs a database (PG_CONN_STRING)")
+    if not partitioned:
+        pytest.skip("raw_options is not partitioned")
+
+    # A month no data lives in; every caller races to create it
+    month = date(1990, 1, 1)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            created = list(pool.map(lambda _: ensure_monthly_partitions(month, month), range(6)))
+        assert sorted(len(c) for c in created) == [0, 0, 0, 0, 0, 1]
+    finally:
+        detach_partition(month)
+        execute_query(f'DROP TABLE IF EXISTS "{partition_name("raw_options", month)}"')
@@ -0,0 +1,38 @@
+import threading
+from datetime import date
+from src.shared.notify import ChangeSubscriber, debounce, parse_change
+
+
+def test_parse_change_payload():
+    event = parse_change('{"table": "asset_scores", "op": "UPDATE", "as_of": "2024-01-05", "key": "SPX"}')
+    assert event.as_of == date(2024, 1, 5) and event.key == 'SPX'
+    assert parse_change('{"table": "features_credit", "op": "DELETE", "as_of": null, "key": null}').as_of is None
+
+
+def test_dispatch_filters_tables_and_isolates_errors():
+    subscriber = ChangeSubscriber()
+    seen = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    subscriber.subscribe(broken)
+    subscriber.subscribe(seen.append, ['asset_scores'])
+    subscriber.dispatch(parse_change('{"table": "features_fx", "op": "INSERT", "as_of": "2024-01-05", "key": "AUDUSD"}'))
+    subscriber.dispatch(parse_change('{"table": "asset_scores", "op": "INSERT", "as_of": "2024-01-05", "key": "SPX"}'))
+    assert [e.table for e in seen] == ['asset_scores']
+
+
+def test_debounce_batches_events():
+    done = threading.Event()
+    batches = []
+
+    def callback(events):
+        batches.append(events)
+        done.set()
+
+    on_event = debounce(callback, delay=0.05)
+    for key in ('SPX', 'GOLD', 'AUDUSD'):
+        on_event(key)
+    assert done.wait(2)
+    assert batches == [['SPX', 'GOLD', 'AUDUSD']]
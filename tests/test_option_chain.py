@@ -0,0 +1,52 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.features.black_scholes import black76_price, bs_gamma
+from src.features.option_chain import OptionChain
+
+
+def _frame():
+    return pd.DataFrame({
+        'type': ['call', 'put', 'put', 'call'],
+        'strike': [4600.0, 4400.0, 4500.0, 4500.0],
+        'expiry': [date(2025, 3, 7), date(2025, 3, 21), date(2025, 3, 7), date(2025, 3, 7)],
+        'open_interest': [100.0, 0.0, np.nan, 300.0],
+        'implied_volatility': [0.15, 0.2, 0.18, 0.16],
+        'gamma': [0.001, 0.002, 0.003, 0.004],
+        'delta': [0.3, -0.2, -0.5, 0.5],
+        'underlying_price': [4510.0] * 4,
+    })
+
+
+def test_from_frame_packs_contiguous_arrays():
+    chain = OptionChain.from_frame(_frame(), date(2025, 3, 3), 'SPX')
+    assert chain.spot == 4510.0
+    assert chain.is_call.dtype == np.int8 and chain.calls.tolist() == [True, False, False, True]
+    assert chain.expiry_days.tolist() == [4, 18, 4, 4]
+    assert chain.open_interest.tolist() == [100.0, 0.0, 0.0, 300.0]
+    assert np.allclose(chain.gex(100.0), chain.gamma * chain.open_interest * 100.0 * 4510.0)
+
+
+def test_sorted_slices_are_views_and_prune_drops_dead_contracts():
+    chain = OptionChain.from_frame(_frame(), date(2025, 3, 3), 'SPX').sorted()
+    calls, puts = chain.call_slice(), chain.put_slice()
+    assert calls.strike.tolist() == [4500.0, 4600.0]
+    assert puts.expiry_days.tolist() == [4, 18]
+    assert np.shares_memory(calls.strike, chain.strike)
+
+    pruned = chain.prune()
+    assert len(pruned) == 2 and pruned.calls.all()
+    assert len(chain.prune(moneyness=0.01)) == 1
+
+
+def test_compute_greeks_recovers_black_scholes_vol():
+    chain = OptionChain.from_frame(_frame(), date(2025, 3, 3), 'SPX')
+    r = 0.045
+    forward = chain.spot * np.exp(r * chain.T)
+    prices = black76_price(forward, chain.strike, chain.T, 0.2, chain.calls, r)
+
+    chain.compute_greeks(price=prices, r=r)
+    assert np.allclose(chain.implied_volatility, 0.2, atol=1e-6)
+    assert np.allclose(chain.gamma, bs_gamma(chain.spot, chain.strike, chain.T, 0.2, r))
@@ -0,0 +1,114 @@
+import time
+import threading
+from datetime import date
+import pytest
+from src.pipeline.dag import Pipeline, Stage, timing_summary
+from src.shared.dates import business_days
+
+
+class MemoryPipeline(Pipeline):
+    """Keeps run fingerprints in a dict instead of pipeline_runs."""
+
+    def __init__(self, stages, inputs=None):
+        super().__init__(stages)
+        self.runs = {}
+        self.inputs = inputs or {}
+
+    def fingerprint(self, stage, as_of):
+        return f"{stage.name}:{self.inputs.get((stage.name, as_of), 0)}"
+
+    def last_fingerprint(self, stage, as_of):
+        return self.runs.get((stage.name, as_of))
+
+    def record(self, stage, as_of, fingerprint, status, seconds, error=None):
+        if status == 'success':
+            self.runs[(stage.name, as_of)] = fingerprint
+
+
+def test_order_select_and_cycles():
+    noop = lambda *a: None
+    stages = [Stage('report', noop, ('scores',)), Stage('scores', noop, ('features',), group='scores'), Stage('features', noop)]
+    assert Pipeline(stages).order == ['features', 'scores', 'report']
+    assert Pipeline(stages).select(['scores', 'report']).stages['scores'].deps == ()
+    with pytest.raises(ValueError):
+        Pipeline([Stage('a', noop, ('b',)), Stage('b', noop, ('a',))])
+
+
+def test_run_skips_unchanged_and_blocks_after_failure():
+    calls = []
+    lock = threading.Lock()
+
+    def record(name):
+        def fn(as_of=None):
+            with lock:
+                calls.append((name, as_of))
+            if name == 'scores' and as_of == date(2024, 1, 5):
+                raise RuntimeError("no features")
+        return fn
+
+    stages = [
+        Stage('cot', record('cot'), per_date=False),
+        Stage('features', record('features'), ('cot',)),
+        Stage('scores', record('scores'), ('features',)),
+        Stage('report', record('report'), ('scores',)),
+    ]
+    pipeline = MemoryPipeline(stages)
+    dates = [date(2024, 1, 4), date(2024, 1, 5)]
+
+    results = {(r.stage, r.as_of): r.status for r in pipeline.run(dates, workers=3)}
+    assert results[('cot', None)] == 'success'
+    assert results[('scores', date(2024, 1, 5))] == 'failed'
+    assert results[('report', date(2024, 1, 5))] == 'blocked'
+    assert results[('report', date(2024, 1, 4))] == 'success'
+
+    # Second run: only the failed day's stages run again
+    calls.clear()
+    pipeline.inputs[('features', date(2024, 1, 4))] = 0
+    summary = {row['stage']: row for row in timing_summary(pipeline.run(dates, workers=3))}
+    assert summary['features']['skipped'] == 2
+    assert ('scores', date(2024, 1, 5)) in calls and ('scores', date(2024, 1, 4)) not in calls
+
+
+def test_sequential_stage_runs_in_date_order():
+    calls = []
+    lock = threading.Lock()
+
+    def regime(as_of):
+        # Later dates would finish first without the ordering
+        time.sleep(0.01 * (date(2024, 1, 10) - as_of).days)
+        with lock:
+            calls.append(as_of)
+
+    pipeline = MemoryPipeline([Stage('regime', regime, sequential=True)])
+    dates = business_days(date(2024, 1, 1), date(2024, 1, 5))
+    assert all(r.status == 'success' for r in pipeline.run(dates, workers=4))
+    assert calls == dates
+
+
+def test_failure_blocks_long_sequential_chain():
+    # Deeper than the recursion limit, so blocking must not recurse per date
+    dates = business_days(date(2000, 1, 3), date(2006, 12, 29))
+    assert len(dates) > 1500
+
+    def regime(as_of):
+        if as_of == dates[1]:
+            raise RuntimeError("bad day")
+
+    pipeline = MemoryPipeline([Stage('regime', regime, sequential=True), Stage('report', lambda d: None, ('regime',))])
+    statuses = [r.status for r in pipeline.run(dates, workers=4)]
+    assert statuses[:3] == ['success', 'failed', 'blocked']
+    assert statuses.count('blocked') == 2 * len(dates) - 3
+
+
+def test_run_once_download_reruns_for_new_dates():
+    calls = []
+
+    class RecordOnly(MemoryPipeline):
+        # Real fingerprints (no inputs, so no DB), runs kept in memory
+        fingerprint = Pipeline.fingerprint
+
+    pipeline = RecordOnly([Stage('ingest_cot', lambda: calls.append(1), per_date=False)])
+    assert pipeline.run([date(2024, 1, 5)])[0].status == 'success'
+    assert pipeline.run([date(2024, 3, 5)])[0].status == 'success'
+    assert pipeline.run([date(2024, 3, 5)])[0].status == 'skipped'
+    assert len(calls) == 2
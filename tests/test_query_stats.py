@@ -0,0 +1,53 @@
+from src.shared import query_stats
+from src.shared.query_stats import normalize, redact, observe
+
+
+def setup_function():
+    query_stats.enable_query_stats()
+    query_stats.reset_query_stats()
+
+
+def teardown_function():
+    query_stats.disable_query_stats()
+    query_stats.reset_query_stats()
+
+
+def test_normalize_and_redact():
+    assert normalize("SELECT *\n  FROM raw_cot WHERE market = 'AUD' LIMIT 1") == \
+        "SELECT * FROM raw_cot WHERE market = ? LIMIT ?"
+    assert redact(('GOLD', 1.5)) == '(str, float)'
+    assert redact({'as_of': 'x'}) == '{as_of: str}'
+    assert redact([(1,), (2,)]) == '[2 rows]'
+
+
+def upsert_row(i):
+    observe("INSERT INTO t VALUES (%s)", (i,), 0.001, 1)
+
+
+def test_groups_by_call_site_and_flags_n_plus_one():
+    for i in range(query_stats.N_PLUS_ONE_CALLS):
+        upsert_row(i)
+    observe("SELECT 1", None, 0.002, 1)
+
+    stats = {r['statement']: r for r in query_stats.query_stats()}
+    upserts = stats['INSERT INTO t VALUES (%s)']
+    assert upserts['calls'] == query_stats.N_PLUS_ONE_CALLS
+    assert upserts['rows'] == query_stats.N_PLUS_ONE_CALLS
+    assert upserts['n_plus_one']
+    assert upserts['call_site'].startswith('tests/test_query_stats.py')
+    assert '(upsert_row)' in upserts['call_site']
+    assert not stats['SELECT ?']['n_plus_one']
+
+
+def test_sqlalchemy_statements_are_counted():
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        for i in range(3):
+            conn.execute(text("INSERT INTO t VALUES (:x)"), {'x': i})
+
+    stats = {r['statement']: r for r in query_stats.query_stats()}
+    assert stats['INSERT INTO t VALUES (?)']['calls'] == 3
+    assert 'test_sqlalchemy_statements_are_counted' in stats['INSERT INTO t VALUES (?)']['call_site']
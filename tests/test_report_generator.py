@@ -0,0 +1,35 @@
+from datetime import date
+from src.reporting.report_generator import render_report, select_report_dates
+
+
+def report_data(as_of):
+    return {
+        'as_of': as_of,
+        'spx_score': {'symbol': 'SPX', 'instability_index': 72.5, 'regime': 'EXPLOSIVE', 'pressure_direction': 'DOWN'},
+        'gold_score': {},
+        'aud_score': {},
+        'spx_features': {
+            'net_gamma': -1.5e9, 'gamma_slope': 0.01, 'net_delta': 0, 'gamma_above_spot': 0,
+            'gamma_below_spot': 0, 'call_wall': 6000.0, 'put_wall': None,
+        },
+        'gold_features': {'backwardation_pct': 0, 'spec_net_position': 0},
+        'fx_features': {'carry_attractiveness': 0, 'fx_vol_level': 0, 'cot_net_spec': 0},
+        'spx_term': {'unclench_date': None, 'expiries': ['2026-10-23'], 'expiry_net_gex': [-2.0e8]},
+    }
+
+
+def test_render_report_fills_sections():
+    report = render_report(report_data(date(2001, 1, 5)))
+    assert "**Date:** 2001-01-05" in report
+    assert "| **SPX** | 72.50 | **EXPLOSIVE** | DOWN |" in report
+    assert "| **GOLD** | N/A | **N/A** | N/A |" in report
+    assert "**Call Wall / Put Wall:** 6,000 / N/A" in report
+    assert "**Largest Expiry (Net GEX):** 2026-10-23 (-200,000,000)" in report
+    assert "Data pending." in report
+    assert "## 5. Cross-Asset Themes" in report
+
+
+def test_select_report_dates_weekly_keeps_last_per_week():
+    data = [{'as_of': date(2026, 10, d)} for d in (12, 13, 16, 19)]
+    assert [d['as_of'].day for d in select_report_dates(data, 'weekly')] == [16, 19]
+    assert len(select_report_dates(data, 'daily')) == 4
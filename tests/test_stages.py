@@ -0,0 +1,50 @@
+from datetime import date
+
+import pandas as pd
+
+from src.ingestion import ingest_futures
+from src.data_connectors.databento_futures import DatabentoFuturesConnector
+from src.pipeline.stages import ingest_futures_stage
+from src.shared import landing
+
+
+class FakeBars:
+    nbytes = 64
+
+    def __init__(self, start):
+        self.start = start
+
+    def to_df(self):
+        return pd.DataFrame({
+            'open': [2050.0], 'high': [2070.0], 'low': [2040.0], 'close': [2065.0], 'volume': [1200],
+        }, index=pd.Index([pd.Timestamp(self.start, tz='UTC')], name='ts_event'))
+
+
+class FakeTimeseries:
+    def __init__(self):
+        self.calls = []
+
+    def get_range(self, dataset, symbols, start, end, **kwargs):
+        self.calls.append((symbols, start, end))
+        return FakeBars(start)
+
+
+class StubConnector(DatabentoFuturesConnector):
+    timeseries = FakeTimeseries()
+
+    def __init__(self):
+        self.client = self
+
+
+def test_ingest_futures_stage_passes_dates_the_connector_parses(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_futures, 'DatabentoFuturesConnector', StubConnector)
+    monkeypatch.setattr(landing, 'RAW_STORE', 'parquet')
+    monkeypatch.setattr(landing, 'LANDING_ROOT', str(tmp_path))
+
+    ingest_futures_stage(date(2024, 1, 5))
+
+    calls = StubConnector.timeseries.calls
+    assert {(start, end) for _, start, end in calls} == {('2024-01-05', '2024-01-06')}
+    assert len(calls) == 6
+    futures = landing.read_landing('futures', root=str(tmp_path))
+    assert sorted(futures['underlying'].unique()) == ['AUDUSD', 'GOLD', 'JPY', 'WTI']
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from src.features.strike_ladder import StrikeLadder, build_strike_ladder, expiry_buckets
+
+
+def make_chain(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'strike': rng.choice(np.arange(4000, 5000, 25), size=n).astype(float),
+        'type': rng.choice(['call', 'put'], size=n),
+        'gamma': rng.uniform(0, 0.01, size=n),
+        'open_interest': rng.integers(0, 5000, size=n).astype(float),
+        'delta': rng.uniform(-1, 1, size=n),
+        'dte': rng.integers(0, 120, size=n),
+    })
+
+
+def build(df, spot=4500.0):
+    return build_strike_ladder(
+        df['strike'].values, (df['type'] == 'call').values, df['gamma'].values,
+        df['open_interest'].values, df['delta'].values, spot
+    )
+
+
+def test_ladder_matches_groupby():
+    df = make_chain()
+    spot = 4500.0
+    ladder = build(df, spot)
+
+    df['gex'] = df['gamma'] * df['open_interest'] * 100 * spot
+    calls = df[df['type'] == 'call'].groupby('strike')['gex'].sum()
+    puts = df[df['type'] == 'put'].groupby('strike')['gex'].sum()
+    expected = pd.DataFrame(index=np.sort(df['strike'].unique()))
+    expected['call_gex'] = calls
+    expected['put_gex'] = puts
+    expected = expected.fillna(0)
+
+    assert np.array_equal(ladder.strikes, expected.index.values)
+    assert np.allclose(ladder.call_gex, expected['call_gex'].values)
+    assert np.allclose(ladder.put_gex, expected['put_gex'].values)
+    assert np.isclose(ladder.dealer_delta.sum(), (-df['delta'] * df['open_interest']).sum())
+
+
+def test_gamma_split_and_walls():
+    df = pd.DataFrame({
+        'strike': [4400.0, 4400.0, 4500.0, 4600.0, 4600.0],
+        'type': ['put', 'call', 'call', 'call', 'put'],
+        'gamma': [0.01, 0.01, 0.02, 0.03, 0.01],
+        'open_interest': [100.0, 10.0, 100.0, 100.0, 10.0],
+        'delta': [-0.3, 0.7, 0.5, 0.3, -0.7],
+    })
+    ladder = build(df, spot=4500.0)
+
+    net = ladder.net_gex
+    assert np.isclose(ladder.gamma_below_spot(4500.0), net[0])
+    assert np.isclose(ladder.gamma_above_spot(4500.0), net[1] + net[2])
+    assert ladder.call_walls(k=2).tolist() == [4600.0, 4500.0]
+    assert ladder.put_walls(k=1).tolist() == [4400.0]
+
+
+def test_ladder_array_roundtrip():
+    ladder = build(make_chain(n=50))
+    restored = StrikeLadder.from_array(ladder.to_array())
+    assert np.allclose(restored.strikes, ladder.strikes)
+    assert np.allclose(restored.net_gex, ladder.net_gex, rtol=1e-6)
+
+
+def test_expiry_buckets_sum_to_net_gex():
+    df = make_chain()
+    is_call = (df['type'] == 'call').values
+    gex = (df['gamma'] * df['open_interest']).values
+    buckets = expiry_buckets(df['dte'].values, is_call, gex)
+    assert np.isclose(sum(buckets.values()), gex[is_call].sum() - gex[~is_call].sum())
+    assert list(buckets) == ['0-1d', '2-7d', '8-30d', '31-90d', '91d+']
@@ -0,0 +1,43 @@
+from datetime import date
+from src.shared.synthetic import synthetic_option_chain, iter_option_chains, synthetic_cot_history
+from src.shared.benchmark import summarize, compare_results
+from src.ingestion.ingest_spx_csv import REQUIRED_COLUMNS
+
+
+def test_chain_is_full_size_and_deterministic():
+    a = synthetic_option_chain(date(2024, 6, 3), 5000.0)
+    b = synthetic_option_chain(date(2024, 6, 3), 5000.0)
+
+    assert len(a) > 20000
+    assert REQUIRED_COLUMNS <= set(a.columns)
+    assert a.equals(b)
+    assert not a['option_symbol'].duplicated().any()
+    assert (a['ask'] >= a['bid']).all()
+    assert set(a['type']) == {'call', 'put'}
+
+
+def test_day_does_not_depend_on_range():
+    # A day's chain only depends on (seed, date, spot)
+    chains = list(iter_option_chains(date(2024, 6, 3), date(2024, 6, 7), strike_step=25.0))
+    assert len(chains) == 5
+    last = chains[-1]
+    again = synthetic_option_chain(date(2024, 6, 7), float(last['underlying_price'].iloc[0]), strike_step=25.0)
+    assert last.equals(again)
+
+
+def test_cot_history_is_weekly():
+    days = [date(2024, 6, d) for d in (3, 4, 5, 10, 11, 12)]
+    cot = synthetic_cot_history(days)
+    assert set(cot['as_of']) == {date(2024, 6, 4), date(2024, 6, 11)}
+    assert set(cot['market']) == {'GOLD', 'AUD'}
+
+
+def test_compare_flags_regressions():
+    baseline = [summarize('greeks', [1.0, 1.0]), summarize('ladder', [1.0])]
+    current = [summarize('greeks', [1.5, 1.5]), summarize('ladder', [1.1]), summarize('new_case', [1.0])]
+
+    rows = {r['name']: r for r in compare_results(current, baseline, threshold=0.2)}
+
+    assert set(rows) == {'greeks', 'ladder'}
+    assert rows['greeks']['regressed']
+    assert not rows['ladder']['regressed']
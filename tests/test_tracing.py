@@ -0,0 +1,80 @@
+import json
+from collections import deque
+from src.shared import tracing
+from src.shared.tracing import span, traced, record, summary_table, export_chrome_trace
+
+
+def setup_function():
+    tracing.enable_tracing()
+    tracing.reset_spans()
+
+
+def teardown_function():
+    tracing.disable_tracing()
+    tracing.reset_spans()
+
+
+@traced('features')
+def load_rows(n):
+    record(bytes_in=8 * n)
+    return list(range(n))
+
+
+def test_spans_nest_and_count():
+    with span('stage', 'stage') as outer:
+        load_rows(3)
+        load_rows(4)
+        outer.add(rows_in=7)
+
+    spans = {s.name: s for s in tracing.finished_spans()}
+    inner = [s for s in tracing.finished_spans() if s.name.endswith('load_rows')]
+    assert len(inner) == 2
+    assert all(s.parent_id == spans['stage'].span_id for s in inner)
+
+    rows = {r['name']: r for r in summary_table()}
+    loads = rows[inner[0].name]
+    assert loads['calls'] == 2
+    assert loads['rows_out'] == 7
+    assert loads['bytes_in'] == 56
+    assert rows['stage']['rows_in'] == 7
+    assert rows['stage']['peak_rss'] > 0
+
+
+def test_errors_are_recorded_and_raised():
+    try:
+        with span('boom', 'db'):
+            raise ValueError("bad")
+    except ValueError:
+        pass
+    (s,) = tracing.finished_spans()
+    assert s.status == 'error'
+    assert 'bad' in s.attrs['error']
+
+
+def test_disabled_records_nothing():
+    tracing.disable_tracing()
+    with span('off') as s:
+        s.add(rows_in=1)
+    assert load_rows(2) == [0, 1]
+    assert tracing.finished_spans() == []
+
+
+def test_chrome_trace_export(tmp_path):
+    with span('outer', 'stage'):
+        load_rows(1)
+    path = export_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    assert [e['name'] for e in events][-1] == 'outer'
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+
+
+def test_span_buffer_is_bounded(monkeypatch):
+    monkeypatch.setattr(tracing, '_spans', deque(maxlen=3))
+    for i in range(5):
+        with span(f's{i}') as s:
+            pass
+    assert [s.name for s in tracing.finished_spans()] == ['s2', 's3', 's4']
+    assert tracing.dropped_spans() == 2
+    # Without the memory sampler the peak is what the span itself saw
+    assert s.peak_rss == max(s.rss_start, s.rss_end)
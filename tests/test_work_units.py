@@ -0,0 +1,153 @@
+import json
+import subprocess
+import pytest
+from datetime import date
+from src.pipeline import executors
+from src.shared.dates import business_days
+from src.pipeline.executors import KubernetesJobExecutor, get_executor, LocalExecutor
+from src.pipeline.work_units import (
+    BACKFILL_MAX_ATTEMPTS, DATE_UNIT, claim_unit, create_backfill, finish_unit, plan_units, units_backfill_id,
+)
+from src.shared.db import execute_query, get_db_connection
+
+
+def test_plan_units_shards_contiguous_dates():
+    dates = business_days(date(2024, 1, 1), date(2024, 1, 12))
+    units = plan_units(dates, ['SPX', 'GOLD'], shards=3)
+    assert len(units) == len(dates) * 3
+    by_date = {}
+    for as_of, asset, shard in units:
+        by_date.setdefault(as_of, set()).add(shard)
+    # One shard per date, blocks in date order
+    shards = [by_date[d].pop() for d in dates]
+    assert shards == sorted(shards) and set(shards) == {0, 1, 2}
+    assert {a for _, a, _ in units} == {'SPX', 'GOLD', DATE_UNIT}
+    assert {s for _, _, s in plan_units(dates[:2], ['SPX'], shards=8, date_stages=False)} == {0, 1}
+    assert units_backfill_id(['GOLD', 'SPX'], ['scores'], dates[0], dates[-1]) == units_backfill_id(['SPX', 'GOLD'], ['scores'], dates[0], dates[-1])
+
+
+def test_k8s_job_manifest():
+    manifest = KubernetesJobExecutor(namespace='ns', image='img:1').render('abc123', shards=16, parallelism=32)
+    assert 'completionMode: Indexed' in manifest and 'completions: 16' in manifest and 'parallelism: 16' in manifest
+    assert 'name: dealerflow-backfill-abc123' in manifest and 'image: img:1' in manifest
+    assert '"--id", "abc123"' in manifest and '${' not in manifest
+    assert isinstance(get_executor('local'), LocalExecutor)
+
+
+def test_k8s_wait_returns_on_failed_job(monkeypatch):
+    applied, states = [], iter([{}, {'conditions': [{'type': 'Failed', 'status': 'True'}]}])
+
+    def fake_run(cmd, input=None, **kwargs):
+        if cmd[1] == 'apply':
+            applied.append(input)
+            return subprocess.CompletedProcess(cmd, 0)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps({'status': next(states)}))
+
+    monkeypatch.setattr(executors.subprocess, 'run', fake_run)
+    monkeypatch.setattr(executors, 'K8S_POLL_S', 0)
+    executor = KubernetesJobExecutor(namespace='ns', image='img:1')
+    executor.start('abc123', shards=2, parallelism=2)
+    # A fresh Job per start, not a re-apply of the finished one
+    assert executor.job_name.startswith('dealerflow-backfill-abc123-')
+    assert f'name: {executor.job_name}' in applied[0]
+    assert executor.wait() is False
+
+
+def test_failed_worker_exits_non_zero(monkeypatch):
+    from scripts import run_backfill_units
+
+    def lost_database(*args):
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(run_backfill_units, 'work', lost_database)
+    monkeypatch.setattr('sys.argv', ['run_backfill_units.py', 'work', '--id', 'abc123'])
+    # A pod that exits 0 would count as a completed index
+    with pytest.raises(SystemExit) as exit_info:
+        run_backfill_units.main()
+    assert exit_info.value.code == 1
+
+
+def _backfill_or_skip(backfill_id, dates, shards, assets):
+    try:
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('backfill_units') IS NOT NULL")
+            applied = cur.fetchone()[0]
+    except Exception:
+        pytest.skip("needs a database (PG_CONN_STRING)")
+    if not applied:
+        pytest.skip("migration 005 not applied")
+    return create_backfill(dates, shards, assets, ['scores'], restart=True, backfill_id=backfill_id)
+
+
+def _drop_backfill(backfill_id, dates):
+    execute_query("DELETE FROM backfill_runs WHERE backfill_id = %s", (backfill_id,))
+    execute_query("DELETE FROM pipeline_runs WHERE as_of BETWEEN %s AND %s", (dates[0], dates[-1]))
+
+
+def _units(backfill_id):
+    return {(r['as_of'], r['asset']): r for r in execute_query(
+        "SELECT * FROM backfill_units WHERE backfill_id = %s", (backfill_id,), fetch=True
+    )}
+
+
+def test_claims_own_shard_first_then_steal():
+    # No data lives in 1990, so nothing real is touched
+    dates = business_days(date(1990, 1, 1), date(1990, 1, 4))
+    bid = _backfill_or_skip('test-claims', dates, 2, ['GOLD', 'SPX'])
+    try:
+        # Shard 1 owns the last two dates; a date's '*' unit waits for its assets
+        assert claim_unit(bid, 1, 'w1') == (dates[2], 'GOLD')
+        assert claim_unit(bid, 1, 'w1') == (dates[2], 'SPX')
+        assert claim_unit(bid, 1, 'w1') == (dates[3], 'GOLD')
+        assert finish_unit(bid, dates[2], 'GOLD', 'w1', 'done', 0.1)
+        assert finish_unit(bid, dates[2], 'SPX', 'w1', 'done', 0.1)
+        assert claim_unit(bid, 1, 'w1') == (dates[2], DATE_UNIT)
+        assert claim_unit(bid, 1, 'w1') == (dates[3], 'SPX')
+        # Nothing left in shard 1 that is claimable: steal from shard 0
+        assert claim_unit(bid, 1, 'w1') == (dates[0], 'GOLD')
+
+        # A stale claim is taken over, and the old claimant can no longer record it
+        execute_query("""
+        UPDATE backfill_units SET claimed_at = claimed_at - interval '1 day'
+        WHERE backfill_id = %s AND as_of = %s AND asset = 'GOLD'
+        """, (bid, dates[3]))
+        assert claim_unit(bid, 1, 'w2') == (dates[3], 'GOLD')
+        assert not finish_unit(bid, dates[3], 'GOLD', 'w1', 'failed', 0.1, 'late')
+        assert finish_unit(bid, dates[3], 'GOLD', 'w2', 'done', 0.1)
+
+        # Failed units are retried until they hit the attempt cap
+        execute_query("""
+        UPDATE backfill_units SET status = 'failed', attempts = %s
+        WHERE backfill_id = %s AND as_of = %s AND asset = 'SPX'
+        """, (BACKFILL_MAX_ATTEMPTS, bid, dates[0]))
+        execute_query("""
+        UPDATE backfill_units SET status = 'failed', attempts = 1
+        WHERE backfill_id = %s AND as_of = %s AND asset = 'GOLD'
+        """, (bid, dates[1]))
+        assert claim_unit(bid, 0, 'w2') == (dates[1], 'GOLD')
+        assert _units(bid)[(dates[1], 'GOLD')]['attempts'] == 2
+        assert claim_unit(bid, 0, 'w2') == (dates[1], 'SPX')
+        assert claim_unit(bid, 0, 'w2') is None
+    finally:
+        _drop_backfill(bid, dates)
+
+
+def test_local_executor_runs_every_unit_once(monkeypatch):
+    # Spawned workers read the poll interval from the environment
+    monkeypatch.setenv('BACKFILL_POLL_S', '0.2')
+    dates = business_days(date(1990, 1, 1), date(1990, 1, 5))
+    bid = _backfill_or_skip('test-local-executor', dates, 2, ['SPX', 'GOLD'])
+    try:
+        executor = LocalExecutor()
+        executor.start(bid, shards=2, parallelism=2)
+        # Both workers exit once nothing is left to claim
+        assert executor.wait(timeout_s=120)
+
+        units = _units(bid)
+        assert len(units) == len(dates) * 3
+        assert all(u['status'] == 'done' and u['attempts'] == 1 for u in units.values())
+        for as_of in dates:
+            assets_done = max(units[(as_of, a)]['finished_at'] for a in ('SPX', 'GOLD'))
+            assert units[(as_of, DATE_UNIT)]['claimed_at'] >= assets_done
+    finally:
+        _drop_backfill(bid, dates)